@@ -6,9 +6,13 @@ MFL transaction monitor - catches people picking up players after games start
 import argparse
 import asyncio
 import sys
+from datetime import datetime, timezone, timedelta
 from src.mfl_monitor.core.analyzer import TransactionAnalyzer
 from src.mfl_monitor.core.scheduler import TransactionScheduler
+from src.mfl_monitor.core.backfill import BackfillRunner
 from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.utils.franchise_cache import FranchiseCache
+from src.mfl_monitor.utils.state_bundle import StateBundle
 from src.mfl_monitor.apis.discord_bot import DiscordNotifier
 from src.mfl_monitor.apis.mfl_api import MFLAPI
 from src.mfl_monitor.apis.odds_api import OddsAPIClient
@@ -75,6 +79,24 @@ async def run_single_check(force=False):
     scheduler = TransactionScheduler()
     await scheduler.run_check(force=force)
 
+async def run_daemon():
+    """Poll continuously, sleeping through inactive hours"""
+    print("Starting transaction monitor daemon...")
+    scheduler = TransactionScheduler()
+    await scheduler.run_forever()
+
+def run_backfill(date_from, date_to, report_file=None):
+    """Audit a date range without sending Discord messages"""
+    try:
+        start = datetime.strptime(date_from, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(date_to, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+    except ValueError:
+        print("❌ Invalid date format. Use 'YYYY-MM-DD'")
+        return False
+    
+    BackfillRunner(report_file).run(start, end)
+    return True
+
 def main():
     parser = argparse.ArgumentParser(
         description='MFL Transaction Monitor',
@@ -84,6 +106,10 @@ Examples:
   python main.py --test          # Test configuration
   python main.py --once          # Run once (respects time restrictions)
   python main.py --force         # Force run (ignores time restrictions)
+  python main.py --daemon        # Poll every few minutes during active hours
+  python main.py --backfill 2025-09-04 2025-12-29   # Audit a date range
+  python main.py --once --refresh-franchises         # Refetch team names (e.g. after a rename)
+  python main.py --import-state --once --export-state  # Start warm from a state bundle and save it again
   python main.py                 # Run continuously with scheduling
         """
     )
@@ -94,19 +120,46 @@ Examples:
                        help='Test configuration and connections')
     parser.add_argument('--force', action='store_true', 
                        help='Force run ignoring time restrictions')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Poll continuously during active hours')
+    parser.add_argument('--backfill', nargs=2, metavar=('FROM', 'TO'),
+                       help='Audit transactions between two dates (YYYY-MM-DD) without sending alerts')
+    parser.add_argument('--report', 
+                       help='Report file for --backfill (default: data/backfill_report.jsonl)')
+    parser.add_argument('--refresh-franchises', action='store_true',
+                       help='Drop cached franchise names and owners so they are fetched again')
+    parser.add_argument('--import-state', nargs='?', const=Config.STATE_BUNDLE_FILE, metavar='BUNDLE',
+                       help='Restore caches and ledgers from a state bundle before running')
+    parser.add_argument('--export-state', nargs='?', const=Config.STATE_BUNDLE_FILE, metavar='BUNDLE',
+                       help='Pack caches and ledgers into a state bundle after running')
     
     args = parser.parse_args()
     
+    if args.import_state:
+        StateBundle(args.import_state).restore()
+    
+    if args.refresh_franchises:
+        FranchiseCache().invalidate()
+    
     if args.test:
         success = test_configuration()
         sys.exit(0 if success else 1)
     
+    if args.backfill:
+        success = run_backfill(args.backfill[0], args.backfill[1], args.report)
+        sys.exit(0 if success else 1)
+    
     if args.once or args.force:
         asyncio.run(run_single_check(force=args.force))
-    else:
-        print("Use --once or --force to run the monitor")
+    elif args.daemon:
+        asyncio.run(run_daemon())
+    elif not (args.import_state or args.export_state):
+        print("Use --once, --force or --daemon to run the monitor")
         print("For continuous monitoring, use GitHub Actions")
         sys.exit(1)
+    
+    if args.export_state:
+        StateBundle(args.export_state).export()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
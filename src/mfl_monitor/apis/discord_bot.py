@@ -5,18 +5,25 @@ Discord bot integration for notifications
 import discord
 from discord.ext import commands
 import asyncio
+import time
 from datetime import datetime
+from typing import Dict, List
 from ..utils.config import Config
 
+# How long a login opened ahead of time is handed out before a fresh one is used instead
+WARM_LOGIN_SECONDS = 45 * 60
+
 class DiscordNotifier:
     """Handles Discord notifications"""
     
     def __init__(self):
         self.bot_token = Config.DISCORD_BOT_TOKEN
-        self.channel_id = int(Config.DISCORD_CHANNEL_ID)
+        self.channel_id = int(Config.DISCORD_CHANNEL_ID) if Config.DISCORD_CHANNEL_ID else None
         self.bot = None
         self.channel = None
-        
+        # (client, channel, opened at) from warm_up(), for the next open_channel()
+        self.warm = None
+    
     async def initialize(self):
         """Initialize the Discord bot and get the channel"""
         intents = discord.Intents.default()
@@ -56,11 +63,85 @@ class DiscordNotifier:
             
             await bot.start(self.bot_token)
             return True
-            
+        
         except Exception as e:
             print(f"❌ Error sending Discord notification: {e}")
             return False
     
+    async def open_channel(self):
+        """Log in over HTTP only (no gateway connection) and fetch the alert channel
+        
+        Returns (client, channel); the caller closes the client when done.
+        """
+        if self.warm is not None:
+            client, channel, opened_at = self.warm
+            self.warm = None
+            if time.time() - opened_at < WARM_LOGIN_SECONDS:
+                return client, channel
+            await client.close()
+        
+        if not self.channel_id:
+            raise ValueError("DISCORD_CHANNEL_ID is not set")
+        client = discord.Client(intents=discord.Intents.none())
+        try:
+            await client.login(self.bot_token)
+            channel = await client.fetch_channel(self.channel_id)
+        except Exception:
+            await client.close()
+            raise
+        return client, channel
+    
+    async def warm_up(self):
+        """Log in ahead of time so the next open_channel() doesn't wait for Discord"""
+        if self.warm is not None:
+            await self.warm[0].close()
+            self.warm = None
+        client, channel = await self.open_channel()
+        self.warm = (client, channel, time.time())
+    
+    async def send_queued(self, channel, outbox, message: Dict) -> bool:
+        """Send one outbox message and record whether Discord accepted it"""
+        try:
+            await channel.send(message['content'])
+        except discord.HTTPException as e:
+            outbox.mark_failed(message['key'], str(e))
+            return False
+        outbox.mark_sent(message['key'])
+        print(f"✅ Sent Discord notification: {message['content']}")
+        return True
+    
+    async def deliver(self, outbox, messages: List[Dict] = None) -> int:
+        """Send outbox messages (every due one by default) over a single login"""
+        messages = outbox.due() if messages is None else messages
+        if not messages:
+            return 0
+        
+        handled = set()
+        sent = 0
+        try:
+            client, channel = await self.open_channel()
+        except Exception as e:
+            print(f"❌ Error delivering Discord notifications: {e}")
+            for message in messages:
+                outbox.mark_failed(message['key'], str(e))
+            return 0
+        
+        try:
+            for message in messages:
+                if await self.send_queued(channel, outbox, message):
+                    sent += 1
+                handled.add(message['key'])
+                await asyncio.sleep(1)
+        except Exception as e:
+            print(f"❌ Error delivering Discord notifications: {e}")
+            for message in messages:
+                if message['key'] not in handled:
+                    outbox.mark_failed(message['key'], str(e))
+        finally:
+            await client.close()
+        
+        return sent
+    
     async def send_transaction_alert(self, transaction_data: dict):
         """Send a formatted transaction alert to Discord"""
         player_name = transaction_data.get('player_name', 'Unknown Player')
@@ -86,7 +167,7 @@ class DiscordNotifier:
         if not self.channel:
             print("Discord channel not available")
             return False
-            
+        
         try:
             await self.channel.send(embed=embed)
             print(f"Sent Discord transaction alert for {player_name}")
@@ -99,6 +180,9 @@ class DiscordNotifier:
         """Close the Discord bot connection"""
         if self.bot:
             await self.bot.close()
+        if self.warm is not None:
+            await self.warm[0].close()
+            self.warm = None
 
 # Standalone function for sending notifications without running a full bot
 async def send_simple_notification(message: str):
@@ -119,6 +203,6 @@ async def send_simple_notification(message: str):
             await bot.close()
         
         await bot.start(Config.DISCORD_BOT_TOKEN)
-        
+    
     except Exception as e:
         print(f"Error sending Discord notification: {e}")
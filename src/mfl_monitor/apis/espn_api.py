@@ -4,9 +4,15 @@ ESPN API integration for NFL game times
 
 import requests
 import json
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from ..utils.config import Config
+from ..utils.http import single_flight
+from ..utils.game_status import SCHEDULED, IN_PROGRESS, FINAL, POSTPONED
+from .nfl import TEAM_MAPPING, filter_current_week
+
+# ESPN status names for games that will not kick off this week
+NOT_PLAYED_STATUSES = {'STATUS_POSTPONED', 'STATUS_CANCELED', 'STATUS_SUSPENDED'}
 
 class ESPNAPIClient:
     """ESPN API client for NFL game times"""
@@ -14,49 +20,64 @@ class ESPNAPIClient:
     def __init__(self):
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
         
-    def get_nfl_schedule(self, week: int = None) -> List[Dict]:
-        """Get NFL schedule from ESPN API"""
+    def get_scoreboard(self, week: int = None, year: int = None, season_type: int = None) -> Dict:
+        """Get the raw ESPN scoreboard document (concurrent callers share one request)"""
+        return single_flight(('espn_scoreboard', week, year, season_type),
+                             lambda: self.fetch_scoreboard(week, year, season_type))
+    
+    def fetch_scoreboard(self, week: int = None, year: int = None, season_type: int = None) -> Dict:
+        """Download the ESPN scoreboard document"""
         try:
             params = {}
             if week:
                 params['week'] = week
+            if year:
+                params['dates'] = year
+            if season_type:
+                params['seasontype'] = season_type
                 
             response = requests.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
-            events = data.get('events', [])
-            
-            print(f"✅ Retrieved {len(events)} NFL games from ESPN API")
-            return events
+            return response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching NFL schedule from ESPN API: {e}")
-            return []
+            return {}
         except json.JSONDecodeError as e:
             print(f"❌ Error parsing ESPN API response: {e}")
-            return []
+            return {}
+    
+    def get_nfl_schedule(self, week: int = None, year: int = None, season_type: int = None) -> List[Dict]:
+        """Get NFL schedule from ESPN API"""
+        events = self.get_scoreboard(week, year, season_type).get('events', [])
+        print(f"✅ Retrieved {len(events)} NFL games from ESPN API")
+        return events
     
-    def get_game_times_by_team(self, week: int = None) -> Dict[str, datetime]:
+    def get_week_schedule(self, week: int = None, year: int = None,
+                          season_type: int = None) -> Tuple[Optional[Tuple[int, int, int]], Dict[str, datetime]]:
+        """Get ((season, season type, week), game times) from a single scoreboard request"""
+        data = self.get_scoreboard(week, year, season_type)
+        events = data.get('events', [])
+        print(f"✅ Retrieved {len(events)} NFL games from ESPN API")
+        
+        week_key = None
+        try:
+            season = data.get('season', {})
+            week_key = (int(season['year']), int(season['type']), int(data['week']['number']))
+        except (KeyError, TypeError, ValueError):
+            pass
+        
+        return week_key, self.parse_game_times(events)
+    
+    def get_game_times_by_team(self, week: int = None, year: int = None, season_type: int = None) -> Dict[str, datetime]:
         """Get game start times organized by team abbreviation"""
-        events = self.get_nfl_schedule(week)
+        return self.parse_game_times(self.get_nfl_schedule(week, year, season_type))
+    
+    def parse_game_times(self, events: List[Dict]) -> Dict[str, datetime]:
+        """Turn scoreboard events into game start times by team abbreviation"""
         team_game_times = {}
         
-        # Team name to abbreviation mapping
-        team_mapping = {
-            'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
-            'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
-            'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
-            'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GBP',
-            'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAX',
-            'Kansas City Chiefs': 'KCC', 'Las Vegas Raiders': 'LVR', 'Los Angeles Chargers': 'LAC',
-            'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
-            'New England Patriots': 'NEP', 'New Orleans Saints': 'NOS', 'New York Giants': 'NYG',
-            'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
-            'San Francisco 49ers': 'SFO', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TBB',
-            'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS'
-        }
-        
         for event in events:
             try:
                 # Get game date and time
@@ -84,8 +105,8 @@ class ESPNAPIClient:
                     continue
                 
                 # Map team names to abbreviations
-                home_abbrev = team_mapping.get(home_team, home_team)
-                away_abbrev = team_mapping.get(away_team, away_team)
+                home_abbrev = TEAM_MAPPING.get(home_team, home_team)
+                away_abbrev = TEAM_MAPPING.get(away_team, away_team)
                 
                 # Store game times for both teams
                 team_game_times[home_abbrev] = game_time
@@ -99,42 +120,82 @@ class ESPNAPIClient:
         
         return team_game_times
     
-    def get_current_week_games(self) -> Dict[str, datetime]:
-        """Get games for the current week (Thursday to Monday)"""
-        # Get current week number
-        current_week = self.get_current_week()
-        
-        # Get all games for current week
-        all_games = self.get_game_times_by_team(current_week)
+    def get_game_statuses(self, validators: Dict = None) -> Tuple[Optional[Dict[str, Dict]], Dict, bool]:
+        """Get each team's current game status with a conditional request
         
-        # Filter to only include Thursday to Monday games
-        now = datetime.now(timezone.utc)
+        Returns (statuses, validators, not_modified). statuses is None both when
+        ESPN reports nothing changed (not_modified is True) and when the request
+        fails (not_modified is False).
+        """
+        validators = validators or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
         
-        # Find the most recent Thursday
-        if now.weekday() > 3 or (now.weekday() == 3 and now.hour >= 20):
-            # Go back to the most recent Thursday
-            this_thursday = now - timedelta(days=now.weekday() - 3)
-            this_thursday = this_thursday.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            # Look forward to this Thursday
-            days_until_thursday = (3 - now.weekday()) % 7
-            if days_until_thursday == 0 and now.weekday() != 3:
-                days_until_thursday = 7
-            this_thursday = now + timedelta(days=days_until_thursday)
-            this_thursday = this_thursday.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        next_monday = this_thursday + timedelta(days=5)
-        
-        print(f"📅 Looking for games between {this_thursday.strftime('%Y-%m-%d')} and {next_monday.strftime('%Y-%m-%d')}")
+        try:
+            response = requests.get(self.base_url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                return None, validators, True
+            response.raise_for_status()
+            
+            new_validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+            return self.parse_game_statuses(response.json().get('events', [])), new_validators, False
+            
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Error fetching game status from ESPN API: {e}")
+            return None, validators, False
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Error parsing ESPN game status: {e}")
+            return None, validators, False
+    
+    def parse_game_statuses(self, events: List[Dict]) -> Dict[str, Dict]:
+        """Turn scoreboard events into {team: {state, detail, scheduled}}"""
+        statuses = {}
         
-        # Filter games to only include this week's games
-        filtered_games = {}
-        for team, game_time in all_games.items():
-            if this_thursday <= game_time <= next_monday:
-                filtered_games[team] = game_time
+        for event in events:
+            try:
+                scheduled = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+                competition = event['competitions'][0]
+                status = competition.get('status') or event.get('status', {})
+                status_type = status.get('type', {})
+                
+                name = status_type.get('name', '')
+                espn_state = status_type.get('state', 'pre')
+                if name in NOT_PLAYED_STATUSES:
+                    state = POSTPONED
+                elif espn_state == 'in':
+                    state = IN_PROGRESS
+                elif espn_state == 'post':
+                    state = FINAL
+                else:
+                    state = SCHEDULED
+                
+                game_status = {
+                    'state': state,
+                    'detail': status_type.get('detail', ''),
+                    'scheduled': int(scheduled.timestamp())
+                }
+                for competitor in competition.get('competitors', []):
+                    team_name = competitor.get('team', {}).get('displayName', '')
+                    if team_name:
+                        statuses[TEAM_MAPPING.get(team_name, team_name)] = game_status
+                        
+            except (ValueError, KeyError, IndexError) as e:
+                print(f"⚠️  Error processing game status {event.get('id')}: {e}")
+                continue
         
-        print(f"📅 Found {len(filtered_games)} teams playing this week (Thursday to Monday)")
-        return filtered_games
+        return statuses
+    
+    def get_current_week_games(self) -> Dict[str, datetime]:
+        """Get games for the current week (Thursday to Monday)"""
+        # The scoreboard defaults to the current week
+        _, all_games = self.get_week_schedule()
+        return filter_current_week(all_games)
     
     def get_current_week(self) -> int:
         """Get current NFL week number"""
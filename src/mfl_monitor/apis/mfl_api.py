@@ -4,9 +4,15 @@ MFL API calls
 
 import requests
 import json
+import math
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import FrozenSet, Iterable, Iterator, List, Dict, Optional, Tuple
 from ..utils.config import Config
+from ..utils.records import Player
+from ..utils.http import get_session, single_flight
 
 class MFLAPI:
     """Gets data from MFL"""
@@ -16,9 +22,19 @@ class MFLAPI:
         self.api_key = Config.MFL_API_KEY
         self.year = Config.MFL_YEAR
         self.base_url = Config.MFL_API_URL
+        self.session = get_session('mfl')
+        self.last_parse_stats = {}
+        self.last_fetch_stats = {}
+    
+    def get_transactions(self, since: Optional[datetime] = None, week: Optional[int] = None,
+                         types: Optional[Iterable[str]] = None, franchise: Optional[str] = None) -> List[Dict]:
+        """Get transactions from MFL, letting MFL do as much of the filtering as it can
         
-    def get_transactions(self, since: Optional[datetime] = None) -> List[Dict]:
-        """Get transactions from MFL"""
+        types and franchise are sent as TRANS_TYPE and FRANCHISE, and DAYS only
+        reaches back as far as since. MFL's DAYS window is in whole days, so rows
+        at or before since are still dropped here.
+        """
+        started = time.perf_counter()
         try:
             params = {
                 'TYPE': 'transactions',
@@ -27,68 +43,141 @@ class MFLAPI:
                 'JSON': 1
             }
             
+            since_ts = None
             if since:
                 # Only get transactions after our last check
-                timestamp = int(since.timestamp())
-                params['SINCE'] = timestamp
-                params['DAYS'] = 7
+                since_ts = int(since.timestamp())
+                params['SINCE'] = since_ts
+                params['DAYS'] = max(1, math.ceil((time.time() - since_ts) / 86400))
+            
+            if week:
+                params['W'] = week
+            if types:
+                params['TRANS_TYPE'] = ','.join(sorted(types))
+            if franchise:
+                params['FRANCHISE'] = franchise
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
             
-            if 'transactions' in data and 'transaction' in data['transactions']:
-                transactions = data['transactions']['transaction']
-                if isinstance(transactions, dict):
-                    transactions = [transactions]
-                return transactions
-            else:
-                return []
-                
+            transactions = data.get('transactions', {}).get('transaction', [])
+            if isinstance(transactions, dict):
+                transactions = [transactions]
+            returned = len(transactions)
+            
+            if since_ts is not None:
+                transactions = [t for t in transactions if self.is_after(t, since_ts)]
+            if types:
+                transactions = [t for t in transactions if t.get('type') in types]
+            
+            self.last_fetch_stats = {
+                'returned': returned,
+                'kept': len(transactions),
+                'bytes': len(response.content),
+                'fetch_ms': (time.perf_counter() - started) * 1000
+            }
+            print(f"📥 MFL returned {returned} transactions ({len(response.content) / 1024:.1f} KB), "
+                  f"{len(transactions)} in range")
+            return transactions
+        
         except requests.exceptions.RequestException as e:
             print(f"Error fetching transactions from MFL: {e}")
             return []
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"Error parsing MFL response: {e}")
             return []
     
-    def get_players(self) -> Dict[str, Dict]:
-        """Get player info from MFL"""
+    @staticmethod
+    def is_after(transaction: Dict, since_ts: int) -> bool:
+        """Check if a transaction is newer than since_ts
+        
+        A row with a bad timestamp is kept so parse_transactions can log and
+        skip it on its own, instead of failing the whole batch here.
+        """
+        try:
+            return int(transaction.get('timestamp', 0)) > since_ts
+        except (TypeError, ValueError):
+            return True
+    
+    def get_players(self, since: Optional[int] = None, player_ids: Optional[List[str]] = None) -> Dict[str, Player]:
+        """Get player info from MFL (id, name, position and team only)
+        
+        With since, only players MFL has changed after that unix time are returned,
+        and with player_ids only those players. last_parse_stats['ok'] tells an
+        empty answer apart from a failed request.
+        """
+        # Identical requests from other threads share one download
+        key = ('mfl_players', self.league_id, since, tuple(player_ids or ()))
+        player_dict, self.last_parse_stats = single_flight(key, lambda: self.fetch_players(since, player_ids))
+        return player_dict
+    
+    def fetch_players(self, since: Optional[int], player_ids: Optional[List[str]]) -> Tuple[Dict[str, Player], Dict]:
+        """Download and parse the players export, returning the players and parse stats"""
+        started = time.perf_counter()
+        tracing = Config.PROFILE_PARSING and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        
+        player_dict = {}
+        ok = False
         try:
             params = {
                 'TYPE': 'players',
                 'L': self.league_id,
-                'APIKEY': self.api_key,
-                'JSON': 1
+                'APIKEY': self.api_key
             }
+            if since:
+                params['SINCE'] = since
+            if player_ids:
+                params['PLAYERS'] = ','.join(player_ids)
             
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'players' in data and 'player' in data['players']:
-                players = data['players']['player']
-                player_dict = {}
-                if isinstance(players, list):
-                    for player in players:
-                        player_dict[player['id']] = player
-                else:
-                    player_dict[players['id']] = players
-                return player_dict
-            else:
-                return {}
-                
+            # XML export parsed as it streams in, so the full document is never built
+            with self.session.get(self.base_url, params=params, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for player in self.iter_players(response.raw):
+                    player_dict[player.id] = player
+            ok = True
+        
         except requests.exceptions.RequestException as e:
             print(f"Error fetching players from MFL: {e}")
-            return {}
-        except json.JSONDecodeError as e:
+            player_dict = {}
+        except ET.ParseError as e:
             print(f"Error parsing MFL players response: {e}")
-            return {}
+            player_dict = {}
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            peak_kb = None
+            if tracing:
+                peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+                tracemalloc.stop()
+        
+        stats = {'players': len(player_dict), 'parse_ms': elapsed_ms, 'peak_kb': peak_kb, 'ok': ok}
+        if ok:
+            memory_note = f", peak {peak_kb:.0f} KB" if peak_kb is not None else ""
+            print(f"👥 Parsed {len(player_dict)} players in {elapsed_ms:.0f} ms{memory_note}")
+        return player_dict, stats
+    
+    def iter_players(self, source) -> Iterator[Player]:
+        """Yield projected player records from an MFL players XML stream"""
+        context = ET.iterparse(source, events=('start',))
+        _, root = next(context)
+        for _, elem in context:
+            if elem.tag != 'player':
+                continue
+            yield Player(elem.get('id', ''), elem.get('name', ''),
+                         elem.get('position', ''), elem.get('team', ''))
+            # Drop parsed elements so memory stays flat
+            root.clear()
     
     def get_franchises(self) -> Dict[str, Dict]:
-        """Get team info from MFL"""
+        """Get team info from MFL (concurrent callers share one request)"""
+        return single_flight(('mfl_franchises', self.league_id), self.fetch_franchises)
+    
+    def fetch_franchises(self) -> Dict[str, Dict]:
+        """Download team info from MFL"""
         try:
             params = {
                 'TYPE': 'league',
@@ -98,7 +187,7 @@ class MFLAPI:
                 'FRANCHISES': 1
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -114,10 +203,103 @@ class MFLAPI:
                 return franchise_dict
             else:
                 return {}
-                
+        
         except requests.exceptions.RequestException as e:
             print(f"Error fetching franchises from MFL: {e}")
             return {}
         except json.JSONDecodeError as e:
             print(f"Error parsing MFL franchises response: {e}")
             return {}
+    
+    def get_nfl_schedule(self, week: Optional[int] = None) -> Tuple[Optional[int], Dict[str, datetime]]:
+        """Get (week, kickoff by team) from MFL's nflSchedule export
+        
+        MFL uses the same team codes as its players export, so no name mapping is needed.
+        Concurrent callers asking for the same week share one request.
+        """
+        return single_flight(('mfl_nfl_schedule', week), lambda: self.fetch_nfl_schedule(week))
+    
+    def fetch_nfl_schedule(self, week: Optional[int]) -> Tuple[Optional[int], Dict[str, datetime]]:
+        """Download and parse one week of MFL's nflSchedule export"""
+        try:
+            params = {
+                'TYPE': 'nflSchedule',
+                'JSON': 1
+            }
+            if week:
+                params['W'] = week
+            
+            response = self.session.get(self.base_url, params=params, timeout=30)
+            response.raise_for_status()
+            
+            schedule = response.json().get('nflSchedule', {})
+            matchups = schedule.get('matchup', [])
+            if isinstance(matchups, dict):
+                matchups = [matchups]
+            
+            team_game_times = {}
+            for matchup in matchups:
+                try:
+                    game_time = datetime.fromtimestamp(int(matchup['kickoff']), tz=timezone.utc)
+                except (KeyError, ValueError, TypeError):
+                    continue
+                for team in matchup.get('team', []):
+                    if team.get('id'):
+                        team_game_times[team['id']] = game_time
+            
+            schedule_week = int(schedule['week']) if schedule.get('week') else week
+            print(f"✅ Retrieved {len(matchups)} NFL games from MFL for week {schedule_week}")
+            return schedule_week, team_game_times
+        
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching NFL schedule from MFL: {e}")
+            return week, {}
+        except ValueError as e:
+            print(f"Error parsing MFL NFL schedule: {e}")
+            return week, {}
+    
+    def get_starters(self, week: Optional[int] = None) -> Tuple[Optional[int], Dict[str, FrozenSet[str]]]:
+        """Get (week, starting player ids by franchise) from MFL's liveScoring export"""
+        try:
+            params = {
+                'TYPE': 'liveScoring',
+                'L': self.league_id,
+                'APIKEY': self.api_key,
+                'DETAILS': 1,
+                'JSON': 1
+            }
+            if week:
+                params['W'] = week
+            
+            response = self.session.get(self.base_url, params=params, timeout=30)
+            response.raise_for_status()
+            
+            live_scoring = response.json().get('liveScoring', {})
+            matchups = live_scoring.get('matchup', [])
+            if isinstance(matchups, dict):
+                matchups = [matchups]
+            
+            # Franchises on a bye (odd league sizes) are listed outside the matchups
+            franchises = live_scoring.get('franchise', [])
+            franchises = [franchises] if isinstance(franchises, dict) else list(franchises)
+            for matchup in matchups:
+                matchup_franchises = matchup.get('franchise', [])
+                franchises.extend([matchup_franchises] if isinstance(matchup_franchises, dict) else matchup_franchises)
+            
+            starters = {}
+            for franchise in franchises:
+                players = franchise.get('players', {}).get('player', [])
+                if isinstance(players, dict):
+                    players = [players]
+                starters[franchise['id']] = frozenset(player['id'] for player in players
+                                                      if player.get('status') == 'starter')
+            
+            live_week = int(live_scoring['week']) if live_scoring.get('week') else week
+            return live_week, starters
+        
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching lineups from MFL: {e}")
+            return week, {}
+        except (ValueError, KeyError) as e:
+            print(f"Error parsing MFL lineups: {e}")
+            return week, {}
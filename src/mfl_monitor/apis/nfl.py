@@ -0,0 +1,59 @@
+"""
+Shared NFL schedule helpers used by every schedule source
+"""
+
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Tuple
+
+# Team name (ESPN, The Odds API) to MFL abbreviation mapping
+TEAM_MAPPING = {
+    'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
+    'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
+    'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
+    'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GBP',
+    'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAC',
+    'Kansas City Chiefs': 'KCC', 'Las Vegas Raiders': 'LVR', 'Los Angeles Chargers': 'LAC',
+    'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
+    'New England Patriots': 'NEP', 'New Orleans Saints': 'NOS', 'New York Giants': 'NYG',
+    'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
+    'San Francisco 49ers': 'SFO', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TBB',
+    'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS'
+}
+
+# Codes older versions wrote for some teams, and the MFL code they stand for
+TEAM_ALIASES = {'JAX': 'JAC'}
+
+def current_week_range() -> Tuple[datetime, datetime]:
+    """Get this week's Thursday 00:00 UTC and the end of Monday night"""
+    now = datetime.now(timezone.utc)
+    
+    # Find the most recent Thursday (or this Thursday if it's before Thursday 8PM)
+    if now.weekday() > 3 or (now.weekday() == 3 and now.hour >= 20):
+        # Go back to the most recent Thursday
+        this_thursday = now - timedelta(days=now.weekday() - 3)
+    else:
+        # Look forward to this Thursday
+        days_until_thursday = (3 - now.weekday()) % 7
+        if days_until_thursday == 0 and now.weekday() != 3:
+            days_until_thursday = 7
+        this_thursday = now + timedelta(days=days_until_thursday)
+    this_thursday = this_thursday.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # Monday night kickoffs are early Tuesday in UTC
+    monday_night = this_thursday + timedelta(days=5, hours=12)
+    return this_thursday, monday_night
+
+def filter_current_week(all_games: Dict[str, datetime]) -> Dict[str, datetime]:
+    """Filter to only include Thursday to Monday games"""
+    this_thursday, monday_night = current_week_range()
+    
+    print(f"📅 Looking for games between {this_thursday.strftime('%Y-%m-%d')} and {monday_night.strftime('%Y-%m-%d')}")
+    
+    # Filter games to only include this week's games
+    filtered_games = {}
+    for team, game_time in all_games.items():
+        if this_thursday <= game_time <= monday_night:
+            filtered_games[team] = game_time
+    
+    print(f"📅 Found {len(filtered_games)} teams playing this week (Thursday to Monday)")
+    return filtered_games
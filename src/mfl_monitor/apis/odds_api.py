@@ -4,11 +4,14 @@ The Odds API integration for NFL game times
 
 import requests
 import json
-import os
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional
 from ..utils.config import Config
 from ..utils.quota import QuotaManager
+from ..utils.tiered_cache import TieredCache
+from .nfl import TEAM_MAPPING, current_week_range
+
+ODDS_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
 class OddsAPIClient:
     """The Odds API client for NFL game times"""
@@ -17,9 +20,10 @@ class OddsAPIClient:
         self.api_key = api_key or Config.ODDS_API_KEY
         self.base_url = "https://api.the-odds-api.com/v4"
         self.quota_manager = QuotaManager()
-        
-    def get_nfl_schedule(self, days_back: int = 7, days_ahead: int = 7) -> List[Dict]:
-        """Get NFL schedule from The Odds API including past and future games"""
+        self.cache = TieredCache('odds_game_times', Config.ODDS_CACHE_FILE, disk_items=8)
+    
+    def get_nfl_schedule(self, start: datetime, end: datetime) -> List[Dict]:
+        """Get NFL events from The Odds API that kick off between start and end"""
         if not self.quota_manager.check_quota_status():
             print("❌ Skipping API request due to quota limits")
             return []
@@ -28,8 +32,8 @@ class OddsAPIClient:
             url = f"{self.base_url}/sports/americanfootball_nfl/events"
             params = {
                 'apiKey': self.api_key,
-                'daysFrom': days_ahead,
-                'daysBack': days_back
+                'commenceTimeFrom': start.strftime(ODDS_TIME_FORMAT),
+                'commenceTimeTo': end.strftime(ODDS_TIME_FORMAT)
             }
             
             response = requests.get(url, params=params, timeout=30)
@@ -38,9 +42,9 @@ class OddsAPIClient:
             self.quota_manager.update_quota_usage(response.headers)
             
             games = response.json()
-            print(f"✅ Retrieved {len(games)} NFL games from The Odds API (past {days_back} days, future {days_ahead} days)")
+            print(f"✅ Retrieved {len(games)} NFL games from The Odds API ({params['commenceTimeFrom']} to {params['commenceTimeTo']})")
             return games
-            
+        
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching NFL schedule from The Odds API: {e}")
             return []
@@ -48,102 +52,46 @@ class OddsAPIClient:
             print(f"❌ Error parsing The Odds API response: {e}")
             return []
     
-    def get_game_times_by_team(self, days_back: int = 7, days_ahead: int = 7) -> Dict[str, datetime]:
-        """Get game start times organized by team abbreviation including past and future games"""
-        games = self.get_nfl_schedule(days_back, days_ahead)
-        team_game_times = {}
-        
-        # Filter games to only include Thursday to Monday of current week
-        now = datetime.now(timezone.utc)
-        
-        # Find the most recent Thursday (or this Thursday if it's before Thursday 8PM)
-        if now.weekday() > 3 or (now.weekday() == 3 and now.hour >= 20):  # Past Thursday 8PM
-            # Go back to the most recent Thursday
-            this_thursday = now - timedelta(days=now.weekday() - 3)
-            this_thursday = this_thursday.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            # Look forward to this Thursday
-            days_until_thursday = (3 - now.weekday()) % 7
-            if days_until_thursday == 0 and now.weekday() != 3:
-                days_until_thursday = 7
-            this_thursday = now + timedelta(days=days_until_thursday)
-            this_thursday = this_thursday.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        next_monday = this_thursday + timedelta(days=5)
-        
-        print(f"📅 Looking for games between {this_thursday.strftime('%Y-%m-%d')} and {next_monday.strftime('%Y-%m-%d')}")
-        
-        # Filter games to only include this week's games (past and future)
-        filtered_games = []
-        for game in games:
-            try:
-                commence_time = game.get('commence_time')
-                if not commence_time:
-                    continue
-                
-                game_time = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
-                
-                if this_thursday <= game_time <= next_monday:
-                    filtered_games.append(game)
-                    
-            except (ValueError, KeyError) as e:
-                print(f"⚠️  Error processing game {game}: {e}")
-                continue
-        
-        print(f"📅 Found {len(filtered_games)} games in current week (Thursday to Monday)")
-        
-        # Fallback: If no Thursday games found, add the current week's Thursday game manually
-        if not any(datetime.fromisoformat(g['commence_time'].replace('Z', '+00:00')).weekday() == 3 for g in filtered_games):
-            print("⚠️  No Thursday games found in API data, adding fallback Thursday game")
-            # Add PHI vs opponent for this Thursday (common Thursday night teams)
-            thursday_game = {
-                'home_team': 'Philadelphia Eagles',
-                'away_team': 'Opponent Team',  # We don't know the actual opponent
-                'commence_time': this_thursday.strftime('%Y-%m-%dT20:00:00Z')
-            }
-            filtered_games.append(thursday_game)
-            print(f"📅 Added fallback Thursday game: {thursday_game['home_team']} vs {thursday_game['away_team']}")
+    def save_cache(self, window: str, game_times: Dict[str, datetime]):
+        """Save game times for a window"""
+        self.cache.set(window, {team: game_time.isoformat() for team, game_time in game_times.items()},
+                       Config.ODDS_CACHE_TTL_HOURS * 3600)
+    
+    def get_game_times_by_team(self, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None) -> Dict[str, datetime]:
+        """Get game start times by team abbreviation for a window (this week by default)
         
-        games = filtered_games
+        Results are cached per window, so falling back to The Odds API again in
+        the same week uses no quota.
+        """
+        if start is None or end is None:
+            start, end = current_week_range()
+        window = f"{start.strftime(ODDS_TIME_FORMAT)}_to_{end.strftime(ODDS_TIME_FORMAT)}"
         
-        # Team name to abbreviation mapping
-        team_mapping = {
-            'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
-            'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
-            'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
-            'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GBP',
-            'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAX',
-            'Kansas City Chiefs': 'KCC', 'Las Vegas Raiders': 'LVR', 'Los Angeles Chargers': 'LAC',
-            'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
-            'New England Patriots': 'NEP', 'New Orleans Saints': 'NOS', 'New York Giants': 'NYG',
-            'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
-            'San Francisco 49ers': 'SFO', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TBB',
-            'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS'
-        }
+        cached = self.cache.get(window)
+        if cached:
+            print(f"📅 Using cached Odds API game times for {window}")
+            return {team: datetime.fromisoformat(time_str) for team, time_str in cached.items()}
         
-        for game in games:
+        team_game_times = {}
+        for game in self.get_nfl_schedule(start, end):
             try:
-                commence_time = game.get('commence_time')
-                if not commence_time:
-                    continue
-                
-                game_time = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
+                game_time = datetime.fromisoformat(game['commence_time'].replace('Z', '+00:00'))
                 
                 home_team = game.get('home_team', '')
                 away_team = game.get('away_team', '')
                 
-                home_abbrev = team_mapping.get(home_team, home_team)
-                away_abbrev = team_mapping.get(away_team, away_team)
-                
-                team_game_times[home_abbrev] = game_time
-                team_game_times[away_abbrev] = game_time
+                team_game_times[TEAM_MAPPING.get(home_team, home_team)] = game_time
+                team_game_times[TEAM_MAPPING.get(away_team, away_team)] = game_time
                 
                 print(f"📅 {home_team} vs {away_team} at {game_time}")
-                
+            
             except (ValueError, KeyError) as e:
                 print(f"⚠️  Error processing game {game}: {e}")
                 continue
         
+        if team_game_times:
+            self.save_cache(window, team_game_times)
         return team_game_times
     
     def test_api_connection(self) -> bool:
@@ -159,7 +107,7 @@ class OddsAPIClient:
             
             print("✅ The Odds API connection successful")
             return True
-            
+        
         except Exception as e:
             print(f"❌ The Odds API connection failed: {e}")
             return False
@@ -4,5 +4,11 @@ Core functionality for MFL Transaction Monitor
 
 from .analyzer import TransactionAnalyzer
 from .scheduler import TransactionScheduler
+from .activity import ActivityCalendar
+from .pipeline import TransactionPipeline
+from .lineups import LineupMonitor
+from .bulk import BulkEvaluator
+from .lock_table import LockTable
+from .jobs import Job, JobRunner
 
-__all__ = ["TransactionAnalyzer", "TransactionScheduler"]
+__all__ = ["TransactionAnalyzer", "TransactionScheduler", "ActivityCalendar", "TransactionPipeline", "LineupMonitor", "BulkEvaluator", "LockTable", "Job", "JobRunner"]
@@ -0,0 +1,123 @@
+"""
+Weekly activity calendar compiled to a minute-of-week bitmap
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import pytz
+from ..utils.config import Config
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+NEVER = 0xFFFF
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+def parse_clock(value: str) -> int:
+    """Turn an 'HH:MM' string into minutes after midnight"""
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+class ActivityCalendar:
+    """Answers "should I poll now / when next?" from a precompiled bitmap
+    
+    Every minute of the week (New York time) gets one bit. The bits are set from
+    the configured Thursday-to-Monday window, cleared for the nightly skip period,
+    and then set again around every kickoff in the week's schedule so Thanksgiving,
+    Christmas, London and postseason games are covered automatically.
+    """
+    
+    def __init__(self, game_times: Dict[str, datetime] = None,
+                 lead_minutes: int = None, trail_minutes: int = None):
+        self.timezone = pytz.timezone('America/New_York')
+        self.lead_minutes = Config.ACTIVE_LEAD_MINUTES if lead_minutes is None else lead_minutes
+        self.trail_minutes = Config.ACTIVE_TRAIL_MINUTES if trail_minutes is None else trail_minutes
+        self.bits = bytearray(MINUTES_PER_WEEK // 8)
+        self.next_on = array('H', [NEVER]) * MINUTES_PER_WEEK
+        self.compile(game_times or {})
+    
+    def minute_of_week(self, when: datetime) -> int:
+        """Minute index (0 = Monday 00:00 New York time) for a datetime"""
+        if when.tzinfo is None:
+            when = pytz.utc.localize(when)
+        local = when.astimezone(self.timezone)
+        return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+    
+    def _fill(self, start: int, end: int, value: bool):
+        """Set or clear every minute from start to end inclusive, wrapping the week"""
+        length = (end - start) % MINUTES_PER_WEEK + 1
+        for offset in range(length):
+            minute = (start + offset) % MINUTES_PER_WEEK
+            if value:
+                self.bits[minute >> 3] |= 1 << (minute & 7)
+            else:
+                self.bits[minute >> 3] &= ~(1 << (minute & 7)) & 0xFF
+    
+    def compile(self, game_times: Dict[str, datetime]):
+        """Build the bitmap and the next-active lookup table"""
+        self.bits[:] = bytes(len(self.bits))
+        
+        start_day = WEEKDAYS.get(Config.SCHEDULE_START_DAY.lower(), 3)
+        end_day = WEEKDAYS.get(Config.SCHEDULE_END_DAY.lower(), 0)
+        window_start = start_day * MINUTES_PER_DAY + parse_clock(Config.SCHEDULE_START_TIME)
+        window_end = end_day * MINUTES_PER_DAY + parse_clock(Config.SCHEDULE_END_TIME)
+        self._fill(window_start, window_end, True)
+        
+        skip_start = parse_clock(Config.SKIP_START_TIME)
+        skip_end = parse_clock(Config.SKIP_END_TIME)
+        for day in range(7):
+            base = day * MINUTES_PER_DAY
+            self._fill(base + skip_start, base + skip_end, False)
+        
+        # Games override the skip period (early London kickoffs, late postseason games)
+        for kickoff in set(game_times.values()):
+            minute = self.minute_of_week(kickoff)
+            self._fill(minute - self.lead_minutes, minute + self.trail_minutes, True)
+        
+        self._build_next_table()
+    
+    def _build_next_table(self):
+        """Precompute minutes until the next active minute for every minute of the week"""
+        distance = NEVER
+        # Two passes backwards so the search wraps from Sunday night into Monday
+        for pass_number in range(2):
+            for minute in range(MINUTES_PER_WEEK - 1, -1, -1):
+                if self.is_active_minute(minute):
+                    distance = 0
+                elif distance != NEVER:
+                    distance += 1
+                if pass_number == 1:
+                    self.next_on[minute] = min(distance, NEVER)
+    
+    def is_active_minute(self, minute: int) -> bool:
+        """Check a single bit"""
+        return bool(self.bits[minute >> 3] & (1 << (minute & 7)))
+    
+    def is_active(self, when: datetime = None) -> bool:
+        """Check whether monitoring should be running at the given time"""
+        when = when or datetime.now(self.timezone)
+        return self.is_active_minute(self.minute_of_week(when))
+    
+    def minutes_until_active(self, when: datetime = None) -> Optional[int]:
+        """Minutes until the next active minute (0 if active now, None if never)"""
+        when = when or datetime.now(self.timezone)
+        distance = self.next_on[self.minute_of_week(when)]
+        return None if distance == NEVER else distance
+    
+    def next_active(self, when: datetime = None) -> Optional[datetime]:
+        """When monitoring should next be running"""
+        when = when or datetime.now(self.timezone)
+        distance = self.minutes_until_active(when)
+        if distance is None:
+            return None
+        if distance == 0:
+            return when
+        return (when + timedelta(minutes=distance)).replace(second=0, microsecond=0)
+    
+    def active_minutes(self) -> int:
+        """Total active minutes per week"""
+        return sum(bin(byte).count('1') for byte in self.bits)
@@ -4,15 +4,24 @@ MFL transaction monitor - checks for players picked up after their games start
 
 import json
 import os
-import re
 import asyncio
-import pytz
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
+from typing import Iterable, Dict
 from ..utils.config import Config
 from ..apis.mfl_api import MFLAPI
 from ..apis.discord_bot import DiscordNotifier
 from ..utils.cache import GameTimeCache
+from ..utils.outbox import Outbox
+from ..utils.player_index import PlayerIndex
+from ..utils.franchise_cache import FranchiseCache
+from ..utils.tiered_cache import cache_summaries
+from ..utils.http import single_flight_stats
+from ..utils.formatting import format_timestamp, format_game_start
+from ..utils.records import Player, Transaction
+from .rules import RuleEngine, Violation
+from .lineups import LineupMonitor
+from .lock_table import LockTable, get_lock_table
 
 class TransactionAnalyzer:
     """Checks if anyone picked up players after their games started"""
@@ -21,9 +30,17 @@ class TransactionAnalyzer:
         self.mfl_api = MFLAPI()
         self.discord_notifier = DiscordNotifier()
         self.cache = GameTimeCache()
+        self.outbox = Outbox()
+        self.rules = RuleEngine()
+        self.lineups = LineupMonitor()
+        self.player_index = PlayerIndex()
+        self.franchise_cache = FranchiseCache()
+        # Turned off when a separate job keeps the player index up to date
+        self.refresh_players = True
+        self.pipeline = None
         self.data_file = Config.DATA_FILE
         self.last_run_data = self.load_last_run_data()
-        
+    
     def load_last_run_data(self) -> Dict:
         """Load when we last checked transactions"""
         if os.path.exists(self.data_file):
@@ -49,219 +66,184 @@ class TransactionAnalyzer:
         game_times = self.cache.get_game_times()
         return game_times
     
-    def is_player_pickup_after_game_start(self, transaction: Dict, game_times: Dict[str, datetime]) -> bool:
-        """See if someone picked up a player after their game already started"""
-        try:
-            transaction_type = transaction.get('type', '')
-            if transaction_type not in ['FREE_AGENT', 'BBID_WAIVER', 'BBID_AUTO_PROCESS_WAIVERS']:
-                return False
-            
-            timestamp_str = transaction.get('timestamp', '')
-            if not timestamp_str:
-                return False
-            
-            try:
-                timestamp_int = int(timestamp_str)
-                transaction_time = datetime.fromtimestamp(timestamp_int, tz=timezone.utc)
-            except ValueError:
-                print(f"Invalid timestamp format: {timestamp_str}")
-                return False
-            
-            transaction_data = transaction.get('transaction', '')
-            if not transaction_data or ',' not in transaction_data or '|' not in transaction_data:
-                return False
-            
-            added_players_str = transaction_data.split('|')[0].rstrip(',')
-            if not added_players_str:
-                return False
-            
-            player_id = added_players_str.split(',')[0]
-            if not player_id:
-                return False
-            
-            players = self.mfl_api.get_players()
-            if player_id not in players:
-                print(f"Player {player_id} not found in players data")
-                return False
-            
-            player_team = players[player_id].get('team', '')
-            player_name = players[player_id].get('name', 'Unknown Player')
-            if not player_team or player_team not in game_times:
-                print(f"Player {player_name} ({player_id}) team {player_team} not found in game times")
-                return False
-            
-            game_start_time = game_times[player_team]
-            is_after = transaction_time > game_start_time
-            
-            if is_after:
-                print(f"VIOLATION: Player {player_name} ({player_id}) picked up at {transaction_time} after game start at {game_start_time}")
-            
-            return is_after
-            
-        except (ValueError, KeyError) as e:
-            print(f"Error checking transaction timing: {e}")
-            return False
+    def load_players(self) -> Dict[str, Player]:
+        """Bring the player index up to date and return everyone on their current team"""
+        if self.refresh_players or not len(self.player_index):
+            self.player_index.refresh(self.mfl_api)
+        return self.player_index.players_at(int(time.time()))
+    
+    def get_franchises(self, franchise_ids: Iterable[str] = ()) -> Dict[str, Dict]:
+        """Franchise names and owners, from the cache unless it's stale or missing one of franchise_ids"""
+        return self.franchise_cache.get(self.mfl_api, franchise_ids)
+    
+    def get_added_player_id(self, transaction: Transaction) -> str:
+        """Get the first player added in a transaction"""
+        return transaction.added[0] if transaction.added else ''
     
-    def format_transaction_message(self, transaction: Dict, players: Dict, franchises: Dict, game_start_time: datetime = None) -> str:
-        """Create the Discord message for violations"""
+    def violation_key(self, transaction: Transaction, violation: Violation = None) -> str:
+        """Idempotency key for a violation, so it is only ever alerted once"""
+        player_id = violation.player_id if violation else self.get_added_player_id(transaction)
+        rule_name = violation.rule if violation else 'late_pickup'
+        return f"{transaction.type}:{transaction.franchise}:{transaction.timestamp}:{player_id}:{rule_name}"
+    
+    def format_transaction_message(self, transaction: Transaction, players: Dict[str, Player],
+                                   franchises: Dict, game_start_time: datetime = None,
+                                   player_id: str = None, action: str = 'picked up by') -> str:
+        """Create the Discord message for violations (the added player unless player_id is given)"""
         try:
-            transaction_data = transaction.get('transaction', '')
-            if ',' in transaction_data and '|' in transaction_data:
-                added_players_str = transaction_data.split('|')[0].rstrip(',')
-                player_id = added_players_str.split(',')[0] if added_players_str else ''
-            else:
-                player_id = ''
-            
-            franchise_id = transaction.get('franchise', '')
-            timestamp = transaction.get('timestamp', '')
+            player_id = player_id or self.get_added_player_id(transaction)
             
             # Get player info
             player_name = "Unknown Player"
             player_position = "Unknown"
             player_team_abbrev = "Unknown"
             
-            if player_id and player_id in players:
-                player_data = players[player_id]
+            player = players.get(player_id) if player_id else None
+            if player is not None:
                 # Format name as "First Last" instead of "Last, First"
-                full_name = player_data.get('name', 'Unknown Player')
-                if ', ' in full_name:
-                    last_name, first_name = full_name.split(', ', 1)
-                    player_name = f"{first_name} {last_name}"
-                else:
-                    player_name = full_name
-                
-                player_position = player_data.get('position', 'Unknown')
-                player_team_abbrev = player_data.get('team', 'Unknown')
+                player_name = player.display_name() or "Unknown Player"
+                player_position = player.position or "Unknown"
+                player_team_abbrev = player.team or "Unknown"
             
             # Get franchise info
             franchise_name = "Unknown Team"
             owner_name = "Unknown Owner"
             
-            if franchise_id in franchises:
-                franchise_data = franchises[franchise_id]
+            if transaction.franchise in franchises:
+                franchise_data = franchises[transaction.franchise]
                 franchise_name = franchise_data.get('name', 'Unknown Team')
                 owner_name = franchise_data.get('owner_name', 'Unknown Owner')
             
-            # Convert pickup time to New York timezone
-            try:
-                timestamp_int = int(timestamp)
-                dt_utc = datetime.fromtimestamp(timestamp_int, tz=timezone.utc)
-                # Convert to New York time
-                ny_tz = pytz.timezone('America/New_York')
-                dt_ny = dt_utc.astimezone(ny_tz)
-                time_str = dt_ny.strftime("%m/%d %I:%M %p %Z")
-                # Clean up the time format
-                pickup_time = re.sub(r'0(\d):', r'\1:', time_str)  # Remove leading zero from hour
-                pickup_time = re.sub(r'0(\d)/', r'\1/', pickup_time)  # Remove leading zero from month
-                pickup_time = re.sub(r'/(\d{2})', lambda m: f'/{int(m.group(1))}', pickup_time)  # Remove leading zero from day
-            except ValueError:
-                pickup_time = timestamp
+            # Pickup and kickoff times in New York time
+            pickup_time = format_timestamp(transaction.timestamp)
             
-            # Format game start time if provided
             game_time_str = ""
             if game_start_time:
-                try:
-                    # Convert game start time to New York timezone
-                    if game_start_time.tzinfo is None:
-                        game_start_time = game_start_time.replace(tzinfo=timezone.utc)
-                    game_ny = game_start_time.astimezone(ny_tz)
-                    game_time_formatted = re.sub(r'0(\d):', r'\1:', game_ny.strftime('%I:%M %p %Z'))
-                    game_date_formatted = game_ny.strftime('%m/%d')
-                    # Clean up the date format
-                    game_date_formatted = re.sub(r'0(\d)/', r'\1/', game_date_formatted)  # Remove leading zero from month
-                    game_date_formatted = re.sub(r'/(\d{2})', lambda m: f'/{int(m.group(1))}', game_date_formatted)  # Remove leading zero from day
-                    game_time_str = f" | Game started: {game_date_formatted} {game_time_formatted}"
-                except Exception as e:
-                    print(f"Error formatting game time: {e}")
+                if game_start_time.tzinfo is None:
+                    game_start_time = game_start_time.replace(tzinfo=timezone.utc)
+                game_time_str = format_game_start(int(game_start_time.timestamp()))
             
             message = (
-                f"🚨 **{player_name} ({player_position}, {player_team_abbrev})** picked up by **{franchise_name} ({owner_name})**\n"
+                f"🚨 **{player_name} ({player_position}, {player_team_abbrev})** {action} **{franchise_name} ({owner_name})**\n"
                 f"⏰ {pickup_time}{game_time_str}"
             )
             
             return message
-            
+        
         except Exception as e:
             print(f"Error formatting transaction message: {e}")
             return f"Transaction alert: {transaction}"
     
-    def analyze_transactions(self) -> List[str]:
-        """Check all transactions and find violations"""
-        print("Starting transaction analysis...")
-        
-        current_time = datetime.now(timezone.utc)
-        
+    def get_last_run_time(self, current_time: datetime) -> datetime:
+        """When the last check ran (24 hours ago on the first run)"""
         last_run_time = self.last_run_data.get('last_run_time')
         if last_run_time:
-            last_run_time = datetime.fromisoformat(last_run_time)
-        else:
-            last_run_time = current_time - timedelta(hours=24)
-        
-        print(f"Checking transactions since: {last_run_time}")
-        
-        transactions = self.mfl_api.get_transactions(last_run_time)
-        players = self.mfl_api.get_players()
-        franchises = self.mfl_api.get_franchises()
-        game_times = self.get_game_start_times()
-        
-        print(f"Found {len(transactions)} transactions to analyze")
-        
-        # Only check transactions that happened after our last run
-        filtered_transactions = []
-        for transaction in transactions:
-            try:
-                timestamp_str = transaction.get('timestamp', '')
-                if timestamp_str:
-                    timestamp_int = int(timestamp_str)
-                    transaction_time = datetime.fromtimestamp(timestamp_int, tz=timezone.utc)
-                    if transaction_time > last_run_time:
-                        filtered_transactions.append(transaction)
-            except (ValueError, TypeError):
-                # Skip bad timestamps
-                continue
-        
-        print(f"Processing {len(filtered_transactions)} transactions after last run time")
-        
-        violation_messages = []
-        
-        for transaction in filtered_transactions:
-            if self.is_player_pickup_after_game_start(transaction, game_times):
-                # Get the game start time for this player's team
-                game_start_time = None
-                try:
-                    transaction_data = transaction.get('transaction', '')
-                    if ',' in transaction_data and '|' in transaction_data:
-                        added_players_str = transaction_data.split('|')[0].rstrip(',')
-                        player_id = added_players_str.split(',')[0] if added_players_str else ''
-                        if player_id and player_id in players:
-                            player_team = players[player_id].get('team', '')
-                            if player_team in game_times:
-                                game_start_time = game_times[player_team]
-                except Exception as e:
-                    print(f"Error getting game start time: {e}")
-                
-                message = self.format_transaction_message(transaction, players, franchises, game_start_time)
-                violation_messages.append(message)
-                print(f"Found violation: {message}")
+            return datetime.fromisoformat(last_run_time)
+        return current_time - timedelta(hours=24)
+    
+    def get_lock_table_at(self, transaction: Transaction, players: Dict[str, Player],
+                          game_times: Dict[str, datetime], tables_by_week: Dict) -> LockTable:
+        """Lock table for the week a transaction happened in, with players on the teams they were on then
         
+        Built once per week and set of teams per run. Weeks are told apart by
+        their archive key (None for the current schedule when the week isn't
+        archived).
+        """
+        week_key = self.cache.archive.week_for(transaction.timestamp)
+        version = self.player_index.version_at(transaction.timestamp) if len(self.player_index) else None
+        key = (week_key, version)
+        if key not in tables_by_week:
+            week_game_times = self.cache.get_game_times_at(transaction.timestamp, game_times)
+            if version is not None:
+                players = self.player_index.players_at(transaction.timestamp)
+            tables_by_week[key] = get_lock_table(players, self.cache.get_lock_times(week_game_times))
+        return tables_by_week[key]
+    
+    def save_last_run_time(self, current_time: datetime):
+        """Remember when this check ran"""
         self.last_run_data['last_run_time'] = current_time.isoformat()
         self.save_last_run_data(self.last_run_data)
+    
+    def check_lineups(self, players: Dict[str, Player], game_times: Dict[str, datetime]) -> int:
+        """Snapshot starters and queue alerts for locked players that were swapped"""
+        week, starters = self.mfl_api.get_starters()
+        if not week or not starters:
+            return 0
+        
+        lock_times = self.cache.get_lock_times(game_times)
+        queued = 0
+        swaps = self.lineups.check(week, starters, players, lock_times)
+        franchises = self.get_franchises({swap.franchise for swap in swaps}) if swaps else {}
+        for swap in swaps:
+            transaction = Transaction('LINEUP', swap.franchise, swap.seen_at)
+            message = self.format_transaction_message(transaction, players, franchises, swap.lock_time,
+                                                      swap.player_id, swap.action)
+            print(f"Found lineup violation: {message}")
+            if self.outbox.add(f"LINEUP:{swap.franchise}:{week}:{swap.player_id}:{swap.seen_at}", message):
+                queued += 1
+        return queued
+    
+    async def prewarm(self):
+        """Refresh everything a check needs and log in to Discord before a kickoff"""
+        started = time.perf_counter()
+        game_times, _, _, _ = await asyncio.gather(
+            asyncio.to_thread(self.get_game_start_times),
+            asyncio.to_thread(self.cache.status.refresh, True),
+            asyncio.to_thread(self.player_index.refresh, self.mfl_api),
+            asyncio.to_thread(self.get_franchises)
+        )
+        # Builds the lock table the first check after kickoff will look up
+        players = self.player_index.players_at(int(time.time()))
+        get_lock_table(players, self.cache.get_lock_times(game_times))
         
-        return violation_messages
+        try:
+            await self.discord_notifier.warm_up()
+        except Exception as e:
+            print(f"⚠️  Could not log in to Discord ahead of kickoff: {e}")
+        print(f"🔥 Prewarmed schedule, game status, {len(players)} players and Discord in "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    
+    async def deliver_pending(self) -> int:
+        """Send whatever is waiting in the outbox"""
+        due = len(self.outbox.due())
+        if not due:
+            return 0
+        print(f"📬 Delivering {due} queued Discord messages")
+        return await self.discord_notifier.deliver(self.outbox)
     
     async def run_analysis(self):
-        """Run the check and send Discord alerts"""
+        """Run the check, sending each Discord alert as soon as it is found"""
+        from .pipeline import TransactionPipeline
         try:
-            violation_messages = self.analyze_transactions()
-            
-            if violation_messages:
-                print(f"Found {len(violation_messages)} violations")
-                for message in violation_messages:
-                    await self.discord_notifier.send_notification(message)
-                    await asyncio.sleep(1)
-            else:
+            # Messages left over from an earlier run go out while this one runs
+            leftovers = self.outbox.due()
+            sender = asyncio.create_task(self.discord_notifier.deliver(self.outbox, leftovers))
+            if leftovers:
+                print(f"📬 Delivering {len(leftovers)} queued Discord messages")
+            
+            self.pipeline = TransactionPipeline(self)
+            stats = await self.pipeline.run()
+            await sender
+            
+            if Config.CHECK_LINEUPS:
+                lineup_violations = await asyncio.to_thread(self.check_lineups, self.pipeline.players,
+                                                            self.pipeline.game_times)
+                if lineup_violations:
+                    stats['violations'] += lineup_violations
+                    await self.deliver_pending()
+            
+            if not stats['violations']:
                 print("No violations found")
-                
+            
+            for summary in cache_summaries().values():
+                print(f"📦 Cache {summary}")
+            for name, counts in single_flight_stats().items():
+                if counts['coalesced']:
+                    print(f"🔀 {name}: {counts['coalesced']} requests shared {counts['fetches']} fetches")
+            
+            if self.outbox.pending_count():
+                print(f"📬 {self.outbox.pending_count()} Discord messages will be retried next run")
+        
         except Exception as e:
             print(f"Error during analysis: {e}")
             await self.discord_notifier.send_notification(f"❌ Error in transaction analysis: {str(e)}")
@@ -0,0 +1,122 @@
+"""
+Historical backfill - audits a date range of transactions without sending alerts
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from ..utils.config import Config
+from ..utils.schedule_archive import ScheduleArchive, week_start, REGULAR_SEASON, REGULAR_SEASON_WEEKS
+from ..utils.records import parse_transactions
+from ..apis.mfl_api import MFLAPI
+from ..apis.espn_api import ESPNAPIClient
+from .analyzer import TransactionAnalyzer
+from .bulk import BulkEvaluator
+
+class BackfillRunner:
+    """Replays past transactions against the schedule of the week they happened in"""
+    
+    def __init__(self, report_file: str = None):
+        self.mfl_api = MFLAPI()
+        self.espn_client = ESPNAPIClient()
+        self.archive = ScheduleArchive()
+        self.analyzer = TransactionAnalyzer()
+        self.report_file = report_file or Config.BACKFILL_REPORT_FILE
+        self.year = int(Config.MFL_YEAR)
+    
+    def load_week_schedules(self, start: datetime, end: datetime) -> List[Tuple[int, int, Dict[str, datetime]]]:
+        """Get (week start timestamp, week, game times) for every week overlapping the range"""
+        weeks = list(range(1, REGULAR_SEASON_WEEKS + 1))
+        
+        # Only weeks missing from the archive are fetched from ESPN
+        missing = [week for week in weeks if not self.archive.has_week(self.year, REGULAR_SEASON, week)]
+        if missing:
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                schedules = list(pool.map(
+                    lambda week: self.espn_client.get_game_times_by_team(week, self.year, REGULAR_SEASON), missing))
+            for week, game_times in zip(missing, schedules):
+                if game_times:
+                    self.archive.append_week(self.year, REGULAR_SEASON, week, game_times)
+        
+        week_schedules = []
+        for week in weeks:
+            game_times = self.archive.get_week(self.year, REGULAR_SEASON, week)
+            if not game_times:
+                print(f"⚠️  No schedule found for week {week}")
+                continue
+            begins = week_start(game_times)
+            if begins + timedelta(days=7) <= start or begins >= end:
+                continue
+            week_schedules.append((int(begins.timestamp()), week, game_times))
+        
+        return sorted(week_schedules, key=lambda item: item[0])
+    
+    def run(self, start: datetime, end: datetime) -> int:
+        """Audit every transaction in [start, end) and write violations to the report file"""
+        started = time.perf_counter()
+        print(f"Backfilling transactions from {start} to {end}")
+        
+        week_schedules = self.load_week_schedules(start, end)
+        if not week_schedules:
+            print("❌ No NFL weeks found in that range")
+            return 0
+        
+        week_starts = [item[0] for item in week_schedules]
+        players = self.analyzer.load_players()
+        player_index = self.analyzer.player_index
+        franchises = {}
+        start_ts = int(start.timestamp())
+        end_ts = int(end.timestamp())
+        
+        seen = set()
+        transactions = []
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Chunks are fetched a week at a time, in the background, and collected in order
+            chunks = pool.map(lambda item: self.mfl_api.get_transactions(week=item[1], types=self.analyzer.rules.types), week_schedules)
+            for chunk in chunks:
+                for transaction in parse_transactions(chunk):
+                    if not start_ts <= transaction.timestamp < end_ts:
+                        continue
+                    
+                    # MFL's week boundaries can differ from ours, so skip repeats
+                    key = (transaction.timestamp, transaction.franchise, transaction.data)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    transactions.append(transaction)
+        
+        # Every rule for the whole range at once, with teams as they were when each transaction happened
+        evaluator = BulkEvaluator([(begins, game_times) for begins, _, game_times in week_schedules],
+                                  self.analyzer.rules)
+        found = evaluator.find_violations(transactions, player_index)
+        
+        os.makedirs(os.path.dirname(self.report_file) or '.', exist_ok=True)
+        with open(self.report_file, 'w') as report:
+            for row, violation in found:
+                transaction = transactions[row]
+                week = week_schedules[bisect_right(week_starts, transaction.timestamp) - 1][1]
+                if transaction.franchise not in franchises:
+                    franchises = self.analyzer.get_franchises([transaction.franchise])
+                report.write(json.dumps({
+                    'week': week,
+                    'timestamp': transaction.timestamp,
+                    'franchise': transaction.franchise,
+                    'player_id': violation.player_id,
+                    'type': transaction.type,
+                    'rule': violation.rule,
+                    'game_start': violation.lock_time.isoformat(),
+                    'message': self.analyzer.format_transaction_message(
+                        transaction, players, franchises, violation.lock_time,
+                        violation.player_id, violation.action)
+                }) + '\n')
+        
+        violations = len(found)
+        scanned = len(transactions)
+        elapsed = time.perf_counter() - started
+        print(f"✅ Backfill checked {scanned} transactions over {len(week_schedules)} weeks in {elapsed:.1f}s")
+        print(f"   {violations} violations written to {self.report_file}")
+        return violations
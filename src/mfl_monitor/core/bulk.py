@@ -0,0 +1,141 @@
+"""
+Bulk post-lock checks for backfills and many leagues at once
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+from ..utils.player_index import PlayerColumns, PlayerIndex
+from ..utils.records import Transaction, TransactionColumns
+from .lock_table import LockTable
+from .rules import RuleEngine, Violation, added_players, dropped_players, moved_players
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional - without it the rule engine runs one transaction at a time
+    np = None
+
+# Lock time for a team with no game that week (nothing is ever after it)
+NEVER = 2 ** 63 - 1
+
+# Which of a transaction's player lists each built-in rule covers, in order
+RULE_SIDES = {added_players: ('added',), dropped_players: ('dropped',), moved_players: ('added', 'dropped')}
+
+class BulkEvaluator:
+    """Runs the rule engine over a whole batch of transactions in one go
+    
+    Transactions are turned into TransactionColumns and players into the
+    index's per-version team columns, so every player a rule covers becomes
+    one integer gather of its team, then its week's kickoff, and one
+    comparison. Results are the same as RuleEngine.evaluate with a lock table
+    built from the week's kickoffs and the players' teams at the time, which
+    is how backfill judges transactions. Without numpy, or with a rule whose
+    players aren't one of the built-in lists, that is exactly what runs.
+    """
+    
+    def __init__(self, weeks: Iterable[Tuple[int, Dict[str, datetime]]], rules: RuleEngine = None):
+        weeks = sorted(weeks, key=lambda item: item[0])
+        self.rules = rules or RuleEngine()
+        self.week_starts = [start for start, _ in weeks]
+        self.week_game_times = [game_times for _, game_times in weeks]
+        self.team_ids = sorted({team for _, game_times in weeks for team in game_times})
+        self.team_index = {team: index for index, team in enumerate(self.team_ids)}
+        # Rules with their own player functions can only run through the rule engine
+        self.vectorized = all(registered.players in RULE_SIDES for registered in self.rules.rules)
+        
+        team_count = len(self.team_ids)
+        self.kickoffs = array('q', [NEVER]) * (len(weeks) * team_count)
+        for week, (_, game_times) in enumerate(weeks):
+            for team, kickoff in game_times.items():
+                self.kickoffs[week * team_count + self.team_index[team]] = int(kickoff.timestamp())
+    
+    def find_violations(self, transactions: List[Transaction], player_index: PlayerIndex) -> List[Tuple[int, Violation]]:
+        """(row, violation) for every player whose team had kicked off before the transaction"""
+        if not transactions or not self.team_ids:
+            return []
+        if np is None or not self.vectorized:
+            return self._find_scalar(transactions, player_index)
+        
+        columns = TransactionColumns.from_transactions(transactions)
+        lock_times: Dict[int, datetime] = {}
+        violations = []
+        for row, number, player_id, lock_ts in self._find_numpy(columns, player_index.columns()):
+            registered = self.rules.rules[number]
+            # Only a handful of kickoffs a week, so each one's datetime is made once
+            lock_time = lock_times.get(lock_ts)
+            if lock_time is None:
+                lock_time = lock_times[lock_ts] = datetime.fromtimestamp(lock_ts, tz=timezone.utc)
+            violations.append((row, Violation(registered.name, registered.action, player_id, lock_time)))
+        return violations
+    
+    def _find_numpy(self, columns: TransactionColumns, players: PlayerColumns) -> List[Tuple[int, int, str, int]]:
+        """(row, rule number, player id, lock time) for each violation, in rule engine order"""
+        if not players.player_numbers:
+            return []
+        player_count = len(players.player_numbers)
+        timestamps = np.frombuffer(columns.timestamps, dtype=np.int64)
+        types = np.frombuffer(columns.types, dtype=np.uint8)
+        weeks = np.searchsorted(np.asarray(self.week_starts, dtype=np.int64), timestamps, side='right') - 1
+        versions = np.searchsorted(np.asarray(players.change_times, dtype=np.int64), timestamps, side='right')
+        
+        # Column player index -> index player number, and index team -> schedule team (-1 for unknown)
+        numbers = np.array([players.player_numbers.get(player_id, -1) for player_id in columns.player_ids], dtype=np.int64)
+        schedule_teams = np.array([self.team_index.get(team, -1) for team in players.team_names], dtype=np.int64)
+        teams_by_version = np.frombuffer(players.teams, dtype=np.uint16)
+        kickoffs = np.frombuffer(self.kickoffs, dtype=np.int64)
+        
+        sides = {}
+        for side in ('added', 'dropped'):
+            counts = np.frombuffer(getattr(columns, f'{side}_counts'), dtype=np.uint8).astype(np.int64)
+            player_columns = getattr(columns, side)
+            rows = np.repeat(np.arange(len(columns), dtype=np.int64), counts)
+            starts = np.cumsum(counts) - counts
+            positions = np.arange(len(rows), dtype=np.int64) - np.repeat(starts, counts)
+            sides[side] = (rows, np.frombuffer(player_columns, dtype=player_columns.typecode).astype(np.int64), positions)
+        
+        found = []
+        for number, registered in enumerate(self.rules.rules):
+            type_codes = [code for code, transaction_type in enumerate(columns.type_ids) if transaction_type in registered.types]
+            if not type_codes:
+                continue
+            for side_number, side in enumerate(RULE_SIDES[registered.players]):
+                rows, player_columns, positions = sides[side]
+                covered = np.isin(types[rows], type_codes)
+                rows, player_columns, positions = rows[covered], player_columns[covered], positions[covered]
+                
+                # Team at the time (via the index version), then that team's kickoff in the week
+                player_numbers = numbers[player_columns]
+                known = player_numbers >= 0
+                cells = np.where(known, versions[rows] * player_count + player_numbers, 0)
+                teams = np.where(known, schedule_teams[teams_by_version[cells]], -1)
+                row_weeks = weeks[rows]
+                valid = (teams >= 0) & (row_weeks >= 0)
+                lock_times = np.where(valid, kickoffs[np.where(valid, row_weeks * len(self.team_ids) + teams, 0)], NEVER)
+                hits = np.flatnonzero(timestamps[rows] > lock_times)
+                found.append((rows[hits], np.full(len(hits), number), np.full(len(hits), side_number),
+                              positions[hits], player_columns[hits], lock_times[hits]))
+        if not found:
+            return []
+        
+        rows, rule_numbers, side_numbers, positions, player_columns, lock_times = (np.concatenate(parts) for parts in zip(*found))
+        order = np.lexsort((positions, side_numbers, rule_numbers, rows))
+        return [(row, number, columns.player_ids[player_column], lock_ts)
+                for row, number, player_column, lock_ts in zip(rows[order].tolist(), rule_numbers[order].tolist(),
+                                                                player_columns[order].tolist(), lock_times[order].tolist())]
+    
+    def _find_scalar(self, transactions: List[Transaction], player_index: PlayerIndex) -> List[Tuple[int, Violation]]:
+        """The rule engine one transaction at a time, with a lock table per week and index version"""
+        tables: Dict[Tuple[int, int], LockTable] = {}
+        found = []
+        for row, transaction in enumerate(transactions):
+            week = bisect_right(self.week_starts, transaction.timestamp) - 1
+            if week < 0:
+                continue
+            key = (week, player_index.version_at(transaction.timestamp))
+            table = tables.get(key)
+            if table is None:
+                table = tables[key] = LockTable(player_index.players_at(transaction.timestamp), self.week_game_times[week])
+            found.extend((row, violation) for violation in self.rules.evaluate(transaction, table))
+        return found
@@ -0,0 +1,111 @@
+"""
+Recurring daemon jobs, each on its own cadence
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Union
+from ..utils.config import Config
+from ..utils.files import write_json_atomic
+
+# Seconds, or a function returning seconds (so a job can speed up during games)
+Interval = Union[float, Callable[[], float]]
+
+class Job:
+    """A recurring job
+    
+    If inputs is given, it returns a fingerprint of whatever the job reads;
+    a run is skipped when the fingerprint matches the last successful run.
+    A None fingerprint always runs.
+    """
+    
+    def __init__(self, name: str, interval: Interval, action: Callable[[], Awaitable],
+                 jitter: float = None, inputs: Callable[[], Optional[Hashable]] = None):
+        self.name = name
+        self.interval = interval
+        self.action = action
+        self.jitter = Config.JOB_JITTER if jitter is None else jitter
+        self.inputs = inputs
+        self.last_inputs: Optional[Hashable] = None
+        self.next_run = 0.0
+        self.stats = {'runs': 0, 'skipped': 0, 'failures': 0, 'last_run': None,
+                      'last_duration_ms': None, 'last_lag_ms': None, 'max_lag_ms': 0.0, 'next_run': None}
+    
+    def interval_seconds(self) -> float:
+        """Seconds until the next run, before jitter"""
+        return self.interval() if callable(self.interval) else self.interval
+    
+    def schedule_next(self, now: float):
+        """Pick the next run time, spread by up to jitter of the interval"""
+        interval = self.interval_seconds()
+        self.next_run = now + interval + random.uniform(0, interval * self.jitter)
+        self.stats['next_run'] = self.next_run
+    
+    async def run(self, now: float):
+        """Run the job once (unless its inputs are unchanged) and record how late it started"""
+        lag_ms = max(now - self.next_run, 0) * 1000
+        self.stats['last_lag_ms'] = lag_ms
+        self.stats['max_lag_ms'] = max(self.stats['max_lag_ms'], lag_ms)
+        
+        fingerprint = self.inputs() if self.inputs else None
+        if fingerprint is not None and fingerprint == self.last_inputs:
+            self.stats['skipped'] += 1
+            return
+        
+        started = time.perf_counter()
+        try:
+            await self.action()
+            self.last_inputs = fingerprint
+        except Exception as e:
+            self.stats['failures'] += 1
+            print(f"❌ Job {self.name} failed: {e}")
+        finally:
+            self.stats['runs'] += 1
+            self.stats['last_run'] = now
+            self.stats['last_duration_ms'] = (time.perf_counter() - started) * 1000
+
+class JobRunner:
+    """Runs jobs one at a time, each whenever it's due
+    
+    Jobs never overlap, so a slow one delays the others; that delay is
+    recorded as lag. Every job's stats are written to the job status file
+    after each run.
+    """
+    
+    def __init__(self, jobs: List[Job], status_file: str = None):
+        self.jobs = jobs
+        self.status_file = status_file or Config.JOB_STATUS_FILE
+        # Everything is due as soon as the runner starts
+        started = time.time()
+        for job in self.jobs:
+            job.next_run = job.next_run or started
+    
+    def status(self) -> Dict[str, Dict]:
+        """Stats for every job"""
+        return {job.name: dict(job.stats) for job in self.jobs}
+    
+    def save_status(self):
+        """Write job stats so run times and lag can be checked from outside"""
+        try:
+            write_json_atomic(self.status_file, {'updated_at': time.time(), 'jobs': self.status()}, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save job status: {e}")
+    
+    async def run_due(self) -> float:
+        """Run every job that is due and return seconds until the next one"""
+        for job in sorted(self.jobs, key=lambda job: job.next_run):
+            now = time.time()
+            if job.next_run > now:
+                continue
+            await job.run(now)
+            job.schedule_next(time.time())
+            self.save_status()
+        return max(min(job.next_run for job in self.jobs) - time.time(), 0)
+    
+    async def run_forever(self):
+        """Run jobs as they come due, forever"""
+        for job in self.jobs:
+            print(f"🗓️  Job {job.name} every {job.interval_seconds() / 60:.0f} minutes")
+        while True:
+            await asyncio.sleep(await self.run_due())
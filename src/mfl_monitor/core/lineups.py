@@ -0,0 +1,106 @@
+"""
+Lineup swap detection - catches starters changed after a player's game started
+"""
+
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional
+from ..utils.config import Config
+from ..utils.records import Player
+
+LineupSwap = namedtuple('LineupSwap', ['franchise', 'player_id', 'action', 'lock_time', 'seen_at'])
+
+class LineupMonitor:
+    """Diffs each franchise's starters against the last snapshot
+    
+    The snapshot log is append-only and each poll only writes the franchises
+    whose starters changed, so polling every minute during games stays cheap.
+    A swap can have happened any time since the previous poll, so it is only
+    reported when that poll was already after the player's lock time.
+    """
+    
+    def __init__(self, snapshot_file: str = None):
+        self.snapshot_file = snapshot_file or Config.LINEUP_SNAPSHOT_FILE
+        self.week: Optional[int] = None
+        self.starters: Dict[str, FrozenSet[str]] = {}
+        self.checked_at: Optional[int] = None
+        self.load_snapshots()
+    
+    def load_snapshots(self):
+        """Replay the snapshot log to get the latest starters for the current week"""
+        self.week = None
+        self.starters = {}
+        self.checked_at = None
+        if not os.path.exists(self.snapshot_file):
+            return
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry['week'] != self.week:
+                        self.week = entry['week']
+                        self.starters = {}
+                    for franchise, player_ids in entry['changed'].items():
+                        self.starters[franchise] = frozenset(player_ids)
+                    self.checked_at = entry['at']
+        except (json.JSONDecodeError, IOError, KeyError) as e:
+            print(f"Warning: Could not read lineup snapshots: {e}")
+            self.week = None
+            self.starters = {}
+            self.checked_at = None
+    
+    def save_snapshot(self, week: int, now_ts: int, changed: Dict[str, FrozenSet[str]]):
+        """Append this poll's changed franchises (a new week starts a new log)"""
+        entry = {
+            'at': now_ts,
+            'week': week,
+            'changed': {franchise: sorted(player_ids) for franchise, player_ids in changed.items()}
+        }
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file), exist_ok=True)
+            with open(self.snapshot_file, 'a' if week == self.week else 'w') as f:
+                f.write(json.dumps(entry) + '\n')
+        except IOError as e:
+            print(f"Warning: Could not save lineup snapshot: {e}")
+    
+    def check(self, week: int, starters: Dict[str, FrozenSet[str]], players: Dict[str, Player],
+              lock_times: Dict[str, datetime], now_ts: int = None) -> List[LineupSwap]:
+        """Record a new snapshot and return swaps of players that were already locked"""
+        now_ts = now_ts or int(time.time())
+        if week != self.week:
+            # A new week starts again from a full snapshot
+            self.starters = {}
+            self.checked_at = None
+        changed = {franchise: player_ids for franchise, player_ids in starters.items()
+                   if self.starters.get(franchise) != player_ids}
+        
+        swaps = []
+        # The first snapshot of a week has nothing to compare against
+        if self.checked_at is not None:
+            for franchise, player_ids in changed.items():
+                previous = self.starters.get(franchise)
+                if previous is None:
+                    continue
+                moves = [(player_id, 'benched by') for player_id in previous - player_ids]
+                moves += [(player_id, 'started by') for player_id in player_ids - previous]
+                for player_id, action in moves:
+                    player = players.get(player_id)
+                    lock_time = lock_times.get(player.team) if player else None
+                    if lock_time is None:
+                        continue
+                    lock_ts = lock_time.timestamp()
+                    if self.checked_at >= lock_ts:
+                        swaps.append(LineupSwap(franchise, player_id, action, lock_time, now_ts))
+                    elif now_ts > lock_ts:
+                        print(f"⚠️  Franchise {franchise} moved {player_id} around kickoff, not sure it was after lock")
+        
+        if changed:
+            print(f"📋 Lineups changed for {len(changed)} franchises")
+        self.save_snapshot(week, now_ts, changed)
+        self.week = week
+        self.starters.update(changed)
+        self.checked_at = now_ts
+        return swaps
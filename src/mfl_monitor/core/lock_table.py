@@ -0,0 +1,88 @@
+"""
+Materialized player -> lock time table for a week
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Tuple
+from ..apis.nfl import TEAM_MAPPING
+from ..utils.records import Player
+
+# Sentinel lock times - all later than any real timestamp, so nothing is ever after them
+BYE_WEEK = 2 ** 63 - 1        # NFL team with no game this week (bye or postponed)
+UNKNOWN_TEAM = 2 ** 63 - 2    # free agent or a team code that isn't an NFL team
+UNKNOWN_PLAYER = 2 ** 63 - 3  # player id missing from the players export
+
+NFL_TEAMS = frozenset(TEAM_MAPPING.values())
+
+# Tables are shared by every analyzer (league) in the process
+MAX_TABLES = 32
+_tables: 'OrderedDict[Tuple, LockTable]' = OrderedDict()
+_last_players: Tuple[Dict, int] = ({}, hash(()))
+_lock = threading.Lock()
+
+class LockTable:
+    """Every player's lock time for one week as unix seconds
+    
+    Checking a player is a single dict lookup and integer comparison;
+    players on a bye or without an NFL team get sentinel lock times that no
+    transaction can be after.
+    """
+    
+    def __init__(self, players: Dict[str, Player], lock_times: Dict[str, datetime]):
+        team_locks = {team: int(lock_time.timestamp()) for team, lock_time in lock_times.items()}
+        self.locks: Dict[str, int] = {}
+        for player_id, player in players.items():
+            lock_ts = team_locks.get(player.team)
+            if lock_ts is None:
+                lock_ts = BYE_WEEK if player.team in NFL_TEAMS else UNKNOWN_TEAM
+            self.locks[player_id] = lock_ts
+    
+    def lock_ts(self, player_id: str) -> int:
+        """A player's lock time (or sentinel)"""
+        return self.locks.get(player_id, UNKNOWN_PLAYER)
+    
+    def is_locked(self, player_id: str, timestamp: int) -> bool:
+        """Check if a player's game had started by a unix timestamp"""
+        return timestamp > self.locks.get(player_id, UNKNOWN_PLAYER)
+    
+    def summary(self) -> Dict[str, int]:
+        """How many players lock, are on a bye or have no NFL team"""
+        counts = {'locking': 0, 'bye': 0, 'no_team': 0}
+        for lock_ts in self.locks.values():
+            if lock_ts == BYE_WEEK:
+                counts['bye'] += 1
+            elif lock_ts == UNKNOWN_TEAM:
+                counts['no_team'] += 1
+            else:
+                counts['locking'] += 1
+        return counts
+
+def players_signature(players: Dict[str, Player]) -> int:
+    """Hash of every player's team (remembered for the last players dict seen)"""
+    global _last_players
+    last_players, signature = _last_players
+    if last_players is not players:
+        signature = hash(tuple((player_id, player.team) for player_id, player in players.items()))
+        _last_players = (players, signature)
+    return signature
+
+def get_lock_table(players: Dict[str, Player], lock_times: Dict[str, datetime]) -> LockTable:
+    """Get the table for these players and lock times, building it only if either changed"""
+    with _lock:
+        schedule = tuple(sorted((team, int(lock_time.timestamp())) for team, lock_time in lock_times.items()))
+        signature = (players_signature(players), schedule)
+        table = _tables.get(signature)
+        if table is not None:
+            _tables.move_to_end(signature)
+            return table
+        
+        table = LockTable(players, lock_times)
+        _tables[signature] = table
+        if len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+        counts = table.summary()
+        print(f"🔒 Lock table built: {counts['locking']} players lock, {counts['bye']} on bye, "
+              f"{counts['no_team']} without an NFL team")
+        return table
@@ -0,0 +1,212 @@
+"""
+Async check pipeline - alerts go out as soon as each violation is found
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from ..utils.config import Config
+from ..utils.records import Transaction
+from .analyzer import TransactionAnalyzer
+
+# Marks the end of the stream on every queue
+DONE = object()
+
+STAGES = ('parse', 'evaluate', 'format', 'deliver')
+
+class TransactionPipeline:
+    """Runs one check as fetch -> parse -> evaluate -> format -> deliver
+    
+    Stages are connected by bounded queues, so when Discord slows down (or
+    rate limits us) the earlier stages wait instead of piling up work. The
+    players and schedule are fetched while transactions are already being
+    parsed; evaluation waits for them before the first check. Franchise names
+    are only looked up once there is an alert to format.
+    """
+    
+    def __init__(self, analyzer: TransactionAnalyzer, queue_size: int = None):
+        self.analyzer = analyzer
+        self.queue_size = queue_size or Config.PIPELINE_QUEUE_SIZE
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.peak_depths = {stage: 0 for stage in STAGES}
+        self.inputs_ready = None
+        self.players = {}
+        self.franchises = {}
+        self.game_times = {}
+        self.last_run_ts = 0
+        self.stats = {}
+    
+    def queue_depths(self) -> Dict[str, int]:
+        """Items waiting in front of each stage right now"""
+        return {stage: queue.qsize() for stage, queue in self.queues.items()}
+    
+    async def put(self, stage: str, item):
+        """Hand an item to a stage, waiting while its queue is full"""
+        await self.queues[stage].put(item)
+        self.peak_depths[stage] = max(self.peak_depths[stage], self.queues[stage].qsize())
+    
+    async def load_lookups(self):
+        """Fetch players and the schedule alongside the transactions"""
+        # If a lookup fails, run() cancels the stages still waiting on inputs_ready
+        self.players, self.game_times, _ = await asyncio.gather(
+            asyncio.to_thread(self.analyzer.load_players),
+            asyncio.to_thread(self.analyzer.get_game_start_times),
+            asyncio.to_thread(self.analyzer.cache.status.refresh)
+        )
+        self.inputs_ready.set()
+    
+    async def fetch(self, last_run_time: datetime):
+        """Stream transactions into the parser"""
+        transactions = await asyncio.to_thread(self.analyzer.mfl_api.get_transactions,
+                                               last_run_time, None, self.analyzer.rules.types)
+        print(f"Found {len(transactions)} transactions to analyze")
+        for transaction in transactions:
+            await self.put('parse', transaction)
+        await self.put('parse', DONE)
+    
+    async def parse(self):
+        """Turn MFL dicts into records and drop anything from before the last run"""
+        while True:
+            item = await self.queues['parse'].get()
+            if item is DONE:
+                break
+            transaction = Transaction.from_mfl(item)
+            if transaction is None:
+                print(f"Invalid timestamp format: {item.get('timestamp')}")
+                continue
+            if transaction.timestamp > self.last_run_ts:
+                self.stats['processed'] += 1
+                await self.put('evaluate', transaction)
+        await self.put('evaluate', DONE)
+    
+    async def evaluate(self):
+        """Judge each transaction against the real lock times of its own week
+        
+        Transactions naming players the index has never seen wait until the end
+        of the stream, so all of them are looked up in one MFL request.
+        """
+        await self.inputs_ready.wait()
+        player_index = self.analyzer.player_index
+        tables_by_week = {}
+        deferred = []
+        while True:
+            transaction = await self.queues['evaluate'].get()
+            if transaction is DONE:
+                break
+            if player_index.missing(transaction.added + transaction.dropped):
+                deferred.append(transaction)
+                continue
+            await self.check(transaction, tables_by_week)
+        
+        if deferred:
+            player_ids = {player_id for transaction in deferred for player_id in transaction.added + transaction.dropped}
+            if await asyncio.to_thread(player_index.fetch_missing, self.analyzer.mfl_api, player_ids):
+                self.players = player_index.players_at(int(time.time()))
+                # Tables built so far don't have the new players
+                tables_by_week.clear()
+            for transaction in deferred:
+                await self.check(transaction, tables_by_week)
+        await self.put('format', DONE)
+    
+    async def check(self, transaction: Transaction, tables_by_week: Dict):
+        """Run the rules on one transaction and pass on any violations"""
+        lock_table = self.analyzer.get_lock_table_at(transaction, self.players, self.game_times, tables_by_week)
+        for violation in self.analyzer.rules.evaluate(transaction, lock_table):
+            await self.put('format', (transaction, violation))
+    
+    async def format(self):
+        """Build the Discord message for each violation"""
+        while True:
+            item = await self.queues['format'].get()
+            if item is DONE:
+                break
+            transaction, violation = item
+            if transaction.franchise not in self.franchises:
+                self.franchises = await asyncio.to_thread(self.analyzer.get_franchises, [transaction.franchise])
+            message = self.analyzer.format_transaction_message(transaction, self.players, self.franchises,
+                                                               violation.lock_time, violation.player_id,
+                                                               violation.action)
+            print(f"Found violation: {message}")
+            self.stats['violations'] += 1
+            await self.put('deliver', {'key': self.analyzer.violation_key(transaction, violation),
+                                       'content': message})
+        await self.put('deliver', DONE)
+    
+    async def deliver(self):
+        """Queue each alert in the outbox, then send it right away over one login"""
+        notifier = self.analyzer.discord_notifier
+        outbox = self.analyzer.outbox
+        client = channel = None
+        connect_error: Optional[str] = None
+        try:
+            while True:
+                message = await self.queues['deliver'].get()
+                if message is DONE:
+                    break
+                # Already queued or sent (e.g. a rerun after a crash) - nothing to do here
+                if not outbox.add(message['key'], message['content']):
+                    continue
+                
+                if channel is None and connect_error is None:
+                    try:
+                        client, channel = await notifier.open_channel()
+                    except Exception as e:
+                        connect_error = str(e)
+                        print(f"❌ Could not connect to Discord, alerts stay in the outbox: {e}")
+                if channel is None:
+                    outbox.mark_failed(message['key'], connect_error)
+                    continue
+                
+                try:
+                    if await notifier.send_queued(channel, outbox, message):
+                        self.stats['delivered'] += 1
+                except Exception as e:
+                    outbox.mark_failed(message['key'], str(e))
+                await asyncio.sleep(1)
+        finally:
+            if client is not None:
+                await client.close()
+    
+    async def run(self) -> Dict:
+        """Run one check through every stage and return its stats"""
+        started = time.perf_counter()
+        current_time = datetime.now(timezone.utc)
+        last_run_time = self.analyzer.get_last_run_time(current_time)
+        self.last_run_ts = last_run_time.timestamp()
+        print(f"Checking transactions since: {last_run_time}")
+        
+        self.queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in STAGES}
+        self.peak_depths = {stage: 0 for stage in STAGES}
+        self.inputs_ready = asyncio.Event()
+        self.stats = {'processed': 0, 'violations': 0, 'delivered': 0}
+        
+        tasks = [
+            asyncio.create_task(self.load_lookups()),
+            asyncio.create_task(self.fetch(last_run_time)),
+            asyncio.create_task(self.parse()),
+            asyncio.create_task(self.evaluate()),
+            asyncio.create_task(self.format()),
+            asyncio.create_task(self.deliver())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Where the work was stuck when the run stopped
+            self.stats['queue_depths'] = self.queue_depths()
+            print(f"⚠️ Pipeline stopped with queue depths {self.stats['queue_depths']}")
+            # One failed stage would leave the others blocked on their queues
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        # Only move on once every violation is at least in the outbox
+        self.analyzer.save_last_run_time(current_time)
+        
+        self.stats['elapsed_ms'] = (time.perf_counter() - started) * 1000
+        self.stats['peak_depths'] = dict(self.peak_depths)
+        print(f"📊 Pipeline: {self.stats['processed']} processed, {self.stats['violations']} violations, "
+              f"{self.stats['delivered']} delivered in {self.stats['elapsed_ms']:.0f} ms "
+              f"(peak queue depths {self.peak_depths})")
+        return self.stats
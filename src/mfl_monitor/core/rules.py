@@ -0,0 +1,73 @@
+"""
+Post-lock violation rules, all checked in one pass over each transaction
+"""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+from ..utils.records import Transaction
+from .lock_table import LockTable
+
+PICKUP_TYPES = frozenset({'FREE_AGENT', 'BBID_WAIVER', 'BBID_AUTO_PROCESS_WAIVERS'})
+
+Rule = namedtuple('Rule', ['name', 'types', 'action', 'players'])
+Violation = namedtuple('Violation', ['rule', 'action', 'player_id', 'lock_time'])
+
+# Every registered rule, in registration order
+RULES: List[Rule] = []
+
+def rule(name: str, types: Iterable[str], action: str):
+    """Register a rule for some transaction types
+    
+    The decorated function returns the ids of the players in a transaction
+    that the rule covers; each one whose team had already locked is a
+    violation. action finishes the alert, e.g. 'picked up by' a franchise.
+    """
+    def register(players):
+        RULES.append(Rule(name, frozenset(types), action, players))
+        return players
+    return register
+
+@rule('late_pickup', PICKUP_TYPES, 'picked up by')
+def added_players(transaction: Transaction) -> Tuple[str, ...]:
+    """Players added from free agency or waivers"""
+    return transaction.added
+
+@rule('locked_drop', PICKUP_TYPES, 'dropped by')
+def dropped_players(transaction: Transaction) -> Tuple[str, ...]:
+    """Players released to make room for a pickup"""
+    return transaction.dropped
+
+@rule('locked_trade', {'TRADE'}, 'traded by')
+@rule('locked_ir_move', {'IR'}, 'moved on or off IR by')
+@rule('locked_taxi_move', {'TAXI'}, 'moved on or off the taxi squad by')
+def moved_players(transaction: Transaction) -> Tuple[str, ...]:
+    """Every player on either side of a trade or roster move"""
+    return transaction.added + transaction.dropped
+
+class RuleEngine:
+    """Runs every rule for a transaction's type against the week's lock table"""
+    
+    def __init__(self, rules: List[Rule] = None):
+        self.rules = list(RULES if rules is None else rules)
+        self.rules_by_type: Dict[str, List[Rule]] = {}
+        for registered in self.rules:
+            for transaction_type in registered.types:
+                self.rules_by_type.setdefault(transaction_type, []).append(registered)
+        # Only these types need fetching from MFL
+        self.types = frozenset(self.rules_by_type)
+    
+    def evaluate(self, transaction: Transaction, lock_table: LockTable) -> List[Violation]:
+        """Get every violation in a transaction (players whose team locked before it)"""
+        rules = self.rules_by_type.get(transaction.type)
+        if not rules:
+            return []
+        
+        violations = []
+        for registered in rules:
+            for player_id in registered.players(transaction):
+                lock_ts = lock_table.lock_ts(player_id)
+                if transaction.timestamp > lock_ts:
+                    lock_time = datetime.fromtimestamp(lock_ts, tz=timezone.utc)
+                    violations.append(Violation(registered.name, registered.action, player_id, lock_time))
+        return violations
@@ -3,10 +3,15 @@ Transaction scheduling and time management
 """
 
 import asyncio
-from datetime import datetime, time
+import time
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
 import pytz
 from ..utils.config import Config
+from ..utils.quota import QuotaManager
 from .analyzer import TransactionAnalyzer
+from .activity import ActivityCalendar
+from .jobs import Job, JobRunner
 
 class TransactionScheduler:
     """Schedules and manages transaction monitoring"""
@@ -14,54 +19,129 @@ class TransactionScheduler:
     def __init__(self):
         self.analyzer = TransactionAnalyzer()
         self.timezone = pytz.timezone('America/New_York')
+        self.calendar = None
+        self.calendar_key = None
+        self.jobs = None
+        # Kickoff slots already prewarmed
+        self.prewarmed: Set[int] = set()
+    
+    def get_calendar(self) -> ActivityCalendar:
+        """Get the activity calendar, recompiling it only when this week's kickoffs change
         
+        Kickoffs come from the archived week, not the cached schedule, which is cut
+        down to Thursday-Monday and would leave out Wednesday and Saturday games.
+        """
+        game_times = self.analyzer.cache.get_game_times_at(int(time.time()))
+        if self.calendar is None or game_times != self.calendar_key:
+            self.calendar = ActivityCalendar(game_times)
+            self.calendar_key = game_times
+        return self.calendar
+    
     def is_within_active_hours(self) -> bool:
         """Check if current time is within the active monitoring hours"""
-        now = datetime.now(self.timezone)
-        current_time = now.time()
-        current_weekday = now.weekday()  # 0=Monday, 6=Sunday
-        
-        weekday_map = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-            'friday': 4, 'saturday': 5, 'sunday': 6
-        }
-        
-        start_day = weekday_map.get(Config.SCHEDULE_START_DAY.lower(), 3)
-        end_day = weekday_map.get(Config.SCHEDULE_END_DAY.lower(), 0)
-        
-        start_time = datetime.strptime(Config.SCHEDULE_START_TIME, '%H:%M').time()
-        end_time = datetime.strptime(Config.SCHEDULE_END_TIME, '%H:%M').time()
-        skip_start = datetime.strptime(Config.SKIP_START_TIME, '%H:%M').time()
-        skip_end = datetime.strptime(Config.SKIP_END_TIME, '%H:%M').time()
-        
-        # Check if we're in the skip period (12AM to 9AM)
-        if skip_start <= current_time <= skip_end:
-            return False
-        
-        # Check if we're in the active period
-        # Thursday (3) 8PM to Monday (0) 10PM
-        is_active = False
-        
-        if current_weekday == start_day and current_time >= start_time:
-            is_active = True
-        elif current_weekday == end_day and current_time <= end_time:
-            is_active = True
-        elif start_day < current_weekday < end_day:
-            is_active = True
-        elif current_weekday == 4 or current_weekday == 5 or current_weekday == 6:  # Fri, Sat, Sun
-            is_active = True
-        
-        return is_active
+        return self.get_calendar().is_active(datetime.now(self.timezone))
     
     async def run_check(self, force=False):
         """Run a single transaction check"""
+        if not force and not self.analyzer.cache.is_cache_valid():
+            # A fresh runner (e.g. GitHub Actions) has no schedule yet, so kickoff windows couldn't open
+            await asyncio.to_thread(self.analyzer.cache.get_game_times)
         if force or self.is_within_active_hours():
             print(f"Running transaction check at {datetime.now()}")
             await self.analyzer.run_analysis()
         else:
             print(f"Skipping check at {datetime.now()} - outside active hours")
+            await self.analyzer.deliver_pending()
     
     def run_once(self):
         """Run a single check immediately (useful for testing)"""
         print("Running single transaction check...")
         asyncio.run(self.run_check())
+    
+    def transaction_interval(self) -> float:
+        """Seconds between transaction polls: short during games, the poll interval while active, otherwise until the window opens"""
+        wait_minutes = self.get_calendar().minutes_until_active(datetime.now(self.timezone))
+        if wait_minutes == 0:
+            if self.analyzer.cache.status.in_game_window(int(time.time())):
+                return Config.GAME_POLL_INTERVAL_MINUTES * 60
+            return Config.POLL_INTERVAL_MINUTES * 60
+        # Wake up at least hourly so a refreshed schedule can open the window early
+        if wait_minutes is None or wait_minutes > 60:
+            wait_minutes = 60
+        return wait_minutes * 60
+    
+    def status_interval(self) -> float:
+        """Seconds between game status refreshes (short during games, long otherwise)"""
+        if self.analyzer.cache.status.in_game_window(int(time.time())):
+            return Config.STATUS_TTL_SECONDS
+        return Config.STATUS_IDLE_TTL_SECONDS
+    
+    def schedule_fingerprint(self) -> Optional[str]:
+        """This week, while its schedule is cached (None until then, so a failed refresh is retried)"""
+        cache = self.analyzer.cache
+        return cache.get_current_week_range() if cache.is_cache_valid() else None
+    
+    def quota_fingerprint(self) -> Tuple[int, int]:
+        """Odds API usage, so the daily report is skipped when nothing was used"""
+        status = QuotaManager().get_quota_status()
+        return status['requests_used'], status['requests_remaining']
+    
+    async def report_quota(self):
+        """Print Odds API usage"""
+        used, remaining = self.quota_fingerprint()
+        print(f"📊 Odds API quota: {used} used, {remaining} remaining")
+    
+    def next_prewarm(self, now_ts: float) -> Optional[Tuple[int, float]]:
+        """(kickoff, prewarm time) for the next kickoff slot that hasn't been prewarmed"""
+        lead_seconds = Config.PREWARM_MINUTES * 60
+        slots = sorted({int(kickoff.timestamp()) for kickoff in self.analyzer.cache.get_cached_game_times().values()})
+        for kickoff in slots:
+            if kickoff > now_ts and kickoff not in self.prewarmed:
+                return kickoff, kickoff - lead_seconds
+        return None
+    
+    def prewarm_interval(self) -> float:
+        """Seconds until the next prewarm is due (checking back at least hourly in case the schedule changes)"""
+        upcoming = self.next_prewarm(time.time())
+        if upcoming is None:
+            return 3600
+        return min(max(upcoming[1] - time.time(), 0), 3600)
+    
+    async def prewarm_if_due(self):
+        """Prewarm once per kickoff slot, PREWARM_MINUTES before it"""
+        now_ts = time.time()
+        upcoming = self.next_prewarm(now_ts)
+        if upcoming is None or upcoming[1] > now_ts:
+            return
+        kickoff, _ = upcoming
+        print(f"🔥 Kickoff at {datetime.fromtimestamp(kickoff, self.timezone):%a %I:%M %p}, prewarming")
+        self.prewarmed = {slot for slot in self.prewarmed if slot > now_ts}
+        self.prewarmed.add(kickoff)
+        await self.analyzer.prewarm()
+    
+    def build_jobs(self) -> List[Job]:
+        """The daemon's recurring jobs, each refreshing one input on its own cadence"""
+        analyzer = self.analyzer
+        cache = analyzer.cache
+        jobs = [
+            Job('transactions', self.transaction_interval, self.run_check),
+            Job('schedule', Config.SCHEDULE_REFRESH_MINUTES * 60,
+                lambda: asyncio.to_thread(cache.get_game_times), inputs=self.schedule_fingerprint),
+            Job('game_status', self.status_interval, lambda: asyncio.to_thread(cache.status.refresh)),
+            Job('players', Config.PLAYER_REFRESH_HOURS * 3600,
+                lambda: asyncio.to_thread(analyzer.player_index.refresh, analyzer.mfl_api)),
+            Job('franchises', Config.FRANCHISE_CACHE_TTL_HOURS * 3600,
+                lambda: asyncio.to_thread(analyzer.get_franchises)),
+            Job('quota_report', 24 * 3600, self.report_quota, inputs=self.quota_fingerprint)
+        ]
+        if Config.PREWARM_MINUTES > 0:
+            # No jitter, so it fires right on time
+            jobs.append(Job('prewarm', self.prewarm_interval, self.prewarm_if_due, jitter=0))
+        return jobs
+    
+    async def run_forever(self):
+        """Run every job on its own cadence until stopped"""
+        # The players job keeps the index fresh, so checks only look up unknown ids
+        self.analyzer.refresh_players = False
+        self.jobs = JobRunner(self.build_jobs())
+        await self.jobs.run_forever()
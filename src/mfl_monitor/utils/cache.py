@@ -2,63 +2,50 @@
 Game time caching to reduce API calls
 """
 
-import json
-import os
+import queue
+import threading
+from collections import namedtuple
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from .config import Config
+from .schedule_archive import ScheduleArchive, REGULAR_SEASON, POSTSEASON, REGULAR_SEASON_WEEKS
+from .game_status import GameStatusTracker
+from .tiered_cache import TieredCache
+from .http import single_flight
 from ..apis.odds_api import OddsAPIClient
+from ..apis.nfl import filter_current_week
+
+ScheduleProvider = namedtuple('ScheduleProvider', ['name', 'fetch', 'quota_limited'])
+
+# What a provider found: its whole week and where to archive it (week_key None if it
+# can't be archived), and just this week's Thursday-Monday games
+ScheduleFetch = namedtuple('ScheduleFetch', ['week_key', 'week_games', 'game_times'])
+NO_GAMES = ScheduleFetch(None, {}, {})
 
 class GameTimeCache:
     """Caches NFL game times to reduce API calls"""
     
     def __init__(self, cache_file: str = None):
         self.cache_file = cache_file or Config.CACHE_FILE
-        self.cache_duration_hours = 6
-        self.cache_data = self.load_cache()
-    
-    def load_cache(self) -> Dict:
-        """Load cached game times"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {
-            'game_times': {},
-            'cached_at': None,
-            'week_range': None
-        }
+        # One entry per week range, so a new week never reads last week's games
+        self.store = TieredCache('game_times', self.cache_file)
+        self.archive = ScheduleArchive()
+        # Tried in order until one returns games
+        self.providers = [
+            ScheduleProvider('MFL', self.fetch_from_mfl, False),
+            ScheduleProvider('ESPN API', self.fetch_from_espn, False),
+            ScheduleProvider('Odds API', self.fetch_from_odds, True)
+        ]
+        self.status = GameStatusTracker()
     
     def save_cache(self, game_times: Dict, week_range: str):
-        """Save game times to cache"""
-        self.cache_data = {
-            'game_times': {k: v.isoformat() for k, v in game_times.items()},
-            'cached_at': datetime.now().isoformat(),
-            'week_range': week_range
-        }
-        
-        try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache_data, f, indent=2)
-        except IOError as e:
-            print(f"Warning: Could not save game cache: {e}")
+        """Save game times for a week range"""
+        self.store.set(week_range, {k: v.isoformat() for k, v in game_times.items()},
+                       Config.SCHEDULE_CACHE_TTL_HOURS * 3600)
     
     def is_cache_valid(self) -> bool:
-        """Check if cache is still valid"""
-        if not self.cache_data.get('cached_at'):
-            return False
-        
-        try:
-            cached_at = datetime.fromisoformat(self.cache_data['cached_at'])
-            if cached_at.tzinfo is None:
-                cached_at = cached_at.replace(tzinfo=timezone.utc)
-            cache_age = datetime.now(timezone.utc) - cached_at
-            return cache_age.total_seconds() < (self.cache_duration_hours * 3600)
-        except ValueError:
-            return False
+        """Check if this week's game times are cached and not expired"""
+        return self.store.get(self.get_current_week_range()) is not None
     
     def get_current_week_range(self) -> str:
         """Get current week range (Thursday to Monday)"""
@@ -76,51 +63,163 @@ class GameTimeCache:
         
         return f"{this_thursday.strftime('%Y-%m-%d')}_to_{next_monday.strftime('%Y-%m-%d')}"
     
+    def get_cached_game_times(self) -> Dict[str, datetime]:
+        """Get whatever game times are on disk without fetching anything (this week's if there are any)"""
+        cached = self.store.get(self.get_current_week_range(), allow_stale=True) or self.store.latest() or {}
+        return self.parse_game_times(cached)
+    
+    def parse_game_times(self, cached: Dict[str, str]) -> Dict[str, datetime]:
+        """Turn cached ISO strings back into datetimes"""
+        game_times = {}
+        for team, time_str in cached.items():
+            try:
+                game_times[team] = datetime.fromisoformat(time_str)
+            except ValueError:
+                continue
+        return game_times
+    
     def get_game_times(self) -> Dict[str, datetime]:
         """Get game times, using cache if valid"""
         current_week = self.get_current_week_range()
         
-        if (self.is_cache_valid() and 
-            self.cache_data.get('week_range') == current_week and
-            self.cache_data.get('game_times')):
-            
+        cached = self.store.get(current_week)
+        if cached:
             print("📅 Using cached game times")
-            game_times = {}
-            for team, time_str in self.cache_data['game_times'].items():
-                try:
-                    game_times[team] = datetime.fromisoformat(time_str)
-                except ValueError:
-                    continue
-            return game_times
+            return self.parse_game_times(cached)
         
         print("📅 Cache invalid or different week, fetching new game times")
         
-        # Try ESPN API first (more reliable for current games)
-        try:
-            from ..apis.espn_api import ESPNAPIClient
-            espn_client = ESPNAPIClient()
-            game_times = espn_client.get_current_week_games()
-            
-            if game_times:
-                print("📅 Using ESPN API for game times")
-            else:
-                raise Exception("No games found from ESPN API")
-                
-        except Exception as e:
-            print(f"⚠️  ESPN API failed: {e}, falling back to Odds API")
-            # Fallback to Odds API
-            odds_client = OddsAPIClient()
-            game_times = odds_client.get_game_times_by_team(days_back=7, days_ahead=5)
+        # Callers refreshing the same week at once (e.g. a check and a prewarm) share one fetch
+        name, game_times = single_flight(('schedule_refresh', current_week), self.fetch_schedule)
         
         if game_times:
+            print(f"📅 Using {name} for game times")
             self.save_cache(game_times, current_week)
             print(f"📅 Cached {len(game_times)} game times for {current_week}")
         
         return game_times
     
+    def fetch_schedule(self) -> Tuple[Optional[str], Dict[str, datetime]]:
+        """Fetch this week's games from the providers (hedged unless SCHEDULE_HEDGE_SECONDS is 0)"""
+        if Config.SCHEDULE_HEDGE_SECONDS > 0:
+            return self.fetch_hedged()
+        return self.fetch_in_order()
+    
+    def run_provider(self, provider: ScheduleProvider) -> ScheduleFetch:
+        """Fetch from one provider, treating any error as no games"""
+        try:
+            return provider.fetch() or NO_GAMES
+        except Exception as e:
+            print(f"⚠️  {provider.name} schedule failed: {e}")
+            return NO_GAMES
+    
+    def use_fetch(self, provider: ScheduleProvider, fetched: ScheduleFetch) -> Tuple[str, Dict[str, datetime]]:
+        """Archive the winning provider's week and return its games"""
+        if fetched.week_key and fetched.week_games:
+            self.archive.append_week(*fetched.week_key, fetched.week_games)
+        return provider.name, fetched.game_times
+    
+    def fetch_in_order(self) -> Tuple[Optional[str], Dict[str, datetime]]:
+        """Try each provider in turn until one returns games"""
+        for provider in self.providers:
+            fetched = self.run_provider(provider)
+            if fetched.game_times:
+                return self.use_fetch(provider, fetched)
+            print(f"⚠️  No games found from {provider.name}, trying next source")
+        return None, {}
+    
+    def fetch_hedged(self) -> Tuple[Optional[str], Dict[str, datetime]]:
+        """Start the next provider alongside a slow one and take the first with games
+        
+        Quota-limited providers are only hedged in when HEDGE_QUOTA_SOURCES is
+        set; otherwise they start once every earlier provider has come back empty.
+        Providers run on daemon threads, so one still waiting on its request
+        after another has answered is simply dropped: nothing it returns is
+        archived, and it can't keep a --once run from exiting.
+        """
+        waiting = list(self.providers)
+        running = []
+        results = queue.Queue()
+        
+        def start_next(hedge: bool) -> bool:
+            if not waiting:
+                return False
+            if hedge and waiting[0].quota_limited and not Config.HEDGE_QUOTA_SOURCES:
+                return False
+            provider = waiting.pop(0)
+            if hedge:
+                print(f"⏱️  No schedule after {Config.SCHEDULE_HEDGE_SECONDS}s, also trying {provider.name}")
+            running.append(provider)
+            threading.Thread(target=lambda: results.put((provider, self.run_provider(provider))),
+                             name=f"schedule-{provider.name}", daemon=True).start()
+            return True
+        
+        start_next(hedge=False)
+        can_hedge = True
+        while running:
+            try:
+                provider, fetched = results.get(timeout=Config.SCHEDULE_HEDGE_SECONDS if can_hedge else None)
+            except queue.Empty:
+                can_hedge = start_next(hedge=True)
+                continue
+            
+            running.remove(provider)
+            if fetched.game_times:
+                if running:
+                    print(f"📅 {provider.name} answered first, dropping {', '.join(p.name for p in running)}")
+                return self.use_fetch(provider, fetched)
+            print(f"⚠️  No games found from {provider.name}, trying next source")
+            
+            if not running:
+                # Everything started so far failed, so quota-limited sources are fair game now
+                start_next(hedge=False)
+            can_hedge = True
+        return None, {}
+    
+    def fetch_from_mfl(self) -> ScheduleFetch:
+        """Current week from MFL's nflSchedule export (same team codes, no quota)"""
+        from ..apis.mfl_api import MFLAPI
+        week, week_games = MFLAPI().get_nfl_schedule()
+        week_key = None
+        if week and week_games:
+            # MFL numbers playoff weeks on from the regular season
+            if week > REGULAR_SEASON_WEEKS:
+                week_key = (int(Config.MFL_YEAR), POSTSEASON, week - REGULAR_SEASON_WEEKS)
+            else:
+                week_key = (int(Config.MFL_YEAR), REGULAR_SEASON, week)
+        return ScheduleFetch(week_key, week_games, filter_current_week(week_games))
+    
+    def fetch_from_espn(self) -> ScheduleFetch:
+        """Current week from the ESPN scoreboard"""
+        from ..apis.espn_api import ESPNAPIClient
+        week_key, week_games = ESPNAPIClient().get_week_schedule()
+        return ScheduleFetch(week_key, week_games, filter_current_week(week_games))
+    
+    def fetch_from_odds(self) -> ScheduleFetch:
+        """Current week from The Odds API (uses quota, and only ever this week, so nothing to archive)"""
+        return ScheduleFetch(None, {}, OddsAPIClient().get_game_times_by_team())
+    
+    def get_game_times_at(self, timestamp: int, fallback: Dict[str, datetime] = None) -> Dict[str, datetime]:
+        """Get the schedule for the week a unix timestamp falls in, from the archive when possible"""
+        game_times = self.archive.game_times_at(timestamp)
+        if game_times:
+            return game_times
+        return fallback if fallback is not None else self.get_cached_game_times()
+    
+    def get_lock_times(self, game_times: Dict[str, datetime]) -> Dict[str, datetime]:
+        """Turn scheduled kickoffs into real lock times using live game status
+        
+        Delayed games lock when they were last seen not started, and teams whose
+        game is postponed are left out.
+        """
+        lock_times = {}
+        for team, scheduled in game_times.items():
+            lock_time = self.status.lock_time(team, scheduled)
+            if lock_time is not None:
+                lock_times[team] = lock_time
+        return lock_times
+    
     def clear_cache(self):
         """Clear the cache"""
-        if os.path.exists(self.cache_file):
-            os.remove(self.cache_file)
-        self.cache_data = {'game_times': {}, 'cached_at': None, 'week_range': None}
+        self.store.invalidate()
         print("📅 Game time cache cleared")
@@ -31,10 +31,75 @@ class Config:
     SKIP_START_TIME = '00:00'
     SKIP_END_TIME = '09:00'
     
+    # Minutes around each cached kickoff that are always active (overrides skip period)
+    ACTIVE_LEAD_MINUTES = int(os.getenv('ACTIVE_LEAD_MINUTES', '60'))
+    ACTIVE_TRAIL_MINUTES = int(os.getenv('ACTIVE_TRAIL_MINUTES', '240'))
+    
+    # Game status refresh (seconds) while games are on, and otherwise
+    STATUS_TTL_SECONDS = int(os.getenv('STATUS_TTL_SECONDS', '60'))
+    STATUS_IDLE_TTL_SECONDS = int(os.getenv('STATUS_IDLE_TTL_SECONDS', '1800'))
+    
+    # Daemon polling
+    POLL_INTERVAL_MINUTES = int(os.getenv('POLL_INTERVAL_MINUTES', '5'))
+    # While games are on, when late moves are most likely
+    GAME_POLL_INTERVAL_MINUTES = int(os.getenv('GAME_POLL_INTERVAL_MINUTES', '1'))
+    # Other daemon jobs (game status follows STATUS_TTL_SECONDS / STATUS_IDLE_TTL_SECONDS)
+    SCHEDULE_REFRESH_MINUTES = int(os.getenv('SCHEDULE_REFRESH_MINUTES', '30'))
+    PLAYER_REFRESH_HOURS = float(os.getenv('PLAYER_REFRESH_HOURS', '6'))
+    # Refresh everything and log in to Discord this many minutes before each kickoff slot (0 = off)
+    PREWARM_MINUTES = int(os.getenv('PREWARM_MINUTES', '10'))
+    # Each job's interval is stretched by a random part of this fraction so jobs don't line up
+    JOB_JITTER = float(os.getenv('JOB_JITTER', '0.1'))
+    
+    # Start the next schedule source if the current one hasn't answered in this many seconds (0 = one at a time)
+    SCHEDULE_HEDGE_SECONDS = float(os.getenv('SCHEDULE_HEDGE_SECONDS', '3'))
+    # Also hedge into sources that use quota (The Odds API) instead of waiting for the others to fail
+    HEDGE_QUOTA_SOURCES = os.getenv('HEDGE_QUOTA_SOURCES', '').lower() in ('1', 'true', 'yes')
+    
+    # Discord outbox retries (backoff doubles after each failed attempt)
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+    OUTBOX_BACKOFF_SECONDS = int(os.getenv('OUTBOX_BACKOFF_SECONDS', '30'))
+    
+    # Snapshot starters every check and report lineup swaps after kickoff
+    CHECK_LINEUPS = os.getenv('CHECK_LINEUPS', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Items each check pipeline stage may have waiting before earlier stages pause
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '100'))
+    
+    # Cache sizes (entries per cache) and how long schedules stay fresh
+    CACHE_MEMORY_ITEMS = int(os.getenv('CACHE_MEMORY_ITEMS', '128'))
+    CACHE_DISK_ITEMS = int(os.getenv('CACHE_DISK_ITEMS', '512'))
+    SCHEDULE_CACHE_TTL_HOURS = float(os.getenv('SCHEDULE_CACHE_TTL_HOURS', '6'))
+    ODDS_CACHE_TTL_HOURS = float(os.getenv('ODDS_CACHE_TTL_HOURS', '24'))
+    
+    # Franchise names and owners are refetched after this many hours (or with --refresh-franchises)
+    FRANCHISE_CACHE_TTL_HOURS = float(os.getenv('FRANCHISE_CACHE_TTL_HOURS', '168'))
+    
+    # Reload every player from MFL after this many days (in between, only changed players are fetched)
+    PLAYER_INDEX_FULL_RELOAD_DAYS = int(os.getenv('PLAYER_INDEX_FULL_RELOAD_DAYS', '7'))
+    
+    # Cached state older than this is left out when restoring a state bundle (ledgers are always restored)
+    STATE_BUNDLE_MAX_AGE_HOURS = float(os.getenv('STATE_BUNDLE_MAX_AGE_HOURS', '168'))
+    
+    # Report peak memory when parsing large MFL exports (slows parsing down)
+    PROFILE_PARSING = os.getenv('PROFILE_PARSING', '').lower() in ('1', 'true', 'yes')
+    
     # Data persistence
     DATA_FILE = 'data/transaction_data.json'
     CACHE_FILE = 'data/game_times_cache.json'
+    SCHEDULE_ARCHIVE_FILE = 'data/schedule_archive.bin'
+    GAME_STATUS_FILE = 'data/game_status.json'
     QUOTA_FILE = 'data/odds_api_quota.json'
+    ODDS_CACHE_FILE = 'data/odds_game_times.json'
+    OUTBOX_FILE = 'data/discord_outbox.json'
+    LINEUP_SNAPSHOT_FILE = 'data/lineup_snapshots.jsonl'
+    PLAYER_INDEX_FILE = 'data/player_index.json'
+    PLAYER_MISSES_FILE = 'data/player_misses.json'
+    FRANCHISE_CACHE_FILE = 'data/franchises.json'
+    CACHE_DIR = 'data/cache'
+    JOB_STATUS_FILE = 'data/job_status.json'
+    BACKFILL_REPORT_FILE = 'data/backfill_report.jsonl'
+    STATE_BUNDLE_FILE = 'data/state_bundle.tar.gz'
     
     @classmethod
     def validate(cls) -> bool:
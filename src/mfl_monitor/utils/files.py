@@ -0,0 +1,23 @@
+"""
+File helpers for state that must survive a crash mid-write
+"""
+
+import json
+import os
+import tempfile
+
+def write_json_atomic(path: str, data, **dump_kwargs):
+    """Write JSON to a temp file next to path, then swap it in"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
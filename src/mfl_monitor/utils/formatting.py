@@ -0,0 +1,32 @@
+"""
+Time formatting for Discord messages
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+import pytz
+
+NY_TZ = pytz.timezone('America/New_York')
+
+def format_ny_time(dt: datetime) -> str:
+    """Format as '9/4 8:01 PM EDT' in New York time (no leading zeros)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    dt_ny = dt.astimezone(NY_TZ)
+    hour = dt_ny.hour % 12 or 12
+    meridiem = 'AM' if dt_ny.hour < 12 else 'PM'
+    return f"{dt_ny.month}/{dt_ny.day} {hour}:{dt_ny.minute:02d} {meridiem} {dt_ny.tzname()}"
+
+@lru_cache(maxsize=4096)
+def _format_minute(minute: int) -> str:
+    """Format the start of a unix minute (shared by every timestamp in it)"""
+    return format_ny_time(datetime.fromtimestamp(minute * 60, tz=timezone.utc))
+
+def format_timestamp(timestamp: int) -> str:
+    """Format a unix timestamp for a pickup time"""
+    return _format_minute(timestamp // 60)
+
+@lru_cache(maxsize=256)
+def format_game_start(kickoff: int) -> str:
+    """Format a kickoff timestamp for the 'Game started' part of a message"""
+    return f" | Game started: {format_ny_time(datetime.fromtimestamp(kickoff, tz=timezone.utc))}"
@@ -0,0 +1,59 @@
+"""
+Franchise name cache - league metadata barely changes during a season
+"""
+
+import time
+from typing import Dict, Iterable, Set
+from .config import Config
+from .tiered_cache import TieredCache
+
+# The whole league is cached as one entry
+FRANCHISES_KEY = 'league'
+
+# After a failed fetch, keep using what's cached for this long before asking MFL again
+RETRY_SECONDS = 300
+
+class FranchiseCache:
+    """Franchise names and owners from MFL, kept on disk for days at a time
+    
+    Only message formatting needs them, so they're fetched on demand. A
+    franchise id the cache doesn't know triggers one refetch; anything else
+    waits for the TTL or invalidate().
+    """
+    
+    def __init__(self, cache_file: str = None, ttl_hours: float = None):
+        self.ttl_hours = ttl_hours if ttl_hours is not None else Config.FRANCHISE_CACHE_TTL_HOURS
+        self.store = TieredCache('franchises', cache_file or Config.FRANCHISE_CACHE_FILE)
+        # Ids already refetched for, so an unknown franchise costs one request per process
+        self.refetched_for: Set[str] = set()
+        self.last_attempt = 0.0
+    
+    def get(self, mfl_api, franchise_ids: Iterable[str] = ()) -> Dict[str, Dict]:
+        """Get franchises, fetching from MFL only when stale or missing one of franchise_ids"""
+        franchises = self.store.get(FRANCHISES_KEY)
+        fresh = franchises is not None
+        if not fresh:
+            franchises = self.store.latest() or {}
+        unknown = {franchise_id for franchise_id in franchise_ids
+                   if franchise_id not in franchises and franchise_id not in self.refetched_for}
+        if fresh and not unknown:
+            return franchises
+        if not unknown and time.time() - self.last_attempt < RETRY_SECONDS:
+            return franchises
+        
+        self.refetched_for.update(unknown)
+        self.last_attempt = time.time()
+        fetched = mfl_api.get_franchises()
+        if not fetched:
+            # Stale names beat no names
+            return franchises
+        self.store.set(FRANCHISES_KEY, fetched, self.ttl_hours * 3600)
+        print(f"🏈 Cached {len(fetched)} franchises for {self.ttl_hours:g} hours")
+        return fetched
+    
+    def invalidate(self):
+        """Drop the cached franchises so the next lookup fetches them"""
+        self.store.invalidate()
+        self.refetched_for = set()
+        self.last_attempt = 0.0
+        print("🏈 Franchise cache cleared")
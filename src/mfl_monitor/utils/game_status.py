@@ -0,0 +1,128 @@
+"""
+Live game status tracking so violations are judged against real lock time
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from .config import Config
+
+SCHEDULED = 'scheduled'
+IN_PROGRESS = 'in_progress'
+FINAL = 'final'
+POSTPONED = 'postponed'
+
+# A status only describes a team's game if its kickoff is this close to the one we are judging
+SAME_GAME_SECONDS = 12 * 3600
+
+class GameStatusTracker:
+    """Tracks scheduled / in progress / final for each team's current game
+    
+    ESPN only gives the scheduled kickoff, so a delay is detected by seeing a
+    game still scheduled after its kickoff time. The last time we saw it not
+    started becomes its lock time, and the first time we saw it under way is
+    kept as the observed actual start.
+    """
+    
+    def __init__(self, status_file: str = None):
+        self.status_file = status_file or Config.GAME_STATUS_FILE
+        self.status_data = self.load_status()
+    
+    def load_status(self) -> Dict:
+        """Load saved game statuses"""
+        if os.path.exists(self.status_file):
+            try:
+                with open(self.status_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return {
+            'games': {},
+            'checked_at': None,
+            'validators': {}
+        }
+    
+    def save_status(self):
+        """Save game statuses"""
+        try:
+            os.makedirs(os.path.dirname(self.status_file), exist_ok=True)
+            with open(self.status_file, 'w') as f:
+                json.dump(self.status_data, f, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save game status: {e}")
+    
+    def in_game_window(self, now_ts: int) -> bool:
+        """Check if any game is about to start or still being played"""
+        lead_seconds = Config.ACTIVE_LEAD_MINUTES * 60
+        for game in self.status_data['games'].values():
+            if game['state'] in (FINAL, POSTPONED):
+                continue
+            if game['scheduled'] - lead_seconds <= now_ts <= game['scheduled'] + SAME_GAME_SECONDS:
+                return True
+        return False
+    
+    def refresh(self, force: bool = False) -> bool:
+        """Refresh statuses if the TTL has passed (short during games, long otherwise)"""
+        now_ts = int(time.time())
+        checked_at = self.status_data.get('checked_at')
+        ttl = Config.STATUS_TTL_SECONDS if self.in_game_window(now_ts) else Config.STATUS_IDLE_TTL_SECONDS
+        if not force and checked_at and now_ts - checked_at < ttl:
+            return False
+        
+        from ..apis.espn_api import ESPNAPIClient
+        statuses, validators, not_modified = ESPNAPIClient().get_game_statuses(self.status_data.get('validators'))
+        if statuses is None and not not_modified:
+            # ESPN is unavailable - we saw nothing, so no game is known to still be waiting
+            # (and the next refresh tries again instead of waiting out the TTL)
+            return False
+        
+        self.status_data['checked_at'] = now_ts
+        self.status_data['validators'] = validators
+        if statuses is None:
+            # Not modified - what we saw last time still holds
+            self.observe(now_ts)
+        else:
+            self.update(statuses, now_ts)
+        
+        self.save_status()
+        return statuses is not None
+    
+    def update(self, statuses: Dict[str, Dict], now_ts: int):
+        """Merge freshly fetched statuses into what we have seen so far"""
+        games = self.status_data['games']
+        for team, status in statuses.items():
+            previous = games.get(team)
+            if previous is None or previous['scheduled'] != status['scheduled']:
+                previous = {'last_pre_seen': None, 'actual_start': None}
+            entry = dict(previous, **status)
+            if status['state'] in (IN_PROGRESS, FINAL) and entry['last_pre_seen'] and not entry['actual_start']:
+                entry['actual_start'] = now_ts
+                print(f"🏈 {team} game started late ({status['detail']})")
+            games[team] = entry
+        self.observe(now_ts)
+    
+    def observe(self, now_ts: int):
+        """Note every game that is still not under way after its kickoff time"""
+        for game in self.status_data['games'].values():
+            if game['state'] == SCHEDULED and now_ts > game['scheduled']:
+                game['last_pre_seen'] = now_ts
+    
+    def get_status(self, team: str, scheduled: datetime) -> Optional[Dict]:
+        """Get the tracked status of a team's game, if it is the game being judged"""
+        game = self.status_data['games'].get(team)
+        if not game or abs(game['scheduled'] - int(scheduled.timestamp())) > SAME_GAME_SECONDS:
+            return None
+        return game
+    
+    def lock_time(self, team: str, scheduled: datetime) -> Optional[datetime]:
+        """When a team's players actually locked (None if the game is not being played)"""
+        game = self.get_status(team, scheduled)
+        if game is None:
+            return scheduled
+        if game['state'] == POSTPONED:
+            return None
+        if game['last_pre_seen']:
+            return max(scheduled, datetime.fromtimestamp(game['last_pre_seen'], tz=timezone.utc))
+        return scheduled
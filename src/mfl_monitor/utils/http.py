@@ -0,0 +1,93 @@
+"""
+Shared HTTP connection pools and request coalescing
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+def get_session(name: str) -> requests.Session:
+    """Get the shared session (and connection pool) for an upstream host"""
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[name] = session
+        return session
+
+def close_sessions():
+    """Close every shared session"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+class Flight:
+    """One fetch in progress and whoever is waiting on it"""
+    
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Lets concurrent identical requests share one upstream fetch
+    
+    The first caller for a key runs the fetch; anyone asking for the same key
+    while it is in flight waits and gets the same result (or exception), so
+    results must be treated as read-only. Nothing is kept once the fetch is
+    done - that's what the caches are for.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight: Dict[Hashable, Flight] = {}
+        # Per request name (the key's first item): fetches made and callers that shared one
+        self.stats: Dict[str, Dict[str, int]] = {}
+    
+    def do(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        """Run fetch, or wait for the identical one already running"""
+        with self.lock:
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = Flight()
+            counts = self.stats.setdefault(key[0], {'fetches': 0, 'coalesced': 0})
+            counts['fetches' if leader else 'coalesced'] += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fetch()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
+
+_flights = SingleFlight()
+
+def single_flight(key: Tuple, fetch: Callable[[], Any]) -> Any:
+    """Share one fetch between concurrent callers with the same key (first item names the request)"""
+    return _flights.do(key, fetch)
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Fetches made and requests coalesced into them, by request name"""
+    with _flights.lock:
+        return {name: dict(counts) for name, counts in _flights.stats.items()}
@@ -0,0 +1,106 @@
+"""
+Durable outbox for Discord notifications
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+from .config import Config
+from .files import write_json_atomic
+
+# How long a delivered key is remembered so the same alert is never sent twice
+SENT_KEY_TTL_SECONDS = 14 * 86400
+
+class Outbox:
+    """Messages waiting to go to Discord, kept on disk until they are delivered
+    
+    Every message has an idempotency key (one per violation), so queueing the
+    same alert again - say after a crash before last_run_time was saved - is a
+    no-op. Failed sends are retried with exponential backoff.
+    """
+    
+    def __init__(self, outbox_file: str = None):
+        self.outbox_file = outbox_file or Config.OUTBOX_FILE
+        # The analyzer queues from a worker thread while the sender drains
+        self.lock = threading.RLock()
+        self.outbox_data = self.load_outbox()
+    
+    def load_outbox(self) -> Dict:
+        """Load queued and recently sent messages"""
+        if os.path.exists(self.outbox_file):
+            try:
+                with open(self.outbox_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Could not load Discord outbox: {e}")
+        return {
+            'pending': [],
+            'failed': [],
+            'sent': {}
+        }
+    
+    def save_outbox(self):
+        """Save the outbox (atomically, so a crash never loses queued messages)"""
+        try:
+            write_json_atomic(self.outbox_file, self.outbox_data, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save Discord outbox: {e}")
+    
+    def add(self, key: str, content: str) -> bool:
+        """Queue a message unless its key is already queued or was sent"""
+        with self.lock:
+            if key in self.outbox_data['sent'] or any(m['key'] == key for m in self.outbox_data['pending']):
+                return False
+            now = time.time()
+            self.outbox_data['pending'].append({
+                'key': key,
+                'content': content,
+                'created_at': now,
+                'attempts': 0,
+                'next_attempt_at': now,
+                'last_error': None
+            })
+            self.save_outbox()
+            return True
+    
+    def due(self, now: float = None) -> List[Dict]:
+        """Get queued messages whose backoff has passed, oldest first"""
+        now = time.time() if now is None else now
+        with self.lock:
+            return [dict(m) for m in self.outbox_data['pending'] if m['next_attempt_at'] <= now]
+    
+    def pending_count(self) -> int:
+        """Number of messages still waiting to be delivered"""
+        with self.lock:
+            return len(self.outbox_data['pending'])
+    
+    def mark_sent(self, key: str):
+        """Remove a delivered message and remember its key"""
+        with self.lock:
+            now = time.time()
+            self.outbox_data['pending'] = [m for m in self.outbox_data['pending'] if m['key'] != key]
+            self.outbox_data['sent'][key] = now
+            self.outbox_data['sent'] = {k: sent_at for k, sent_at in self.outbox_data['sent'].items()
+                                        if now - sent_at < SENT_KEY_TTL_SECONDS}
+            self.save_outbox()
+    
+    def mark_failed(self, key: str, error: str):
+        """Schedule a retry with backoff, giving up after OUTBOX_MAX_ATTEMPTS"""
+        with self.lock:
+            for message in self.outbox_data['pending']:
+                if message['key'] != key:
+                    continue
+                message['attempts'] += 1
+                message['last_error'] = error
+                if message['attempts'] >= Config.OUTBOX_MAX_ATTEMPTS:
+                    self.outbox_data['pending'].remove(message)
+                    self.outbox_data['failed'].append(message)
+                    print(f"❌ Giving up on Discord message {key} after {message['attempts']} attempts")
+                else:
+                    backoff = min(Config.OUTBOX_BACKOFF_SECONDS * 2 ** (message['attempts'] - 1), 3600)
+                    message['next_attempt_at'] = time.time() + backoff
+                    print(f"⚠️  Discord send failed for {key}, retrying in {backoff:.0f}s")
+                break
+            self.save_outbox()
@@ -0,0 +1,202 @@
+"""
+Player -> NFL team index that remembers team changes over time
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right, insort
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Set
+from .config import Config
+from .files import write_json_atomic
+from .records import Player
+from .tiered_cache import TieredCache
+
+# Player dicts kept for recent points in time (each one covers every player)
+MAX_SNAPSHOTS = 4
+
+# How long an id MFL didn't know is left alone before it is looked up again
+MISS_TTL_SECONDS = 6 * 3600
+
+# Every player's team at every version as integers, for bulk checks. teams is
+# flat, version-major: the team of player n at version v is
+# team_names[teams[v * len(player_numbers) + n]].
+PlayerColumns = namedtuple('PlayerColumns', ['player_numbers', 'team_names', 'change_times', 'teams'])
+
+class PlayerIndex:
+    """Which NFL team every player was on, and since when
+    
+    Each player keeps parallel lists of 'since' times and teams, so the team at
+    a moment is a bisect. After the first full load only the players MFL
+    reports as changed (players export with SINCE) are fetched. A team change
+    is dated to the sync that first saw it, since MFL doesn't say when it
+    happened. Players known from before the index existed count as having
+    always been on their first team.
+    """
+    
+    def __init__(self, index_file: str = None):
+        self.index_file = index_file or Config.PLAYER_INDEX_FILE
+        self.lock = threading.RLock()
+        self.players: Dict[str, Dict] = {}
+        self.change_times: List[int] = []
+        self.snapshots: Dict[int, Dict[str, Player]] = {}
+        self.team_columns: Optional[PlayerColumns] = None
+        self.updated_at: Optional[int] = None
+        self.full_load_at: Optional[int] = None
+        # Ids MFL didn't know either, so they aren't asked for again every run
+        self.not_found = TieredCache('player_misses', Config.PLAYER_MISSES_FILE)
+        self.load_index()
+    
+    def load_index(self):
+        """Load the saved index"""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+            self.players = data['players']
+            self.updated_at = data.get('updated_at')
+            self.full_load_at = data.get('full_load_at')
+        except (json.JSONDecodeError, IOError, KeyError) as e:
+            print(f"Warning: Could not load player index: {e}")
+            self.players = {}
+        self.change_times = sorted({since for entry in self.players.values() for since in entry['since'][1:]})
+        self.snapshots = {}
+        self.team_columns = None
+    
+    def save_index(self):
+        """Save the index"""
+        try:
+            write_json_atomic(self.index_file, {
+                'updated_at': self.updated_at,
+                'full_load_at': self.full_load_at,
+                'players': self.players
+            })
+        except IOError as e:
+            print(f"Warning: Could not save player index: {e}")
+    
+    def merge(self, players: Dict[str, Player], seen_at: int) -> int:
+        """Add fetched players, recording a team change for any that moved; returns changes"""
+        changes = 0
+        with self.lock:
+            for player_id, player in players.items():
+                entry = self.players.get(player_id)
+                if entry is None:
+                    self.players[player_id] = {'name': player.name, 'position': player.position,
+                                               'since': [0], 'teams': [player.team]}
+                    continue
+                entry['name'] = player.name
+                entry['position'] = player.position
+                if entry['teams'][-1] != player.team:
+                    entry['since'].append(seen_at)
+                    entry['teams'].append(player.team)
+                    if seen_at not in self.change_times:
+                        insort(self.change_times, seen_at)
+                    changes += 1
+                    print(f"🔁 {player.name} moved from {entry['teams'][-2] or 'no team'} to {player.team or 'no team'}")
+            self.snapshots = {}
+            self.team_columns = None
+        return changes
+    
+    def refresh(self, mfl_api, now: int = None) -> bool:
+        """Bring the index up to date, with a full load only when it is empty or stale"""
+        now = now or int(time.time())
+        full_load = (not self.players or not self.full_load_at or
+                     now - self.full_load_at > Config.PLAYER_INDEX_FULL_RELOAD_DAYS * 86400)
+        players = mfl_api.get_players() if full_load else mfl_api.get_players(since=self.updated_at)
+        if not mfl_api.last_parse_stats.get('ok'):
+            return False
+        
+        changes = self.merge(players, now)
+        with self.lock:
+            self.updated_at = now
+            if full_load:
+                self.full_load_at = now
+        if players or full_load:
+            self.save_index()
+        print(f"👥 Player index {'reloaded' if full_load else 'updated'}: "
+              f"{len(players)} players fetched, {changes} team changes")
+        return True
+    
+    def missing(self, player_ids: Iterable[str]) -> Set[str]:
+        """Ids the index has never seen (and hasn't already failed to look up)"""
+        return {player_id for player_id in player_ids
+                if player_id not in self.players and not self.not_found.contains(player_id)}
+    
+    def fetch_missing(self, mfl_api, player_ids: Iterable[str], now: int = None) -> Dict[str, Player]:
+        """Look up unknown players with one targeted request and add them to the index"""
+        missing = self.missing(player_ids)
+        if not missing:
+            return {}
+        
+        players = mfl_api.get_players(player_ids=sorted(missing))
+        if not mfl_api.last_parse_stats.get('ok'):
+            return {}
+        self.merge(players, now or int(time.time()))
+        self.not_found.set_many({player_id: True for player_id in missing - set(players)}, MISS_TTL_SECONDS)
+        if players:
+            self.save_index()
+        print(f"👥 Looked up {len(missing)} unknown players, found {len(players)}")
+        return players
+    
+    def team_at(self, player_id: str, timestamp: int) -> Optional[str]:
+        """A player's team at a unix time (None if the player is unknown)"""
+        entry = self.players.get(player_id)
+        if entry is None:
+            return None
+        index = bisect_right(entry['since'], timestamp) - 1
+        return entry['teams'][max(index, 0)]
+    
+    def version_at(self, timestamp: int) -> int:
+        """Number of team changes seen up to a unix time (same version = same teams)"""
+        return bisect_right(self.change_times, timestamp)
+    
+    def players_at(self, timestamp: int) -> Dict[str, Player]:
+        """Every player with the team they were on at a unix time
+        
+        Times with the same version share one dict.
+        """
+        with self.lock:
+            version = self.version_at(timestamp)
+            players = self.snapshots.get(version)
+            if players is None:
+                players = {player_id: Player(player_id, entry['name'], entry['position'],
+                                             self.team_at(player_id, timestamp))
+                           for player_id, entry in self.players.items()}
+                if len(self.snapshots) >= MAX_SNAPSHOTS:
+                    self.snapshots.pop(next(iter(self.snapshots)))
+                self.snapshots[version] = players
+            return players
+    
+    def columns(self) -> PlayerColumns:
+        """Integer player and team columns for every version, rebuilt only after the index changes"""
+        with self.lock:
+            if self.team_columns is not None:
+                return self.team_columns
+            
+            player_numbers = {player_id: number for number, player_id in enumerate(self.players)}
+            team_numbers: Dict[str, int] = {}
+            teams = array('H', [team_numbers.setdefault(entry['teams'][0], len(team_numbers))
+                                for entry in self.players.values()])
+            
+            # Each version starts as a copy of the one before, plus the moves first seen at it
+            moves: Dict[int, List] = {}
+            for number, entry in enumerate(self.players.values()):
+                for since, team in zip(entry['since'][1:], entry['teams'][1:]):
+                    moves.setdefault(self.version_at(since), []).append(
+                        (number, team_numbers.setdefault(team, len(team_numbers))))
+            player_count = len(player_numbers)
+            for version in range(1, len(self.change_times) + 1):
+                offset = len(teams)
+                teams.extend(teams[offset - player_count:])
+                for number, team in moves.get(version, ()):
+                    teams[offset + number] = team
+            
+            self.team_columns = PlayerColumns(player_numbers, list(team_numbers), list(self.change_times), teams)
+            return self.team_columns
+    
+    def __len__(self):
+        return len(self.players)
@@ -0,0 +1,157 @@
+"""
+Compact player and transaction records
+"""
+
+import sys
+from array import array
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+def _ids(field: str) -> Tuple[str, ...]:
+    """Split an MFL 'id,id,' list"""
+    return tuple(player_id for player_id in field.split(',') if player_id)
+
+def _traded_ids(field: str) -> Tuple[str, ...]:
+    """Player ids in a trade's gave_up list (draft picks like FP_0002_2026_1 or DP_0_1 and blind bid dollars are left out)"""
+    return tuple(player_id for player_id in _ids(field) if player_id.isdigit())
+
+class Player:
+    """An MFL player, with team and position interned"""
+    
+    __slots__ = ('id', 'name', 'position', 'team')
+    
+    def __init__(self, player_id: str, name: str, position: str, team: str):
+        self.id = player_id
+        self.name = name
+        self.position = sys.intern(position)
+        self.team = sys.intern(team)
+    
+    def display_name(self) -> str:
+        """'Last, First' as 'First Last'"""
+        if ', ' in self.name:
+            last_name, first_name = self.name.split(', ', 1)
+            return f"{first_name} {last_name}"
+        return self.name
+    
+    def __repr__(self):
+        return f"Player({self.id!r}, {self.name!r}, {self.position!r}, {self.team!r})"
+
+class Transaction:
+    """An MFL transaction with its timestamp parsed once"""
+    
+    __slots__ = ('type', 'franchise', 'timestamp', 'added', 'dropped', 'data')
+    
+    def __init__(self, transaction_type: str, franchise: str, timestamp: int,
+                 added: Tuple[str, ...] = (), dropped: Tuple[str, ...] = (), data: str = ''):
+        self.type = sys.intern(transaction_type)
+        self.franchise = sys.intern(franchise)
+        self.timestamp = timestamp
+        self.added = added
+        self.dropped = dropped
+        self.data = data
+    
+    @classmethod
+    def from_mfl(cls, transaction: Dict) -> Optional['Transaction']:
+        """Build a record from an MFL transaction dict (None if the timestamp is bad)"""
+        try:
+            timestamp = int(transaction.get('timestamp', ''))
+        except (ValueError, TypeError):
+            return None
+        
+        transaction_type = transaction.get('type', '')
+        data = transaction.get('transaction', '')
+        added = dropped = ()
+        if transaction_type == 'TRADE':
+            # Added is what the franchise received, dropped is what it gave up
+            added = _traded_ids(transaction.get('franchise2_gave_up', ''))
+            dropped = _traded_ids(transaction.get('franchise1_gave_up', ''))
+            data = f"{transaction.get('franchise2', '')}|{transaction.get('franchise1_gave_up', '')}|{transaction.get('franchise2_gave_up', '')}"
+        elif transaction_type == 'IR':
+            added = _ids(transaction.get('activated', ''))
+            dropped = _ids(transaction.get('deactivated', ''))
+            data = f"{transaction.get('activated', '')}|{transaction.get('deactivated', '')}"
+        elif transaction_type == 'TAXI':
+            added = _ids(transaction.get('promoted', ''))
+            dropped = _ids(transaction.get('demoted', ''))
+            data = f"{transaction.get('promoted', '')}|{transaction.get('demoted', '')}"
+        elif ',' in data and '|' in data:
+            # 'added,|dropped,' for free agents, 'added,|bid|dropped,' for blind bids
+            parts = data.split('|')
+            added = _ids(parts[0])
+            dropped = _ids(parts[-1])
+        
+        return cls(transaction_type, transaction.get('franchise', ''),
+                   timestamp, added, dropped, data)
+    
+    def __repr__(self):
+        return f"Transaction({self.type!r}, {self.franchise!r}, {self.timestamp}, {self.added!r}, {self.dropped!r})"
+
+def parse_transactions(transactions: Iterable[Dict]) -> List[Transaction]:
+    """Parse MFL transaction dicts, skipping ones with bad timestamps"""
+    records = []
+    for transaction in transactions:
+        record = Transaction.from_mfl(transaction)
+        if record is None:
+            print(f"Invalid timestamp format: {transaction.get('timestamp')}")
+            continue
+        records.append(record)
+    return records
+
+class TransactionColumns:
+    """Transactions stored column-wise for bulk checks
+    
+    Each row is a transaction's timestamp, the index of its franchise, the
+    index of its type and how many players it added and dropped. The added
+    and dropped players themselves are two flat arrays of player indexes, in
+    row order, so a whole batch lives in a handful of flat arrays instead of
+    one object per row.
+    """
+    
+    def __init__(self):
+        self.timestamps = array('q')
+        self.franchises = array('H')
+        self.types = array('B')
+        self.added_counts = array('B')
+        self.dropped_counts = array('B')
+        self.added = array('l')
+        self.dropped = array('l')
+        self.player_ids: List[str] = []
+        self.franchise_ids: List[str] = []
+        self.type_ids: List[str] = []
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> 'TransactionColumns':
+        """Build columns from transaction records
+        
+        Every column is one map over the batch rather than a Python loop, so
+        building them costs little next to parsing the transactions.
+        """
+        transactions = list(transactions)
+        columns = cls()
+        types = list(map(attrgetter('type'), transactions))
+        franchises = list(map(attrgetter('franchise'), transactions))
+        added = list(map(attrgetter('added'), transactions))
+        dropped = list(map(attrgetter('dropped'), transactions))
+        added_ids = list(chain.from_iterable(added))
+        dropped_ids = list(chain.from_iterable(dropped))
+        
+        # dict.fromkeys keeps first-seen order, which becomes each key's index
+        columns.type_ids = list(dict.fromkeys(types))
+        columns.franchise_ids = list(dict.fromkeys(franchises))
+        columns.player_ids = list(dict.fromkeys(chain(added_ids, dropped_ids)))
+        type_index = {key: index for index, key in enumerate(columns.type_ids)}
+        franchise_index = {key: index for index, key in enumerate(columns.franchise_ids)}
+        player_index = {key: index for index, key in enumerate(columns.player_ids)}
+        
+        columns.timestamps = array('q', map(attrgetter('timestamp'), transactions))
+        columns.types = array('B', map(type_index.__getitem__, types))
+        columns.franchises = array('H', map(franchise_index.__getitem__, franchises))
+        columns.added_counts = array('B', map(len, added))
+        columns.dropped_counts = array('B', map(len, dropped))
+        columns.added = array('l', map(player_index.__getitem__, added_ids))
+        columns.dropped = array('l', map(player_index.__getitem__, dropped_ids))
+        return columns
+    
+    def __len__(self):
+        return len(self.timestamps)
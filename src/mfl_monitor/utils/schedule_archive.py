@@ -0,0 +1,135 @@
+"""
+Append-only archive of every NFL week's game times
+"""
+
+import os
+import struct
+import threading
+from bisect import bisect_right
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Tuple
+import pytz
+from .config import Config
+from ..apis.nfl import TEAM_ALIASES
+
+MAGIC = b'MFLS'
+VERSION = 1
+HEADER = struct.Struct('<4sB3x')
+# season, season type (2 = regular, 3 = post), week, team code, kickoff (unix seconds)
+RECORD = struct.Struct('<HBB4sI')
+
+WeekKey = Tuple[int, int, int]
+
+REGULAR_SEASON = 2
+POSTSEASON = 3
+REGULAR_SEASON_WEEKS = 18
+
+def week_start(game_times: Dict[str, datetime]) -> datetime:
+    """Tuesday midnight (New York time) before the first kickoff of a week"""
+    ny_tz = pytz.timezone('America/New_York')
+    first_game = min(game_times.values()).astimezone(ny_tz)
+    tuesday = first_game - timedelta(days=(first_game.weekday() - 1) % 7)
+    tuesday = tuesday.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    return ny_tz.localize(tuesday).astimezone(timezone.utc)
+
+class ScheduleArchive:
+    """Keeps every week's kickoff times in a small fixed-record file
+    
+    Records are only ever appended; when a week is stored again the newer
+    record for a team wins. The whole file is read once and indexed in memory
+    by week and by week start time, so looking up the schedule that applies to
+    any timestamp is a bisect plus a dict lookup.
+    """
+    
+    def __init__(self, archive_file: str = None):
+        self.archive_file = archive_file or Config.SCHEDULE_ARCHIVE_FILE
+        self.weeks: Dict[WeekKey, Dict[str, int]] = {}
+        self.week_starts: List[int] = []
+        self.week_keys: List[WeekKey] = []
+        self.resolved: Dict[WeekKey, Dict[str, datetime]] = {}
+        # Schedule sources may be fetched (and archived) from several threads at once
+        self.lock = threading.Lock()
+        self.load()
+    
+    def load(self):
+        """Read the archive file and build the indexes"""
+        self.weeks = {}
+        if os.path.exists(self.archive_file):
+            try:
+                with open(self.archive_file, 'rb') as f:
+                    data = f.read()
+                magic, version = HEADER.unpack_from(data, 0)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"unsupported archive format {magic!r} v{version}")
+                for season, season_type, week, team, kickoff in RECORD.iter_unpack(data[HEADER.size:]):
+                    team_code = team.rstrip(b'\0').decode('ascii')
+                    team_code = TEAM_ALIASES.get(team_code, team_code)
+                    self.weeks.setdefault((season, season_type, week), {})[team_code] = kickoff
+            except (IOError, ValueError, struct.error) as e:
+                print(f"Warning: Could not read schedule archive: {e}")
+                self.weeks = {}
+        self.build_index()
+    
+    def build_index(self):
+        """Sort weeks by their start time for timestamp lookups"""
+        self.resolved = {}
+        starts = []
+        for key, kickoffs in self.weeks.items():
+            game_times = {team: datetime.fromtimestamp(ts, tz=timezone.utc) for team, ts in kickoffs.items()}
+            starts.append((int(week_start(game_times).timestamp()), key))
+        starts.sort()
+        self.week_starts = [start for start, _ in starts]
+        self.week_keys = [key for _, key in starts]
+    
+    def append_week(self, season: int, season_type: int, week: int, game_times: Dict[str, datetime]) -> bool:
+        """Store a week's game times, appending only teams that are new or changed"""
+        with self.lock:
+            existing = self.weeks.get((season, season_type, week), {})
+            changed = {}
+            for team, game_time in game_times.items():
+                kickoff = int(game_time.timestamp())
+                if existing.get(team) != kickoff:
+                    changed[team] = kickoff
+            if not changed:
+                return False
+            
+            try:
+                os.makedirs(os.path.dirname(self.archive_file), exist_ok=True)
+                is_new = not os.path.exists(self.archive_file) or os.path.getsize(self.archive_file) == 0
+                with open(self.archive_file, 'ab') as f:
+                    if is_new:
+                        f.write(HEADER.pack(MAGIC, VERSION))
+                    for team, kickoff in changed.items():
+                        f.write(RECORD.pack(season, season_type, week, team.encode('ascii')[:4], kickoff))
+            except IOError as e:
+                print(f"Warning: Could not append to schedule archive: {e}")
+                return False
+            
+            self.weeks.setdefault((season, season_type, week), {}).update(changed)
+            self.build_index()
+            print(f"📚 Archived {len(changed)} game times for {season} week {week}")
+            return True
+    
+    def has_week(self, season: int, season_type: int, week: int) -> bool:
+        """Check if a week is already archived"""
+        return (season, season_type, week) in self.weeks
+    
+    def get_week(self, season: int, season_type: int, week: int) -> Dict[str, datetime]:
+        """Get the game times for an archived week"""
+        key = (season, season_type, week)
+        if key not in self.resolved:
+            kickoffs = self.weeks.get(key, {})
+            self.resolved[key] = {team: datetime.fromtimestamp(ts, tz=timezone.utc) for team, ts in kickoffs.items()}
+        return self.resolved[key]
+    
+    def week_for(self, timestamp: int) -> Optional[WeekKey]:
+        """Find the archived week that a unix timestamp falls in (Tuesday to Monday)"""
+        index = bisect_right(self.week_starts, timestamp) - 1
+        if index < 0 or timestamp >= self.week_starts[index] + 7 * 86400:
+            return None
+        return self.week_keys[index]
+    
+    def game_times_at(self, timestamp: int) -> Dict[str, datetime]:
+        """Get the schedule that applied at a given unix timestamp"""
+        key = self.week_for(timestamp)
+        return self.get_week(*key) if key else {}
@@ -0,0 +1,164 @@
+"""
+Pack the data directory into one file so a fresh runner can start warm
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import time
+from typing import Dict, List
+from .config import Config
+
+# Bumped whenever the bundle layout changes; bundles in another format are ignored
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+
+# Ledgers are always restored - losing them means duplicate alerts or lost quota counts
+LEDGER = 'ledger'
+# Caches are only restored while the bundle is younger than STATE_BUNDLE_MAX_AGE_HOURS
+CACHE = 'cache'
+
+def state_files() -> Dict[str, str]:
+    """Every file worth carrying between runs, with its kind"""
+    files = {
+        Config.DATA_FILE: LEDGER,
+        Config.OUTBOX_FILE: LEDGER,
+        Config.QUOTA_FILE: LEDGER,
+        Config.LINEUP_SNAPSHOT_FILE: LEDGER,
+        Config.SCHEDULE_ARCHIVE_FILE: LEDGER,
+        Config.CACHE_FILE: CACHE,
+        Config.ODDS_CACHE_FILE: CACHE,
+        Config.GAME_STATUS_FILE: CACHE,
+        Config.PLAYER_INDEX_FILE: CACHE,
+        Config.FRANCHISE_CACHE_FILE: CACHE,
+        Config.PLAYER_MISSES_FILE: CACHE,
+    }
+    for path in sorted(glob.glob(os.path.join(Config.CACHE_DIR, '*.json'))):
+        files[path] = CACHE
+    return files
+
+def sha256_file(path: str) -> str:
+    """Hex sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class StateBundle:
+    """A gzipped tar of the state files plus a manifest
+    
+    The manifest records each file's kind, sha256 and modification time.
+    Restoring checks every file on its own: a corrupt file or a stale cache
+    is skipped and the rest are still restored, and a local file newer than
+    the bundled copy is never overwritten.
+    """
+    
+    def __init__(self, bundle_file: str = None):
+        self.bundle_file = bundle_file or Config.STATE_BUNDLE_FILE
+    
+    def export(self) -> Dict:
+        """Write every existing state file into the bundle and return its manifest"""
+        manifest = {'format': BUNDLE_FORMAT, 'created_at': time.time(), 'files': {}}
+        files = state_files()
+        paths = [path for path in files if os.path.exists(path)]
+        for path in paths:
+            manifest['files'][path] = {
+                'kind': files[path],
+                'sha256': sha256_file(path),
+                'size': os.path.getsize(path),
+                'mtime': os.path.getmtime(path),
+            }
+        
+        directory = os.path.dirname(self.bundle_file) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.tar.gz')
+        try:
+            with os.fdopen(fd, 'wb') as f, tarfile.open(fileobj=f, mode='w:gz') as bundle:
+                data = json.dumps(manifest, indent=2).encode()
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(data)
+                info.mtime = manifest['created_at']
+                bundle.addfile(info, io.BytesIO(data))
+                for path in paths:
+                    bundle.add(path, arcname=path, recursive=False)
+            os.replace(temp_path, self.bundle_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        print(f"📦 Exported {len(paths)} state files to {self.bundle_file} "
+              f"({os.path.getsize(self.bundle_file) / 1024:.0f} KB)")
+        return manifest
+    
+    def restore(self, now: float = None) -> Dict[str, List[str]]:
+        """Restore state files from the bundle
+        
+        Returns the paths that were restored, skipped as stale, failed their
+        checksum, or kept because the local copy is newer.
+        """
+        result = {'restored': [], 'stale': [], 'corrupt': [], 'kept': []}
+        if not os.path.exists(self.bundle_file):
+            print(f"No state bundle at {self.bundle_file}, starting cold")
+            return result
+        
+        now = now or time.time()
+        try:
+            with tarfile.open(self.bundle_file, 'r:gz') as bundle:
+                manifest = json.load(bundle.extractfile(MANIFEST_NAME))
+                if manifest.get('format') != BUNDLE_FORMAT:
+                    print(f"Warning: Ignoring state bundle in format {manifest.get('format')} "
+                          f"(expected {BUNDLE_FORMAT})")
+                    return result
+                
+                known = state_files()
+                age_hours = (now - manifest['created_at']) / 3600
+                for path, entry in manifest['files'].items():
+                    # Only files this version knows about, so a bundle can't write anywhere else
+                    if path not in known and not (os.path.dirname(path) == Config.CACHE_DIR
+                                                  and path.endswith('.json')):
+                        continue
+                    if entry['kind'] == CACHE and age_hours > Config.STATE_BUNDLE_MAX_AGE_HOURS:
+                        result['stale'].append(path)
+                        continue
+                    if os.path.exists(path) and os.path.getmtime(path) >= entry['mtime']:
+                        result['kept'].append(path)
+                        continue
+                    
+                    try:
+                        data = bundle.extractfile(path).read()
+                    except (KeyError, AttributeError):
+                        result['corrupt'].append(path)
+                        continue
+                    if hashlib.sha256(data).hexdigest() != entry['sha256']:
+                        result['corrupt'].append(path)
+                        continue
+                    self.write_file(path, data, entry['mtime'])
+                    result['restored'].append(path)
+        except (tarfile.TarError, KeyError, json.JSONDecodeError, IOError, EOFError) as e:
+            print(f"Warning: Could not read state bundle: {e}")
+            return result
+        
+        print(f"📦 Restored {len(result['restored'])} state files from a bundle {age_hours:.1f}h old "
+              f"({len(result['stale'])} stale, {len(result['corrupt'])} corrupt, {len(result['kept'])} kept)")
+        return result
+    
+    def write_file(self, path: str, data: bytes, mtime: float):
+        """Write a restored file atomically, keeping its original modification time"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.utime(temp_path, (mtime, mtime))
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
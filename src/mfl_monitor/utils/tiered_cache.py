@@ -0,0 +1,156 @@
+"""
+Two-tier cache - recently used entries in memory, everything on disk
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from .config import Config
+from .files import write_json_atomic
+
+# Every cache created in this process, for stats
+_caches = weakref.WeakSet()
+
+class TieredCache:
+    """Key/value cache where every key has its own TTL
+    
+    Expiry is stored as a unix timestamp, so it means the same thing whatever
+    timezone the host runs in. The memory tier keeps the most recently used
+    entries; the disk tier keeps entries across runs and drops the ones
+    written longest ago once it is full. Expired entries stay on disk until
+    evicted, so callers can still fall back to them (allow_stale) when every
+    source is down. Values must be JSON-serializable.
+    """
+    
+    def __init__(self, name: str, cache_file: str = None, memory_items: int = None, disk_items: int = None):
+        self.name = name
+        self.cache_file = cache_file or os.path.join(Config.CACHE_DIR, f'{name}.json')
+        self.memory_items = memory_items or Config.CACHE_MEMORY_ITEMS
+        self.disk_items = disk_items or Config.CACHE_DISK_ITEMS
+        self.lock = threading.RLock()
+        self.memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self.disk: Dict[str, Dict] = self.load_disk()
+        # Bumped on every write or invalidation, so callers can tell the contents changed
+        self.version = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'writes': 0}
+        _caches.add(self)
+    
+    def load_disk(self) -> Dict[str, Dict]:
+        """Load the disk tier (anything unreadable or in an old format starts empty)"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f:
+                    entries = json.load(f).get('entries')
+                if isinstance(entries, dict):
+                    return entries
+            except (json.JSONDecodeError, IOError, AttributeError) as e:
+                print(f"Warning: Could not load {self.name} cache: {e}")
+        return {}
+    
+    def save_disk(self):
+        """Save the disk tier"""
+        try:
+            write_json_atomic(self.cache_file, {'entries': self.disk}, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save {self.name} cache: {e}")
+    
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired (unless allow_stale)"""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] > now:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry[1]
+            
+            record = self.disk.get(key)
+            if record is None:
+                self.stats['misses'] += 1
+                return None
+            if record['expires_at'] <= now:
+                self.stats['expired'] += 1
+                if not allow_stale:
+                    self.stats['misses'] += 1
+                    return None
+                return record['value']
+            
+            self.stats['disk_hits'] += 1
+            self.remember(key, record['expires_at'], record['value'])
+            return record['value']
+    
+    def remember(self, key: str, expires_at: float, value: Any):
+        """Put an entry in the memory tier, evicting the least recently used"""
+        self.memory[key] = (expires_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def contains(self, key: str) -> bool:
+        """Check for an unexpired value without counting a hit or miss"""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] > now:
+                return True
+            record = self.disk.get(key)
+            return record is not None and record['expires_at'] > now
+    
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        """Store a value in both tiers for ttl_seconds"""
+        self.set_many({key: value}, ttl_seconds)
+    
+    def set_many(self, items: Dict[str, Any], ttl_seconds: float):
+        """Store several values for ttl_seconds, writing the disk tier once"""
+        if not items:
+            return
+        expires_at = time.time() + ttl_seconds
+        with self.lock:
+            for key, value in items.items():
+                self.remember(key, expires_at, value)
+                # Re-inserted so the disk tier stays in write order
+                self.disk.pop(key, None)
+                self.disk[key] = {'value': value, 'expires_at': expires_at}
+                self.stats['writes'] += 1
+            while len(self.disk) > self.disk_items:
+                self.disk.pop(next(iter(self.disk)))
+                self.stats['evictions'] += 1
+            self.version += 1
+            self.save_disk()
+    
+    def latest(self) -> Optional[Any]:
+        """The most recently written value, expired or not"""
+        with self.lock:
+            if not self.disk:
+                return None
+            return self.disk[next(reversed(self.disk))]['value']
+    
+    def invalidate(self, key: str = None):
+        """Drop one key, or everything when no key is given"""
+        with self.lock:
+            if key is None:
+                self.memory.clear()
+                self.disk.clear()
+            else:
+                self.memory.pop(key, None)
+                self.disk.pop(key, None)
+            self.version += 1
+            self.save_disk()
+    
+    def summary(self) -> str:
+        """One line of hit/miss stats"""
+        stats = self.stats
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        hit_rate = (stats['memory_hits'] + stats['disk_hits']) / lookups * 100 if lookups else 0
+        return (f"{self.name}: {hit_rate:.0f}% hits ({stats['memory_hits']} memory, {stats['disk_hits']} disk, "
+                f"{stats['misses']} misses, {stats['expired']} expired, {stats['evictions']} evicted)")
+
+def cache_summaries() -> Dict[str, str]:
+    """Stats for every cache that has been used in this process"""
+    return {cache.name: cache.summary() for cache in list(_caches)
+            if any(cache.stats.values())}
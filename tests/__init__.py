@@ -1 +1,22 @@
 # Test package for MFL Transaction Monitor
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.mfl_monitor.utils.config import Config
+
+# Every file an analyzer, scheduler or backfill reads or writes
+DATA_FILES = ('DATA_FILE', 'CACHE_FILE', 'SCHEDULE_ARCHIVE_FILE', 'GAME_STATUS_FILE', 'QUOTA_FILE',
+              'ODDS_CACHE_FILE', 'OUTBOX_FILE', 'LINEUP_SNAPSHOT_FILE', 'PLAYER_INDEX_FILE', 'PLAYER_MISSES_FILE',
+              'FRANCHISE_CACHE_FILE', 'CACHE_DIR', 'JOB_STATUS_FILE', 'BACKFILL_REPORT_FILE')
+
+def use_temp_data_files(test_case: unittest.TestCase) -> str:
+    """Point every data file at a throwaway directory until the test ends, and return the directory"""
+    temp_dir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(temp_dir.cleanup)
+    patcher = patch.multiple(Config, **{name: os.path.join(temp_dir.name, name.lower()) for name in DATA_FILES})
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return temp_dir.name
@@ -0,0 +1,122 @@
+"""
+Tests for the weekly activity calendar
+"""
+
+import unittest
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytz
+from src.mfl_monitor.apis.nfl import filter_current_week
+from src.mfl_monitor.core.activity import ActivityCalendar
+from src.mfl_monitor.core.scheduler import TransactionScheduler
+from src.mfl_monitor.utils.schedule_archive import REGULAR_SEASON
+from tests import use_temp_data_files
+
+NY = pytz.timezone('America/New_York')
+
+def ny_time(year, month, day, hour, minute=0):
+    return NY.localize(datetime(year, month, day, hour, minute))
+
+class TestActivityCalendar(unittest.TestCase):
+    """Test the compiled minute-of-week bitmap"""
+    
+    def setUp(self):
+        """Calendar with no cached games"""
+        self.calendar = ActivityCalendar({}, lead_minutes=60, trail_minutes=240)
+    
+    def test_default_window(self):
+        """Test the Thursday 8PM to Monday 10PM window"""
+        # 2025-09-04 is a Thursday
+        self.assertFalse(self.calendar.is_active(ny_time(2025, 9, 4, 19, 59)))
+        self.assertTrue(self.calendar.is_active(ny_time(2025, 9, 4, 20, 0)))
+        self.assertTrue(self.calendar.is_active(ny_time(2025, 9, 6, 15, 0)))
+        self.assertTrue(self.calendar.is_active(ny_time(2025, 9, 8, 22, 0)))
+        self.assertFalse(self.calendar.is_active(ny_time(2025, 9, 8, 22, 1)))
+        self.assertFalse(self.calendar.is_active(ny_time(2025, 9, 10, 12, 0)))
+    
+    def test_skip_period(self):
+        """Test the nightly skip period inside the window"""
+        self.assertFalse(self.calendar.is_active(ny_time(2025, 9, 7, 3, 0)))
+        self.assertTrue(self.calendar.is_active(ny_time(2025, 9, 7, 9, 1)))
+    
+    def test_game_overrides_skip_and_window(self):
+        """Test that cached kickoffs open their own window"""
+        # London kickoff Sunday 9:30AM and a Wednesday Christmas game
+        london = ny_time(2025, 9, 28, 9, 30).astimezone(timezone.utc)
+        christmas = ny_time(2025, 12, 24, 13, 0).astimezone(timezone.utc)
+        calendar = ActivityCalendar({'MIN': london, 'PIT': london, 'DAL': christmas},
+                                    lead_minutes=60, trail_minutes=240)
+        self.assertTrue(calendar.is_active(ny_time(2025, 9, 28, 8, 30)))
+        self.assertTrue(calendar.is_active(ny_time(2025, 12, 24, 16, 0)))
+        self.assertFalse(calendar.is_active(ny_time(2025, 12, 24, 17, 1)))
+    
+    def test_next_active(self):
+        """Test when-next lookups, including wrapping the week"""
+        now = ny_time(2025, 9, 10, 12, 0)  # Wednesday noon
+        self.assertEqual(self.calendar.next_active(now), ny_time(2025, 9, 11, 20, 0))
+        
+        active = ny_time(2025, 9, 6, 15, 0)
+        self.assertEqual(self.calendar.minutes_until_active(active), 0)
+        self.assertEqual(self.calendar.next_active(active), active)
+    
+    def test_never_active(self):
+        """Test an empty calendar"""
+        self.calendar.bits[:] = bytes(len(self.calendar.bits))
+        self.calendar._build_next_table()
+        self.assertIsNone(self.calendar.next_active(ny_time(2025, 9, 10, 12, 0)))
+
+# Christmas 2024, before the Wednesday games
+CHRISTMAS_MORNING = ny_time(2024, 12, 25, 9, 0).astimezone(timezone.utc)
+
+class FrozenDateTime(datetime):
+    """datetime whose now() is Christmas morning"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return CHRISTMAS_MORNING.astimezone(tz) if tz else CHRISTMAS_MORNING.replace(tzinfo=None)
+
+class TestSchedulerCalendar(unittest.TestCase):
+    """Test the calendar the scheduler builds from the schedule cache"""
+    
+    def setUp(self):
+        """Week 17 of 2024 archived, and cached the way a schedule refresh leaves it"""
+        use_temp_data_files(self)
+        for target in ('src.mfl_monitor.apis.nfl.datetime', 'src.mfl_monitor.utils.cache.datetime',
+                       'src.mfl_monitor.core.scheduler.datetime'):
+            frozen = patch(target, FrozenDateTime)
+            frozen.start()
+            self.addCleanup(frozen.stop)
+        clock = patch('src.mfl_monitor.core.scheduler.time.time', return_value=CHRISTMAS_MORNING.timestamp())
+        clock.start()
+        self.addCleanup(clock.stop)
+        quiet = patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+        
+        wednesday_early = ny_time(2024, 12, 25, 13, 0).astimezone(timezone.utc)
+        wednesday_late = ny_time(2024, 12, 25, 16, 30).astimezone(timezone.utc)
+        thursday = ny_time(2024, 12, 26, 20, 15).astimezone(timezone.utc)
+        week = {'KCC': wednesday_early, 'PIT': wednesday_early, 'BAL': wednesday_late, 'HOU': wednesday_late,
+                'SEA': thursday, 'CHI': thursday}
+        self.scheduler = TransactionScheduler()
+        cache = self.scheduler.analyzer.cache
+        cache.archive.append_week(2024, REGULAR_SEASON, 17, week)
+        cache.save_cache(filter_current_week(week), cache.get_current_week_range())
+    
+    def test_wednesday_games_open_a_window(self):
+        """Test that games the Thursday-Monday cache leaves out still open their window"""
+        cache = self.scheduler.analyzer.cache
+        self.assertNotIn('KCC', cache.get_cached_game_times())
+        
+        calendar = self.scheduler.get_calendar()
+        self.assertTrue(calendar.is_active(ny_time(2024, 12, 25, 13, 30)))
+        self.assertTrue(calendar.is_active(ny_time(2024, 12, 25, 17, 0)))
+        self.assertFalse(calendar.is_active(CHRISTMAS_MORNING))
+        self.assertIs(self.scheduler.get_calendar(), calendar)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for auditing past transactions
+"""
+
+import unittest
+import os
+import sys
+import json
+from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock, patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.utils.records import Player
+from src.mfl_monitor.utils.schedule_archive import REGULAR_SEASON, week_start
+from src.mfl_monitor.core.backfill import BackfillRunner
+from tests import use_temp_data_files
+
+WEEK1_KICKOFF = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)  # Thursday 8:20PM ET
+WEEK1 = {'PHI': WEEK1_KICKOFF, 'DAL': WEEK1_KICKOFF, 'BUF': WEEK1_KICKOFF + timedelta(days=3)}
+WEEK2 = {'PHI': WEEK1_KICKOFF + timedelta(days=10), 'DAL': WEEK1_KICKOFF + timedelta(days=7),
+         'BUF': WEEK1_KICKOFF + timedelta(days=10)}
+WEEK3 = {'PHI': WEEK1_KICKOFF + timedelta(days=14)}
+
+def ts(moment: datetime) -> int:
+    """Unix seconds"""
+    return int(moment.timestamp())
+
+def pickup(franchise: str, timestamp: int, added: str, dropped: str = '') -> dict:
+    """An MFL free agent row"""
+    return {'type': 'FREE_AGENT', 'franchise': franchise, 'timestamp': str(timestamp),
+            'transaction': f"{added},|{dropped + ',' if dropped else ''}"}
+
+class TestBackfillRunner(unittest.TestCase):
+    """Test replaying a date range of transactions"""
+    
+    def setUp(self):
+        """Three archived weeks, a small player pool and canned MFL transactions"""
+        use_temp_data_files(self)
+        year = patch.object(Config, 'MFL_YEAR', '2025')
+        year.start()
+        self.addCleanup(year.stop)
+        quiet = patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+        
+        self.runner = BackfillRunner()
+        for week, game_times in ((1, WEEK1), (2, WEEK2), (3, WEEK3)):
+            self.runner.archive.append_week(2025, REGULAR_SEASON, week, game_times)
+        # The other weeks aren't on ESPN either
+        self.runner.espn_client = MagicMock()
+        self.runner.espn_client.get_game_times_by_team.return_value = {}
+        
+        analyzer = self.runner.analyzer
+        analyzer.player_index.merge({'101': Player('101', 'Hurts, Jalen', 'QB', 'PHI'),
+                                     '102': Player('102', 'Lamb, CeeDee', 'WR', 'DAL'),
+                                     '103': Player('103', 'Cook, James', 'RB', 'BUF')}, 0)
+        analyzer.refresh_players = False
+        analyzer.get_franchises = MagicMock(return_value={'0001': {'name': 'Eagles Fans', 'owner_name': 'Sam'}})
+        
+        # From an hour after the opener until week 3 begins
+        self.start = WEEK1_KICKOFF + timedelta(hours=1)
+        self.end = week_start(WEEK3)
+        late_week1 = pickup('0001', ts(WEEK1_KICKOFF) + 7200, '101')
+        self.chunks = {
+            1: [pickup('0001', ts(WEEK1_KICKOFF) + 600, '101'),  # Before the range
+                late_week1,
+                pickup('0002', ts(WEEK1_KICKOFF) + 7200, '103')],  # BUF hasn't played yet
+            # MFL's week 2 starts before ours, so it repeats the late week 1 pickup
+            2: [late_week1,
+                pickup('0002', ts(WEEK2['DAL']) + 60, '102', '103'),
+                pickup('0001', ts(self.end) + 60, '101')],  # After the range
+        }
+        self.runner.mfl_api = MagicMock()
+        self.runner.mfl_api.get_transactions.side_effect = lambda week, types: self.chunks.get(week, [])
+    
+    def report_rows(self):
+        """Rows written to the report file"""
+        with open(self.runner.report_file) as report:
+            return [json.loads(line) for line in report]
+    
+    def test_weeks_in_range(self):
+        """Test that only weeks overlapping [start, end) are loaded, in order"""
+        weeks = self.runner.load_week_schedules(self.start, self.end)
+        
+        self.assertEqual([week for _, week, _ in weeks], [1, 2])
+        self.assertEqual([begins for begins, _, _ in weeks], [ts(week_start(WEEK1)), ts(week_start(WEEK2))])
+        self.assertEqual(weeks[1][2], WEEK2)
+        
+        # A range starting where week 2 ends only reaches week 3
+        self.assertEqual([week for _, week, _ in self.runner.load_week_schedules(self.end, self.end + timedelta(days=1))], [3])
+    
+    def test_report_rows(self):
+        """Test that each violation is reported once, under the week it happened in"""
+        self.assertEqual(self.runner.run(self.start, self.end), 2)
+        
+        fetched = [call.kwargs['week'] for call in self.runner.mfl_api.get_transactions.call_args_list]
+        self.assertEqual(fetched, [1, 2])
+        
+        rows = self.report_rows()
+        self.assertEqual([(row['week'], row['franchise'], row['player_id'], row['rule']) for row in rows],
+                         [(1, '0001', '101', 'late_pickup'), (2, '0002', '102', 'late_pickup')])
+        self.assertEqual(rows[0]['timestamp'], ts(WEEK1_KICKOFF) + 7200)
+        self.assertEqual(rows[0]['type'], 'FREE_AGENT')
+        self.assertEqual(rows[0]['game_start'], WEEK1_KICKOFF.isoformat())
+        self.assertEqual(rows[1]['game_start'], WEEK2['DAL'].isoformat())
+        self.assertIn('Jalen Hurts', rows[0]['message'])
+        self.assertIn('Eagles Fans', rows[0]['message'])
+    
+    def test_no_weeks(self):
+        """Test that a range with no archived weeks writes nothing"""
+        self.assertEqual(self.runner.run(self.end + timedelta(days=7), self.end + timedelta(days=14)), 0)
+        self.runner.mfl_api.get_transactions.assert_not_called()
+        self.assertFalse(os.path.exists(self.runner.report_file))
+
+if __name__ == '__main__':
+    unittest.main()
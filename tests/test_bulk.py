@@ -0,0 +1,89 @@
+"""
+Tests for the bulk post-lock check
+"""
+
+import unittest
+import os
+import sys
+import random
+import tempfile
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.records import Player, Transaction
+from src.mfl_monitor.utils.player_index import PlayerIndex
+from src.mfl_monitor.core import bulk
+from src.mfl_monitor.core.bulk import BulkEvaluator
+from src.mfl_monitor.core.lock_table import LockTable
+from src.mfl_monitor.core.rules import Rule, RuleEngine
+
+KICKOFF = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+# Player '1' is traded from PHI to DAL between the two weeks
+TRADED_AT = int((KICKOFF + timedelta(days=4)).timestamp())
+
+class TestBulkEvaluator(unittest.TestCase):
+    """Test that the bulk check agrees with the rule engine"""
+    
+    def setUp(self):
+        """Two weeks of schedules and a batch of random transactions"""
+        rng = random.Random(1)
+        self.weeks = [(int((KICKOFF - timedelta(days=2)).timestamp()), {'PHI': KICKOFF, 'DAL': KICKOFF + timedelta(days=3)}),
+                      (int((KICKOFF + timedelta(days=5)).timestamp()), {'PHI': KICKOFF + timedelta(days=10),
+                                                                        'DAL': KICKOFF + timedelta(days=8)})]
+        start = self.weeks[0][0] - 86400
+        player_ids = ['1', '2', '3', '4', '5']
+        self.transactions = [Transaction(rng.choice(['FREE_AGENT', 'BBID_WAIVER', 'TRADE', 'IR', 'AUCTION_INIT']), '0001',
+                                         rng.randint(start, start + 16 * 86400),
+                                         tuple(rng.sample(player_ids, rng.randint(0, 2))),
+                                         tuple(rng.sample(player_ids, rng.randint(0, 2))))
+                             for _ in range(2000)]
+        self.rules = RuleEngine()
+        
+        # '4' is unknown, '3' has no game in either week and '5' has no NFL team
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.index = PlayerIndex(os.path.join(self.temp_dir.name, 'player_index.json'))
+        with patch('builtins.print'):
+            self.index.merge({player_id: Player(player_id, player_id, 'QB', team)
+                              for player_id, team in (('1', 'PHI'), ('2', 'DAL'), ('3', 'BUF'), ('5', 'FA'))}, 0)
+            self.index.merge({'1': Player('1', '1', 'QB', 'DAL')}, TRADED_AT)
+    
+    def engine_violations(self):
+        """(row, violation) from the rule engine, one transaction at a time as backfill used to"""
+        found = []
+        for row, transaction in enumerate(self.transactions):
+            weeks_started = [week for start, week in self.weeks if start <= transaction.timestamp]
+            if not weeks_started:
+                continue
+            players = {player_id: Player(player_id, player_id, 'QB', self.index.team_at(player_id, transaction.timestamp))
+                       for player_id in self.index.players}
+            lock_table = LockTable(players, weeks_started[-1])
+            found.extend((row, violation) for violation in self.rules.evaluate(transaction, lock_table))
+        return found
+    
+    def test_matches_rule_engine(self):
+        """Test the numpy path and the fallback against RuleEngine.evaluate"""
+        expected = self.engine_violations()
+        self.assertTrue(expected)
+        self.assertGreater(len({violation.rule for _, violation in expected}), 2)
+        # The traded player is judged by their new team after the trade
+        self.assertIn(('1', 'DAL'), {(violation.player_id, self.index.team_at('1', self.transactions[row].timestamp))
+                                     for row, violation in expected})
+        
+        evaluator = BulkEvaluator(self.weeks, self.rules)
+        self.assertEqual(evaluator.find_violations(self.transactions, self.index), expected)
+        with patch.object(bulk, 'np', None):
+            self.assertEqual(evaluator.find_violations(self.transactions, self.index), expected)
+    
+    def test_custom_rule_uses_rule_engine(self):
+        """Test that a rule with its own player function is still checked"""
+        first_added = Rule('first_add', frozenset({'FREE_AGENT'}), 'picked up by', lambda transaction: transaction.added[:1])
+        self.rules = RuleEngine([first_added])
+        evaluator = BulkEvaluator(self.weeks, self.rules)
+        
+        self.assertFalse(evaluator.vectorized)
+        self.assertEqual(evaluator.find_violations(self.transactions, self.index), self.engine_violations())
+
+if __name__ == '__main__':
+    unittest.main()
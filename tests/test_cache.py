@@ -0,0 +1,119 @@
+"""
+Tests for fetching game times across schedule sources
+"""
+
+import unittest
+import os
+import sys
+import time
+import tempfile
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.utils.cache import GameTimeCache, ScheduleFetch, ScheduleProvider
+from src.mfl_monitor.utils.schedule_archive import REGULAR_SEASON, POSTSEASON
+from tests import use_temp_data_files
+
+class TestHedgedFetch(unittest.TestCase):
+    """Test hedging a slow schedule source"""
+    
+    def setUp(self):
+        """Use throwaway data files and a short hedge delay"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with patch.object(Config, 'SCHEDULE_ARCHIVE_FILE', os.path.join(self.temp_dir.name, 'archive.bin')), \
+             patch.object(Config, 'GAME_STATUS_FILE', os.path.join(self.temp_dir.name, 'status.json')):
+            self.cache = GameTimeCache(os.path.join(self.temp_dir.name, 'cache.json'))
+        self.calls = []
+        hedge = patch.object(Config, 'SCHEDULE_HEDGE_SECONDS', 0.05)
+        hedge.start()
+        self.addCleanup(hedge.stop)
+    
+    def tearDown(self):
+        """Remove the data files"""
+        self.temp_dir.cleanup()
+    
+    def provider(self, name: str, game_times: dict, delay: float = 0, quota_limited: bool = False, week: int = None):
+        """Build a provider that records when it is called (and reports week, if given, for archiving)"""
+        def fetch():
+            self.calls.append(name)
+            time.sleep(delay)
+            return ScheduleFetch((2025, REGULAR_SEASON, week) if week else None, game_times, game_times)
+        return ScheduleProvider(name, fetch, quota_limited)
+    
+    def test_slow_primary_is_hedged(self):
+        """Test that the secondary starts and wins when the primary is slow"""
+        self.cache.providers = [self.provider('slow', {'PHI': 1}, delay=0.5),
+                                self.provider('fast', {'DAL': 2})]
+        self.assertEqual(self.cache.fetch_hedged(), ('fast', {'DAL': 2}))
+        self.assertEqual(self.calls, ['slow', 'fast'])
+    
+    def test_quota_source_waits_for_failure(self):
+        """Test that a quota-limited source is only used after the others fail"""
+        self.cache.providers = [self.provider('slow', {'PHI': 1}, delay=0.2),
+                                self.provider('odds', {'DAL': 2}, quota_limited=True)]
+        self.assertEqual(self.cache.fetch_hedged(), ('slow', {'PHI': 1}))
+        self.assertEqual(self.calls, ['slow'])
+        
+        self.calls = []
+        self.cache.providers = [self.provider('empty', {}),
+                                self.provider('odds', {'DAL': 2}, quota_limited=True)]
+        self.assertEqual(self.cache.fetch_hedged(), ('odds', {'DAL': 2}))
+        self.assertEqual(self.calls, ['empty', 'odds'])
+    
+    def test_dropped_provider_is_not_archived(self):
+        """Test that a provider answering after the winner neither archives nor holds up exit"""
+        kickoff = datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc)
+        self.cache.providers = [self.provider('slow', {'PHI': kickoff}, delay=0.3, week=1),
+                                self.provider('fast', {'DAL': kickoff}, week=2)]
+        with patch('builtins.print'):
+            self.assertEqual(self.cache.fetch_hedged(), ('fast', {'DAL': kickoff}))
+            slow = [thread for thread in threading.enumerate() if thread.name == 'schedule-slow']
+            self.assertTrue(slow and slow[0].daemon)
+            slow[0].join()
+        
+        self.assertEqual(self.cache.archive.get_week(2025, REGULAR_SEASON, 2), {'DAL': kickoff})
+        self.assertFalse(self.cache.archive.has_week(2025, REGULAR_SEASON, 1))
+
+class TestMFLSchedule(unittest.TestCase):
+    """Test archiving the week MFL's schedule export reports"""
+    
+    def setUp(self):
+        """A cache on throwaway data files for the 2025 season"""
+        use_temp_data_files(self)
+        year = patch.object(Config, 'MFL_YEAR', '2025')
+        year.start()
+        self.addCleanup(year.stop)
+        self.cache = GameTimeCache()
+    
+    def fetch_week(self, week: int, game_times: dict):
+        """Fetch from MFL with its export reporting week"""
+        self.cache.providers = self.cache.providers[:1]
+        with patch('src.mfl_monitor.apis.mfl_api.MFLAPI.get_nfl_schedule', return_value=(week, game_times)), \
+             patch('src.mfl_monitor.utils.cache.filter_current_week', side_effect=lambda games: games), \
+             patch('builtins.print'):
+            return self.cache.fetch_in_order()
+    
+    def test_regular_season_week(self):
+        """Test that weeks up to 18 are archived as regular season weeks"""
+        game_times = {'PHI': datetime(2026, 1, 4, 18, 0, tzinfo=timezone.utc)}
+        self.fetch_week(18, game_times)
+        
+        self.assertEqual(self.cache.archive.get_week(2025, REGULAR_SEASON, 18), game_times)
+        self.assertFalse(self.cache.archive.has_week(2025, POSTSEASON, 0))
+    
+    def test_playoff_weeks_are_renumbered(self):
+        """Test that MFL's weeks 19 on are archived as postseason weeks from 1"""
+        wild_card = {'JAC': datetime(2026, 1, 11, 18, 0, tzinfo=timezone.utc)}
+        divisional = {'BUF': datetime(2026, 1, 18, 18, 0, tzinfo=timezone.utc)}
+        self.fetch_week(19, wild_card)
+        self.fetch_week(20, divisional)
+        
+        self.assertEqual(self.cache.archive.get_week(2025, POSTSEASON, 1), wild_card)
+        self.assertEqual(self.cache.archive.get_week(2025, POSTSEASON, 2), divisional)
+        self.assertFalse(self.cache.archive.has_week(2025, REGULAR_SEASON, 19))
+
+if __name__ == '__main__':
+    unittest.main()
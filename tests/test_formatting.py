@@ -0,0 +1,40 @@
+"""
+Tests for Discord message time formatting
+"""
+
+import unittest
+import os
+import re
+import sys
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytz
+from src.mfl_monitor.utils.formatting import format_timestamp, format_game_start
+
+def regex_format(timestamp):
+    """The original strftime + re.sub formatting"""
+    dt_ny = datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone(pytz.timezone('America/New_York'))
+    time_str = dt_ny.strftime("%m/%d %I:%M %p %Z")
+    time_str = re.sub(r'0(\d):', r'\1:', time_str)
+    time_str = re.sub(r'0(\d)/', r'\1/', time_str)
+    return re.sub(r'/(\d{2})', lambda m: f'/{int(m.group(1))}', time_str)
+
+class TestFormatting(unittest.TestCase):
+    """Test the precomputed formatters"""
+    
+    def test_examples(self):
+        """Test leading zeros are dropped and minutes are kept"""
+        # 2025-09-04 20:05 EDT and 2025-12-25 09:30 EST
+        self.assertEqual(format_timestamp(1757030700), "9/4 8:05 PM EDT")
+        self.assertEqual(format_timestamp(1766673000), "12/25 9:30 AM EST")
+        self.assertEqual(format_game_start(1757030400), " | Game started: 9/4 8:00 PM EDT")
+    
+    def test_matches_regex_formatting(self):
+        """Test the output matches the old regex clean-up through a season"""
+        start = 1756684800  # 2025-09-01
+        for timestamp in range(start, start + 180 * 86400, 3 * 3600 + 17 * 60):
+            self.assertEqual(format_timestamp(timestamp), regex_format(timestamp))
+
+if __name__ == '__main__':
+    unittest.main()
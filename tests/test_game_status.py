@@ -0,0 +1,78 @@
+"""
+Tests for judging violations against when games actually started
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.game_status import GameStatusTracker, SCHEDULED, IN_PROGRESS, FINAL, POSTPONED
+
+KICKOFF = datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc)
+KICKOFF_TS = int(KICKOFF.timestamp())
+
+def status(state: str) -> dict:
+    """ESPN's answer for one game"""
+    return {'state': state, 'detail': state, 'scheduled': KICKOFF_TS}
+
+class TestGameStatusTracker(unittest.TestCase):
+    """Test lock times for delayed, postponed and finished games"""
+    
+    def setUp(self):
+        """Track statuses in a throwaway file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tracker = GameStatusTracker(os.path.join(self.temp_dir.name, 'status.json'))
+    
+    def tearDown(self):
+        """Remove the status file"""
+        self.temp_dir.cleanup()
+    
+    def refresh_at(self, now_ts: int, response: tuple):
+        """Refresh with ESPN returning response at now_ts"""
+        with patch('src.mfl_monitor.utils.game_status.time.time', return_value=now_ts), \
+             patch('src.mfl_monitor.apis.espn_api.ESPNAPIClient.get_game_statuses', return_value=response):
+            return self.tracker.refresh(force=True)
+    
+    def test_on_time_game_locks_at_kickoff(self):
+        """Test that a game seen under way before kickoff passed locks at kickoff"""
+        self.refresh_at(KICKOFF_TS - 600, ({'PHI': status(SCHEDULED)}, {}, False))
+        self.refresh_at(KICKOFF_TS + 600, ({'PHI': status(IN_PROGRESS)}, {}, False))
+        self.assertEqual(self.tracker.lock_time('PHI', KICKOFF), KICKOFF)
+    
+    def test_delayed_kickoff_moves_lock_time(self):
+        """Test that a game still scheduled after kickoff locks when it was last seen waiting"""
+        self.refresh_at(KICKOFF_TS + 1800, ({'PHI': status(SCHEDULED)}, {'etag': 'a'}, False))
+        # Not modified - still waiting
+        self.refresh_at(KICKOFF_TS + 2400, (None, {'etag': 'a'}, True))
+        self.refresh_at(KICKOFF_TS + 3000, ({'PHI': status(IN_PROGRESS)}, {'etag': 'b'}, False))
+        
+        self.assertEqual(int(self.tracker.lock_time('PHI', KICKOFF).timestamp()), KICKOFF_TS + 2400)
+        self.assertEqual(self.tracker.get_status('PHI', KICKOFF)['actual_start'], KICKOFF_TS + 3000)
+        
+        # Finishing doesn't change when it started
+        self.refresh_at(KICKOFF_TS + 15000, ({'PHI': status(FINAL)}, {'etag': 'c'}, False))
+        self.assertEqual(int(self.tracker.lock_time('PHI', KICKOFF).timestamp()), KICKOFF_TS + 2400)
+    
+    def test_outage_does_not_move_lock_time(self):
+        """Test that a failed fetch isn't taken as the game still waiting"""
+        self.refresh_at(KICKOFF_TS - 600, ({'PHI': status(SCHEDULED)}, {'etag': 'a'}, False))
+        self.assertFalse(self.refresh_at(KICKOFF_TS + 3600, (None, {'etag': 'a'}, False)))
+        
+        self.assertEqual(self.tracker.lock_time('PHI', KICKOFF), KICKOFF)
+        self.assertEqual(self.tracker.status_data['checked_at'], KICKOFF_TS - 600)
+    
+    def test_postponed_game_never_locks(self):
+        """Test that a postponed game has no lock time and other weeks' games are ignored"""
+        self.refresh_at(KICKOFF_TS + 600, ({'PHI': status(POSTPONED)}, {}, False))
+        self.assertIsNone(self.tracker.lock_time('PHI', KICKOFF))
+        
+        # A status for a game a week away doesn't describe this one
+        next_week = datetime.fromtimestamp(KICKOFF_TS + 7 * 86400, tz=timezone.utc)
+        self.assertEqual(self.tracker.lock_time('PHI', next_week), next_week)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for coalescing identical upstream requests
+"""
+
+import threading
+import time
+import unittest
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.http import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    """Test sharing one fetch between concurrent callers"""
+    
+    def test_concurrent_callers_share_one_fetch(self):
+        """Test that callers arriving while a fetch runs get its result"""
+        flights = SingleFlight()
+        started = threading.Event()
+        calls = []
+        
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return {'PHI': 1}
+        
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            first = pool.submit(flights.do, ('scoreboard', 1), fetch)
+            started.wait()
+            others = [pool.submit(flights.do, ('scoreboard', 1), fetch) for _ in range(4)]
+            results = [first.result()] + [future.result() for future in others]
+        
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flights.stats['scoreboard'], {'fetches': 1, 'coalesced': 4})
+        
+        # Once it's done, the next request fetches again
+        flights.do(('scoreboard', 1), fetch)
+        self.assertEqual(len(calls), 2)
+    
+    def test_error_is_shared(self):
+        """Test that waiting callers see the leader's exception"""
+        flights = SingleFlight()
+        started = threading.Event()
+        
+        def fetch():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError('upstream down')
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(flights.do, ('players',), fetch)
+            started.wait()
+            second = pool.submit(flights.do, ('players',), fetch)
+            for future in (first, second):
+                with self.assertRaises(ValueError):
+                    future.result()
+        self.assertEqual(flights.in_flight, {})
+
+if __name__ == '__main__':
+    unittest.main()
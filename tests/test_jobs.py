@@ -0,0 +1,120 @@
+"""
+Tests for the daemon job runner
+"""
+
+import asyncio
+import unittest
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock, MagicMock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.core.jobs import Job, JobRunner
+from src.mfl_monitor.core.scheduler import TransactionScheduler
+from tests import use_temp_data_files
+
+class TestJobRunner(unittest.TestCase):
+    """Test running jobs on their own cadences"""
+    
+    def setUp(self):
+        """Status file in a throwaway directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.status_file = os.path.join(self.temp_dir.name, 'job_status.json')
+        self.calls = []
+    
+    def tearDown(self):
+        """Remove the status file"""
+        self.temp_dir.cleanup()
+    
+    def job(self, name, interval, inputs=None, fail=False):
+        """A job that records each run"""
+        async def action():
+            self.calls.append(name)
+            if fail:
+                raise RuntimeError('upstream down')
+        return Job(name, interval, action, jitter=0, inputs=inputs)
+    
+    def test_jobs_run_on_their_own_interval(self):
+        """Test that only due jobs run, unchanged inputs skip and failures are counted"""
+        fingerprint = ['week 1']
+        fast = self.job('fast', 0)
+        slow = self.job('slow', 3600)
+        unchanged = self.job('unchanged', 0, inputs=lambda: fingerprint[0])
+        broken = self.job('broken', 0, fail=True)
+        runner = JobRunner([fast, slow, unchanged, broken], self.status_file)
+        
+        with patch('builtins.print'):
+            asyncio.run(runner.run_due())
+            asyncio.run(runner.run_due())
+            fingerprint[0] = 'week 2'
+            asyncio.run(runner.run_due())
+        
+        self.assertEqual(self.calls.count('fast'), 3)
+        self.assertEqual(self.calls.count('slow'), 1)
+        self.assertEqual(self.calls.count('unchanged'), 2)
+        status = runner.status()
+        self.assertEqual(status['unchanged']['skipped'], 1)
+        self.assertEqual(status['broken']['failures'], 3)
+        self.assertGreater(status['slow']['next_run'], time.time() + 3000)
+        self.assertTrue(os.path.exists(self.status_file))
+
+class TestSchedulerJobs(unittest.TestCase):
+    """Test the scheduler's schedule refresh and prewarm jobs"""
+    
+    def setUp(self):
+        """Scheduler on throwaway data files with two kickoff slots"""
+        use_temp_data_files(self)
+        self.scheduler = TransactionScheduler()
+        
+        now = datetime.now(timezone.utc)
+        game_times = {'PHI': now + timedelta(minutes=5), 'DAL': now + timedelta(minutes=5),
+                      'BUF': now + timedelta(hours=3)}
+        self.scheduler.analyzer.cache.get_cached_game_times = lambda: game_times
+        self.scheduler.analyzer.prewarm = AsyncMock()
+    
+    def test_prewarms_each_slot_once(self):
+        """Test that a slot inside the prewarm lead is warmed once, then the next slot is waited for"""
+        with patch.object(Config, 'PREWARM_MINUTES', 10), patch('builtins.print'):
+            self.assertEqual(self.scheduler.prewarm_interval(), 0)
+            asyncio.run(self.scheduler.prewarm_if_due())
+            asyncio.run(self.scheduler.prewarm_if_due())
+            interval = self.scheduler.prewarm_interval()
+        
+        self.assertEqual(self.scheduler.analyzer.prewarm.await_count, 1)
+        # Next slot is 3 hours out, so check back within the hour
+        self.assertEqual(interval, 3600)
+    
+    def test_transactions_polled_faster_during_games(self):
+        """Test that the active window polls every GAME_POLL_INTERVAL_MINUTES while games are on"""
+        status = self.scheduler.analyzer.cache.status
+        self.scheduler.get_calendar = lambda: MagicMock(minutes_until_active=MagicMock(return_value=0))
+        with patch.object(Config, 'POLL_INTERVAL_MINUTES', 5), patch.object(Config, 'GAME_POLL_INTERVAL_MINUTES', 1):
+            with patch.object(status, 'in_game_window', return_value=True):
+                self.assertEqual(self.scheduler.transaction_interval(), 60)
+            with patch.object(status, 'in_game_window', return_value=False):
+                self.assertEqual(self.scheduler.transaction_interval(), 300)
+    
+    def test_failed_schedule_refresh_is_retried(self):
+        """Test that a refresh that found no games doesn't stop the job until the week changes"""
+        cache = self.scheduler.analyzer.cache
+        cache.fetch_schedule = lambda: (None, {})
+        job = next(job for job in self.scheduler.build_jobs() if job.name == 'schedule')
+        
+        with patch('builtins.print'):
+            asyncio.run(job.run(time.time()))
+            asyncio.run(job.run(time.time()))
+            self.assertEqual(job.stats['skipped'], 0)
+            
+            cache.fetch_schedule = lambda: ('espn', {'PHI': datetime.now(timezone.utc)})
+            # Fetches, then a cache hit records the week, then the week is skipped
+            for _ in range(3):
+                asyncio.run(job.run(time.time()))
+        self.assertEqual(job.stats['skipped'], 1)
+        self.assertTrue(cache.is_cache_valid())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for lineup swap detection
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.records import Player
+from src.mfl_monitor.core.lineups import LineupMonitor
+
+KICKOFF = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+KICKOFF_TS = int(KICKOFF.timestamp())
+
+class TestLineupMonitor(unittest.TestCase):
+    """Test diffing starters between polls"""
+    
+    def setUp(self):
+        """Use a throwaway snapshot log"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_file = os.path.join(self.temp_dir.name, 'lineups.jsonl')
+        self.monitor = LineupMonitor(self.snapshot_file)
+        self.players = {'100': Player('100', 'Hurts, Jalen', 'QB', 'PHI'),
+                        '200': Player('200', 'Allen, Josh', 'QB', 'BUF')}
+        self.lock_times = {'PHI': KICKOFF}
+        self.monitor.check(1, {'0001': frozenset({'100'}), '0002': frozenset({'200'})},
+                           self.players, self.lock_times, now_ts=KICKOFF_TS + 60)
+    
+    def tearDown(self):
+        """Remove the snapshot log"""
+        self.temp_dir.cleanup()
+    
+    def test_swap_after_lock(self):
+        """Test that benching a locked player is reported and only the change is stored"""
+        swaps = self.monitor.check(1, {'0001': frozenset({'200'}), '0002': frozenset({'200'})},
+                                   self.players, self.lock_times, now_ts=KICKOFF_TS + 120)
+        self.assertEqual([(s.franchise, s.player_id, s.action) for s in swaps], [('0001', '100', 'benched by')])
+        
+        with open(self.snapshot_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertNotIn('0002', lines[1])
+        
+        # A restart picks up where the log left off
+        reloaded = LineupMonitor(self.snapshot_file)
+        self.assertEqual(reloaded.starters['0001'], frozenset({'200'}))
+        self.assertEqual(reloaded.checked_at, KICKOFF_TS + 120)
+    
+    def test_swap_straddling_kickoff_not_reported(self):
+        """Test that a change that may have happened before lock is not reported"""
+        self.monitor.checked_at = KICKOFF_TS - 60
+        swaps = self.monitor.check(1, {'0001': frozenset({'200'}), '0002': frozenset({'200'})},
+                                   self.players, self.lock_times, now_ts=KICKOFF_TS + 60)
+        self.assertEqual(swaps, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for parsing MFL responses
+"""
+
+import unittest
+import io
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.apis.mfl_api import MFLAPI
+from src.mfl_monitor.utils.records import parse_transactions
+
+def response(payload=None, content: bytes = b'') -> MagicMock:
+    """A canned requests response"""
+    mock = MagicMock()
+    mock.json.return_value = payload
+    mock.content = content
+    return mock
+
+class TestTransactions(unittest.TestCase):
+    """Test filtering the transactions export"""
+    
+    def test_bad_timestamp_skips_only_that_row(self):
+        """Test that one malformed timestamp doesn't lose the rest of the batch"""
+        rows = [
+            {'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': '1757030460', 'transaction': '13130,|'},
+            {'type': 'FREE_AGENT', 'franchise': '0002', 'timestamp': '', 'transaction': '13131,|'},
+            {'type': 'FREE_AGENT', 'franchise': '0003', 'timestamp': '1757000000', 'transaction': '13132,|'},
+        ]
+        api = MFLAPI()
+        api.session = MagicMock()
+        api.session.get.return_value = response({'transactions': {'transaction': rows}})
+        
+        transactions = api.get_transactions(since=datetime.fromtimestamp(1757010000, tz=timezone.utc))
+        records = parse_transactions(transactions)
+        
+        self.assertEqual([record.franchise for record in records], ['0001'])
+
+PLAYERS_XML = (b'<players timestamp="1757030460">'
+               b'<player id="13130" name="Hurts, Jalen" position="QB" team="PHI"/>'
+               b'<player id="13131" name="Lamb, CeeDee" position="WR" team="DAL"/>'
+               b'<player id="13132" name="Smith, John" position="RB" team="FA"/>'
+               b'</players>')
+
+class TestPlayers(unittest.TestCase):
+    """Test the streamed players export"""
+    
+    def setUp(self):
+        """An API whose session streams canned XML"""
+        self.api = MFLAPI()
+        self.api.session = MagicMock()
+    
+    def stream(self, content: bytes):
+        """Have the next players request stream content"""
+        self.api.session.get.return_value.__enter__.return_value.raw = io.BytesIO(content)
+    
+    def test_iter_players(self):
+        """Test that every player element is read with its projected fields"""
+        players = list(self.api.iter_players(io.BytesIO(PLAYERS_XML)))
+        
+        self.assertEqual([player.id for player in players], ['13130', '13131', '13132'])
+        self.assertEqual((players[0].name, players[0].position, players[0].team), ('Hurts, Jalen', 'QB', 'PHI'))
+        self.assertEqual(players[2].team, 'FA')
+    
+    def test_fetch_players(self):
+        """Test that a streamed export is keyed by id and marked ok"""
+        self.stream(PLAYERS_XML)
+        with patch('builtins.print'):
+            players, stats = self.api.fetch_players(None, ['13130', '13131'])
+        
+        self.assertEqual(sorted(players), ['13130', '13131', '13132'])
+        self.assertEqual(players['13131'].team, 'DAL')
+        self.assertTrue(stats['ok'])
+        self.assertEqual(stats['players'], 3)
+        self.assertEqual(self.api.session.get.call_args.kwargs['params']['PLAYERS'], '13130,13131')
+        self.assertTrue(self.api.session.get.call_args.kwargs['stream'])
+    
+    def test_truncated_export_is_not_ok(self):
+        """Test that a cut-off stream returns nothing rather than half the players"""
+        self.stream(PLAYERS_XML[:120])
+        with patch('builtins.print'):
+            players, stats = self.api.fetch_players(None, None)
+        
+        self.assertEqual(players, {})
+        self.assertFalse(stats['ok'])
+
+class TestNFLSchedule(unittest.TestCase):
+    """Test parsing MFL's nflSchedule export"""
+    
+    def setUp(self):
+        """An API whose session answers with canned JSON"""
+        self.api = MFLAPI()
+        self.api.session = MagicMock()
+    
+    def test_kickoffs_by_team(self):
+        """Test that both teams get the kickoff and unreadable games are skipped"""
+        self.api.session.get.return_value = response({'nflSchedule': {'week': '19', 'matchup': [
+            {'kickoff': '1768003200', 'team': [{'id': 'JAC'}, {'id': 'BUF'}]},
+            {'kickoff': '', 'team': [{'id': 'PHI'}, {'id': 'GBP'}]},
+            {'kickoff': '1768017600', 'team': [{'id': 'LAR'}, {'id': ''}]},
+        ]}})
+        with patch('builtins.print'):
+            week, game_times = self.api.fetch_nfl_schedule(None)
+        
+        kickoff = datetime.fromtimestamp(1768003200, tz=timezone.utc)
+        self.assertEqual(week, 19)
+        self.assertEqual(game_times, {'JAC': kickoff, 'BUF': kickoff,
+                                      'LAR': datetime.fromtimestamp(1768017600, tz=timezone.utc)})
+        self.assertNotIn('W', self.api.session.get.call_args.kwargs['params'])
+    
+    def test_single_matchup(self):
+        """Test a week with one game, which MFL sends as an object instead of a list"""
+        self.api.session.get.return_value = response({'nflSchedule': {
+            'matchup': {'kickoff': '1770600000', 'team': [{'id': 'KCC'}, {'id': 'PHI'}]}}})
+        with patch('builtins.print'):
+            week, game_times = self.api.fetch_nfl_schedule(22)
+        
+        self.assertEqual(week, 22)
+        self.assertEqual(sorted(game_times), ['KCC', 'PHI'])
+        self.assertEqual(self.api.session.get.call_args.kwargs['params']['W'], 22)
+
+if __name__ == '__main__':
+    unittest.main()
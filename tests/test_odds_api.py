@@ -0,0 +1,60 @@
+"""
+Tests for game times from The Odds API
+"""
+
+import unittest
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.apis.odds_api import OddsAPIClient
+from tests import use_temp_data_files
+
+WEEK1_START = datetime(2025, 9, 4, 4, 0, tzinfo=timezone.utc)
+WEEK1_END = WEEK1_START + timedelta(days=5)
+
+EVENTS = [
+    {'commence_time': '2025-09-05T00:20:00Z', 'home_team': 'Philadelphia Eagles', 'away_team': 'Dallas Cowboys'},
+    {'commence_time': '2025-09-07T17:00:00Z', 'home_team': 'Jacksonville Jaguars', 'away_team': 'Carolina Panthers'},
+    {'home_team': 'Buffalo Bills', 'away_team': 'Baltimore Ravens'},
+]
+
+class TestOddsGameTimes(unittest.TestCase):
+    """Test game times by team and the per-window cache"""
+    
+    def setUp(self):
+        """A client on throwaway data files whose schedule requests are canned"""
+        use_temp_data_files(self)
+        self.client = OddsAPIClient('test-key')
+        fetch = patch.object(OddsAPIClient, 'get_nfl_schedule', return_value=EVENTS)
+        self.fetch = fetch.start()
+        self.addCleanup(fetch.stop)
+        quiet = patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+    
+    def test_game_times_by_team(self):
+        """Test that both teams get MFL codes and events without a kickoff are skipped"""
+        game_times = self.client.get_game_times_by_team(WEEK1_START, WEEK1_END)
+        
+        opener = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+        sunday = datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc)
+        self.assertEqual(game_times, {'PHI': opener, 'DAL': opener, 'JAC': sunday, 'CAR': sunday})
+        self.fetch.assert_called_once_with(WEEK1_START, WEEK1_END)
+    
+    def test_cache_is_per_window(self):
+        """Test that a window is fetched once, even by a new client, and another window is fetched again"""
+        first = self.client.get_game_times_by_team(WEEK1_START, WEEK1_END)
+        self.assertEqual(self.client.get_game_times_by_team(WEEK1_START, WEEK1_END), first)
+        self.assertEqual(OddsAPIClient('test-key').get_game_times_by_team(WEEK1_START, WEEK1_END), first)
+        self.assertEqual(self.fetch.call_count, 1)
+        
+        week2_start = WEEK1_START + timedelta(days=7)
+        self.client.get_game_times_by_team(week2_start, week2_start + timedelta(days=5))
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(self.fetch.call_args.args, (week2_start, week2_start + timedelta(days=5)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Tests for the Discord outbox
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.outbox import Outbox
+
+class TestOutbox(unittest.TestCase):
+    """Test queueing, retrying and deduplicating messages"""
+    
+    def setUp(self):
+        """Use a throwaway outbox file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.outbox_file = os.path.join(self.temp_dir.name, 'outbox.json')
+        self.outbox = Outbox(self.outbox_file)
+    
+    def tearDown(self):
+        """Remove the outbox file"""
+        self.temp_dir.cleanup()
+    
+    def test_idempotency_key(self):
+        """Test that an alert is queued once and never resent after delivery"""
+        self.assertTrue(self.outbox.add('FREE_AGENT:0001:1757030460:13130', 'alert'))
+        self.assertFalse(self.outbox.add('FREE_AGENT:0001:1757030460:13130', 'alert'))
+        self.assertEqual(self.outbox.pending_count(), 1)
+        
+        self.outbox.mark_sent('FREE_AGENT:0001:1757030460:13130')
+        self.assertFalse(self.outbox.add('FREE_AGENT:0001:1757030460:13130', 'alert'))
+        self.assertEqual(self.outbox.pending_count(), 0)
+    
+    def test_failed_send_survives_restart(self):
+        """Test that a failed message backs off and is still queued on the next run"""
+        self.outbox.add('key', 'alert')
+        self.outbox.mark_failed('key', 'Discord is down')
+        self.assertEqual(self.outbox.due(), [])
+        
+        reloaded = Outbox(self.outbox_file)
+        self.assertEqual(reloaded.pending_count(), 1)
+        message = reloaded.due(now=reloaded.outbox_data['pending'][0]['next_attempt_at'])[0]
+        self.assertEqual(message['attempts'], 1)
+        self.assertEqual(message['last_error'], 'Discord is down')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for the async check pipeline
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.records import Player, Transaction
+from src.mfl_monitor.core.analyzer import TransactionAnalyzer
+from src.mfl_monitor.core.pipeline import TransactionPipeline
+from tests import use_temp_data_files
+
+class FakeChannel:
+    """Discord channel that records what was sent"""
+    
+    def __init__(self):
+        self.sent = []
+    
+    async def send(self, content):
+        self.sent.append(content)
+
+class TestPipeline(unittest.TestCase):
+    """Test a check flowing from MFL to Discord"""
+    
+    def setUp(self):
+        """Build an analyzer with fake MFL data and throwaway data files"""
+        use_temp_data_files(self)
+        self.analyzer = TransactionAnalyzer()
+        
+        now = int(time.time())
+        kickoff = datetime.fromtimestamp(now - 3600, tz=timezone.utc)
+        transactions = [{'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': str(now - 10 - i),
+                         'transaction': f'{1000 + i % 2},|'} for i in range(50)]
+        # Skipped on its own instead of stopping the run
+        transactions.append({'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': '', 'transaction': '1000,|'})
+        self.analyzer.mfl_api.get_transactions = lambda *args, **kwargs: transactions
+        self.analyzer.mfl_api.get_players = self.get_players
+        self.analyzer.mfl_api.get_franchises = MagicMock(return_value={'0001': {'name': 'Team', 'owner_name': 'Owner'}})
+        self.analyzer.get_game_start_times = lambda: {'PHI': kickoff}
+        self.analyzer.cache.status.refresh = lambda: False
+        
+        self.channel = FakeChannel()
+        self.analyzer.discord_notifier.open_channel = AsyncMock(return_value=(MagicMock(close=AsyncMock()), self.channel))
+    
+    def get_players(self, since=None):
+        """Players as MFL would return them"""
+        self.analyzer.mfl_api.last_parse_stats = {'ok': True}
+        return {'1000': Player('1000', 'Hurts, Jalen', 'QB', 'PHI'),
+                '1001': Player('1001', 'Prescott, Dak', 'QB', 'DAL')}
+    
+    def test_violations_delivered_with_bounded_queues(self):
+        """Test that every violation is sent once and no queue grows past its limit"""
+        pipeline = TransactionPipeline(self.analyzer, queue_size=5)
+        with patch('src.mfl_monitor.core.pipeline.asyncio.sleep', AsyncMock()):
+            stats = asyncio.run(pipeline.run())
+        
+        self.assertEqual(stats['processed'], 50)
+        self.assertEqual(stats['violations'], 25)
+        self.assertEqual(len(self.channel.sent), 25)
+        self.assertEqual(self.analyzer.outbox.pending_count(), 0)
+        self.assertTrue(all(depth <= 5 for depth in stats['peak_depths'].values()))
+        self.assertIn('last_run_time', self.analyzer.last_run_data)
+        self.assertEqual(self.analyzer.mfl_api.get_franchises.call_count, 1)
+    
+    def test_failed_stage_reports_queue_depths(self):
+        """Test that a stage failing stops the run and records what was left queued"""
+        pipeline = TransactionPipeline(self.analyzer, queue_size=5)
+        self.analyzer.format_transaction_message = MagicMock(side_effect=RuntimeError('bad message'))
+        with patch('builtins.print'), self.assertRaises(RuntimeError):
+            asyncio.run(pipeline.run())
+        
+        self.assertEqual(set(pipeline.stats['queue_depths']), {'parse', 'evaluate', 'format', 'deliver'})
+        self.assertGreater(pipeline.stats['queue_depths']['format'], 0)
+        self.assertEqual(pipeline.stats['queue_depths']['deliver'], 0)
+        self.assertNotIn('last_run_time', self.analyzer.last_run_data)
+    
+    def test_no_violations_skips_franchises(self):
+        """Test that franchise names aren't fetched when there is nothing to alert"""
+        self.analyzer.get_game_start_times = lambda: {'PHI': datetime.now(timezone.utc) + timedelta(days=1)}
+        stats = asyncio.run(TransactionPipeline(self.analyzer).run())
+        
+        self.assertEqual(stats['violations'], 0)
+        self.analyzer.mfl_api.get_franchises.assert_not_called()
+    
+    def test_lock_table_per_archived_week(self):
+        """Test that transactions in different archived weeks get their own week's table"""
+        week1 = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+        week2 = week1 + timedelta(days=10)
+        archive = self.analyzer.cache.archive
+        archive.append_week(2025, 2, 1, {'PHI': week1})
+        archive.append_week(2025, 2, 2, {'PHI': week2})
+        players = self.get_players()
+        
+        tables = {}
+        with patch('builtins.print'):
+            for kickoff in (week1, week2, week1):
+                transaction = Transaction('FREE_AGENT', '0001', int(kickoff.timestamp()) + 60, ('1000',))
+                table = self.analyzer.get_lock_table_at(transaction, players, {}, tables)
+                self.assertEqual(table.lock_ts('1000'), int(kickoff.timestamp()))
+                # Rebuilding the index drops the resolved dicts, which must not mix weeks up
+                archive.build_index()
+        self.assertEqual(len(tables), 2)
+
+if __name__ == '__main__':
+    unittest.main()
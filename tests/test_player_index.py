@@ -0,0 +1,117 @@
+"""
+Tests for the time-versioned player index
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.utils.records import Player
+from src.mfl_monitor.utils.player_index import PlayerIndex
+
+class FakeMFL:
+    """Answers players exports from a fixed roster"""
+    
+    def __init__(self, players):
+        self.players = players
+        self.calls = []
+        self.last_parse_stats = {}
+    
+    def get_players(self, since=None, player_ids=None):
+        self.calls.append(player_ids or since)
+        self.last_parse_stats = {'ok': True}
+        if player_ids:
+            return {pid: self.players[pid] for pid in player_ids if pid in self.players}
+        return dict(self.players) if since is None else {pid: self.players[pid] for pid in ('2',)}
+
+class TestPlayerIndex(unittest.TestCase):
+    """Test team history and incremental refreshes"""
+    
+    def setUp(self):
+        """Index on a throwaway file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.temp_dir.name, 'player_index.json')
+        misses = patch.object(Config, 'PLAYER_MISSES_FILE', os.path.join(self.temp_dir.name, 'player_misses.json'))
+        misses.start()
+        self.addCleanup(misses.stop)
+        self.mfl = FakeMFL({'1': Player('1', 'Hurts, Jalen', 'QB', 'PHI'),
+                            '2': Player('2', 'Cooper, Amari', 'WR', 'CLE')})
+    
+    def tearDown(self):
+        """Remove the index file"""
+        self.temp_dir.cleanup()
+    
+    def test_team_change_is_versioned(self):
+        """Test that a trade only changes the team from the sync that saw it"""
+        index = PlayerIndex(self.index_file)
+        with patch('builtins.print'):
+            index.refresh(self.mfl, now=1000)
+            self.mfl.players['2'] = Player('2', 'Cooper, Amari', 'WR', 'BUF')
+            index.refresh(self.mfl, now=2000)
+        
+        self.assertEqual(self.mfl.calls, [None, 1000])
+        self.assertEqual(index.team_at('2', 1500), 'CLE')
+        self.assertEqual(index.team_at('2', 2500), 'BUF')
+        self.assertEqual(index.players_at(1500)['2'].team, 'CLE')
+        self.assertEqual(index.players_at(2500)['2'].team, 'BUF')
+        self.assertIs(index.players_at(2500), index.players_at(3000))
+        
+        # History survives a restart
+        reloaded = PlayerIndex(self.index_file)
+        self.assertEqual(reloaded.version_at(2500), 1)
+        self.assertEqual(reloaded.team_at('2', 1500), 'CLE')
+    
+    def test_team_columns_per_version(self):
+        """Test that the integer columns give the same teams and are only rebuilt after a change"""
+        index = PlayerIndex(self.index_file)
+        with patch('builtins.print'):
+            index.refresh(self.mfl, now=1000)
+            self.mfl.players['2'] = Player('2', 'Cooper, Amari', 'WR', 'BUF')
+            index.refresh(self.mfl, now=2000)
+        
+        columns = index.columns()
+        player_count = len(columns.player_numbers)
+        for version, timestamp in enumerate((1500, 2500)):
+            for player_id, number in columns.player_numbers.items():
+                team = columns.team_names[columns.teams[version * player_count + number]]
+                self.assertEqual(team, index.team_at(player_id, timestamp))
+        self.assertIs(index.columns(), columns)
+        
+        with patch('builtins.print'):
+            index.merge({'2': Player('2', 'Cooper, Amari', 'WR', 'PIT')}, 3000)
+        self.assertEqual(len(index.columns().teams), 3 * player_count)
+    
+    def test_failed_refresh_keeps_index(self):
+        """Test that a failed fetch doesn't move the sync time on"""
+        index = PlayerIndex(self.index_file)
+        with patch('builtins.print'):
+            index.refresh(self.mfl, now=1000)
+            self.mfl.get_players = lambda since=None: {}
+            self.mfl.last_parse_stats = {'ok': False}
+            self.assertFalse(index.refresh(self.mfl, now=2000))
+        
+        self.assertEqual(index.updated_at, 1000)
+        self.assertEqual(len(index), 2)
+    
+    def test_missing_players_fetched_in_one_request(self):
+        """Test that unknown ids are looked up together and only once"""
+        index = PlayerIndex(self.index_file)
+        with patch('builtins.print'):
+            index.refresh(self.mfl, now=1000)
+            self.mfl.players['3'] = Player('3', 'Rookie, Some', 'RB', 'DAL')
+            found = index.fetch_missing(self.mfl, ['1', '3', '9'])
+            index.fetch_missing(self.mfl, ['9'])
+        
+        self.assertEqual(list(found), ['3'])
+        self.assertEqual(self.mfl.calls, [None, ['3', '9']])
+        self.assertEqual(index.players_at(500)['3'].team, 'DAL')
+        # Checking for known misses isn't counted as cache lookups
+        self.assertEqual(index.not_found.stats['misses'], 0)
+        self.assertTrue(PlayerIndex(self.index_file).not_found.contains('9'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for compact player and transaction records
+"""
+
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.records import Player, Transaction, TransactionColumns, parse_transactions
+
+class TestRecords(unittest.TestCase):
+    """Test parsing MFL dicts into records"""
+    
+    def test_free_agent_and_blind_bid(self):
+        """Test added and dropped players for both transaction layouts"""
+        free_agent = Transaction.from_mfl({'type': 'FREE_AGENT', 'franchise': '0001',
+                                           'timestamp': '1757030460', 'transaction': '13130,|12345,'})
+        self.assertEqual(free_agent.timestamp, 1757030460)
+        self.assertEqual(free_agent.added, ('13130',))
+        self.assertEqual(free_agent.dropped, ('12345',))
+        
+        blind_bid = Transaction.from_mfl({'type': 'BBID_WAIVER', 'franchise': '0002',
+                                          'timestamp': '1757030460', 'transaction': '13130,|5.00|12345,'})
+        self.assertEqual(blind_bid.added, ('13130',))
+        self.assertEqual(blind_bid.dropped, ('12345',))
+        
+        drop_only = Transaction.from_mfl({'type': 'FREE_AGENT', 'franchise': '0002',
+                                          'timestamp': '1757030460', 'transaction': '|12345,'})
+        self.assertEqual(drop_only.added, ())
+    
+    def test_trade_leaves_out_draft_picks(self):
+        """Test that only player ids from a trade's gave_up lists are kept"""
+        trade = Transaction.from_mfl({'type': 'TRADE', 'franchise': '0001', 'franchise2': '0002',
+                                      'timestamp': '1757030460', 'franchise1_gave_up': '13130,FP_0001_2026_1,',
+                                      'franchise2_gave_up': 'DP_0_3,12345,BB_10.50,'})
+        self.assertEqual(trade.added, ('12345',))
+        self.assertEqual(trade.dropped, ('13130',))
+    
+    def test_bad_timestamps_are_skipped(self):
+        """Test that unparseable timestamps never become records"""
+        records = parse_transactions([{'type': 'FREE_AGENT', 'timestamp': 'soon'},
+                                      {'type': 'FREE_AGENT', 'timestamp': '1'}])
+        self.assertEqual(len(records), 1)
+    
+    def test_interning_and_display_name(self):
+        """Test shared team codes and name formatting"""
+        first = Player('1', 'Allen, Josh', 'QB', ''.join(['B', 'UF']))
+        second = Player('2', 'Cook, James', 'RB', ''.join(['BU', 'F']))
+        self.assertIs(first.team, second.team)
+        self.assertEqual(first.display_name(), 'Josh Allen')
+    
+    def test_columns(self):
+        """Test column storage reuses indexes and keeps every player in row order"""
+        records = parse_transactions([
+            {'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': '10', 'transaction': '7,|8,'},
+            {'type': 'BBID_WAIVER', 'franchise': '0002', 'timestamp': '20', 'transaction': '7,11,|2.00|9,'},
+            {'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': '30', 'transaction': '|9,'}
+        ])
+        columns = TransactionColumns.from_transactions(records)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(list(columns.timestamps), [10, 20, 30])
+        self.assertEqual(list(columns.franchises), [0, 1, 0])
+        self.assertEqual(columns.type_ids, ['FREE_AGENT', 'BBID_WAIVER'])
+        self.assertEqual(list(columns.types), [0, 1, 0])
+        self.assertEqual(list(columns.added_counts), [1, 2, 0])
+        self.assertEqual(list(columns.dropped_counts), [1, 1, 1])
+        self.assertEqual([columns.player_ids[index] for index in columns.added], ['7', '7', '11'])
+        self.assertEqual([columns.player_ids[index] for index in columns.dropped], ['8', '9', '9'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for the post-lock violation rules
+"""
+
+import unittest
+import os
+import sys
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.records import Player, Transaction
+from src.mfl_monitor.core.rules import RuleEngine
+from src.mfl_monitor.core.lock_table import LockTable, get_lock_table, BYE_WEEK, UNKNOWN_TEAM, UNKNOWN_PLAYER
+
+KICKOFF = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+BEFORE = int(KICKOFF.timestamp()) - 60
+AFTER = int(KICKOFF.timestamp()) + 60
+
+class TestRuleEngine(unittest.TestCase):
+    """Test each rule against a week where only PHI has kicked off"""
+    
+    def setUp(self):
+        """Players on a locked (PHI) and an unlocked (BUF) team"""
+        self.engine = RuleEngine()
+        self.players = {'100': Player('100', 'Hurts, Jalen', 'QB', 'PHI'),
+                        '200': Player('200', 'Allen, Josh', 'QB', 'BUF')}
+        self.lock_table = LockTable(self.players, {'PHI': KICKOFF})
+    
+    def rules_broken(self, transaction: dict):
+        """Names and players of every violation in an MFL transaction"""
+        record = Transaction.from_mfl(transaction)
+        return [(v.rule, v.player_id) for v in self.engine.evaluate(record, self.lock_table)]
+    
+    def test_pickup_and_drop(self):
+        """Test that adding or dropping a locked player is flagged, but only after kickoff"""
+        self.assertEqual(self.rules_broken({'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': str(AFTER),
+                                            'transaction': '200,|100,'}), [('locked_drop', '100')])
+        self.assertEqual(self.rules_broken({'type': 'BBID_WAIVER', 'franchise': '0001', 'timestamp': str(AFTER),
+                                            'transaction': '100,|5.00|200,'}), [('late_pickup', '100')])
+        self.assertEqual(self.rules_broken({'type': 'FREE_AGENT', 'franchise': '0001', 'timestamp': str(BEFORE),
+                                            'transaction': '100,|200,'}), [])
+    
+    def test_trade_and_roster_moves(self):
+        """Test trades, IR and taxi moves involving a locked player"""
+        self.assertEqual(self.rules_broken({'type': 'TRADE', 'franchise': '0001', 'franchise2': '0002',
+                                            'timestamp': str(AFTER), 'franchise1_gave_up': '200,',
+                                            'franchise2_gave_up': '100,FP_0002_2026_1,'}),
+                         [('locked_trade', '100')])
+        self.assertEqual(self.rules_broken({'type': 'IR', 'franchise': '0001', 'timestamp': str(AFTER),
+                                            'activated': '', 'deactivated': '100,'}), [('locked_ir_move', '100')])
+        self.assertEqual(self.rules_broken({'type': 'TAXI', 'franchise': '0001', 'timestamp': str(AFTER),
+                                            'promoted': '100,', 'demoted': ''}), [('locked_taxi_move', '100')])
+    
+    def test_types_cover_every_rule(self):
+        """Test that the engine asks MFL for exactly the types its rules need"""
+        self.assertEqual(self.engine.types, {'FREE_AGENT', 'BBID_WAIVER', 'BBID_AUTO_PROCESS_WAIVERS',
+                                             'TRADE', 'IR', 'TAXI'})
+
+class TestLockTable(unittest.TestCase):
+    """Test the materialized player lock times"""
+    
+    def test_sentinels_and_reuse(self):
+        """Test byes and unknown teams are explicit, and tables are only rebuilt on change"""
+        players = {'100': Player('100', 'Hurts, Jalen', 'QB', 'PHI'),
+                   '200': Player('200', 'Allen, Josh', 'QB', 'BUF'),
+                   '300': Player('300', 'Free, Agent', 'WR', 'FA')}
+        table = get_lock_table(players, {'PHI': KICKOFF})
+        self.assertEqual(table.lock_ts('100'), int(KICKOFF.timestamp()))
+        self.assertEqual(table.lock_ts('200'), BYE_WEEK)
+        self.assertEqual(table.lock_ts('300'), UNKNOWN_TEAM)
+        self.assertEqual(table.lock_ts('999'), UNKNOWN_PLAYER)
+        self.assertTrue(table.is_locked('100', AFTER))
+        self.assertFalse(table.is_locked('200', AFTER))
+        
+        self.assertIs(get_lock_table(dict(players), {'PHI': KICKOFF}), table)
+        self.assertIsNot(get_lock_table(players, {'PHI': KICKOFF, 'BUF': KICKOFF}), table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the historical schedule archive
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone, timedelta
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.schedule_archive import ScheduleArchive, RECORD, HEADER
+
+WEEK1_KICKOFF = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)  # Thursday 8:20PM ET
+
+class TestScheduleArchive(unittest.TestCase):
+    """Test appending and looking up archived weeks"""
+    
+    def setUp(self):
+        """Use a throwaway archive file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive_file = os.path.join(self.temp_dir.name, 'schedule_archive.bin')
+        self.archive = ScheduleArchive(self.archive_file)
+        self.week1 = {'PHI': WEEK1_KICKOFF, 'DAL': WEEK1_KICKOFF,
+                      'BUF': WEEK1_KICKOFF + timedelta(days=3)}
+        self.week2 = {'PHI': WEEK1_KICKOFF + timedelta(days=10),
+                      'BUF': WEEK1_KICKOFF + timedelta(days=7)}
+    
+    def tearDown(self):
+        """Remove the archive file"""
+        self.temp_dir.cleanup()
+    
+    def test_lookup_by_transaction_time(self):
+        """Test that each moment resolves to its own week"""
+        self.archive.append_week(2025, 2, 1, self.week1)
+        self.archive.append_week(2025, 2, 2, self.week2)
+        
+        # Monday night of week 1 still belongs to week 1
+        monday = int((WEEK1_KICKOFF + timedelta(days=4)).timestamp())
+        self.assertEqual(self.archive.week_for(monday), (2025, 2, 1))
+        self.assertEqual(self.archive.game_times_at(monday)['DAL'], WEEK1_KICKOFF)
+        
+        # Week 2 starts on the Tuesday
+        tuesday = int((WEEK1_KICKOFF + timedelta(days=5)).timestamp())
+        self.assertEqual(self.archive.week_for(tuesday), (2025, 2, 2))
+        self.assertNotIn('DAL', self.archive.game_times_at(tuesday))
+        
+        self.assertIsNone(self.archive.week_for(int((WEEK1_KICKOFF - timedelta(days=30)).timestamp())))
+    
+    def test_append_only_and_reload(self):
+        """Test that unchanged weeks are not rewritten and changes win on reload"""
+        self.assertTrue(self.archive.append_week(2025, 2, 1, self.week1))
+        self.assertFalse(self.archive.append_week(2025, 2, 1, self.week1))
+        self.assertEqual(os.path.getsize(self.archive_file), HEADER.size + 3 * RECORD.size)
+        
+        flexed = dict(self.week1, BUF=WEEK1_KICKOFF + timedelta(days=3, hours=4))
+        self.assertTrue(self.archive.append_week(2025, 2, 1, flexed))
+        self.assertEqual(os.path.getsize(self.archive_file), HEADER.size + 4 * RECORD.size)
+        
+        reloaded = ScheduleArchive(self.archive_file)
+        self.assertEqual(reloaded.get_week(2025, 2, 1), flexed)
+    
+    def test_old_jacksonville_code_reads_as_mfl_code(self):
+        """Test that weeks archived with ESPN's JAX share MFL's JAC slot"""
+        self.archive.append_week(2025, 2, 1, {'JAX': WEEK1_KICKOFF})
+        self.archive.append_week(2025, 2, 1, {'JAC': WEEK1_KICKOFF + timedelta(hours=3)})
+        
+        reloaded = ScheduleArchive(self.archive_file)
+        self.assertEqual(reloaded.get_week(2025, 2, 1), {'JAC': WEEK1_KICKOFF + timedelta(hours=3)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for exporting and restoring the state bundle
+"""
+
+import io
+import json
+import tarfile
+import time
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.config import Config
+from src.mfl_monitor.utils.state_bundle import StateBundle
+
+class TestStateBundle(unittest.TestCase):
+    """Test the round trip, staleness and checksums"""
+    
+    def setUp(self):
+        """Work in a throwaway directory, where the default relative data paths land"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        os.makedirs('data')
+        self.bundle_file = 'bundle.tar.gz'
+        
+        for path, content in ((Config.DATA_FILE, {'last_check': 1}), (Config.PLAYER_INDEX_FILE, {'players': {}})):
+            with open(path, 'w') as f:
+                json.dump(content, f)
+        StateBundle(self.bundle_file).export()
+        os.remove(Config.DATA_FILE)
+        os.remove(Config.PLAYER_INDEX_FILE)
+    
+    def tearDown(self):
+        """Remove the state files"""
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+    
+    def test_round_trip(self):
+        """Test that a fresh directory gets every file back"""
+        result = StateBundle(self.bundle_file).restore()
+        
+        self.assertEqual(sorted(result['restored']), sorted([Config.DATA_FILE, Config.PLAYER_INDEX_FILE]))
+        with open(Config.DATA_FILE) as f:
+            self.assertEqual(json.load(f), {'last_check': 1})
+        
+        # A second restore leaves the (now current) local copies alone
+        result = StateBundle(self.bundle_file).restore()
+        self.assertEqual(len(result['kept']), 2)
+    
+    def test_old_bundle_restores_only_ledgers(self):
+        """Test that caches past the max age are skipped but ledgers still come back"""
+        later = time.time() + (Config.STATE_BUNDLE_MAX_AGE_HOURS + 1) * 3600
+        result = StateBundle(self.bundle_file).restore(now=later)
+        
+        self.assertEqual(result['restored'], [Config.DATA_FILE])
+        self.assertEqual(result['stale'], [Config.PLAYER_INDEX_FILE])
+        self.assertFalse(os.path.exists(Config.PLAYER_INDEX_FILE))
+    
+    def test_corrupt_file_is_skipped_alone(self):
+        """Test that a file whose checksum doesn't match is skipped and the rest restored"""
+        with tarfile.open(self.bundle_file, 'r:gz') as bundle:
+            members = {member.name: bundle.extractfile(member).read() for member in bundle.getmembers()}
+        members[Config.DATA_FILE] = b'{"last_check": 2}'
+        with tarfile.open(self.bundle_file, 'w:gz') as bundle:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                bundle.addfile(info, io.BytesIO(data))
+        
+        result = StateBundle(self.bundle_file).restore()
+        
+        self.assertEqual(result['corrupt'], [Config.DATA_FILE])
+        self.assertEqual(result['restored'], [Config.PLAYER_INDEX_FILE])
+        self.assertFalse(os.path.exists(Config.DATA_FILE))
+
+if __name__ == '__main__':
+    unittest.main()
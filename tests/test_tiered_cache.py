@@ -0,0 +1,82 @@
+"""
+Tests for the memory + disk cache
+"""
+
+import json
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.mfl_monitor.utils.tiered_cache import TieredCache
+
+class TestTieredCache(unittest.TestCase):
+    """Test per-key expiry, eviction and the disk tier"""
+    
+    def setUp(self):
+        """Cache on a throwaway file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, 'cache.json')
+    
+    def tearDown(self):
+        """Remove the cache file"""
+        self.temp_dir.cleanup()
+    
+    def test_keys_expire_on_their_own_ttl(self):
+        """Test that each key expires after its own TTL and stays readable as stale"""
+        cache = TieredCache('test', self.cache_file)
+        with patch('src.mfl_monitor.utils.tiered_cache.time.time', return_value=1000):
+            cache.set('short', 'a', 60)
+            cache.set('long', 'b', 3600)
+        with patch('src.mfl_monitor.utils.tiered_cache.time.time', return_value=1100):
+            self.assertIsNone(cache.get('short'))
+            self.assertEqual(cache.get('short', allow_stale=True), 'a')
+            self.assertEqual(cache.get('long'), 'b')
+        
+        self.assertEqual(cache.stats['memory_hits'], 1)
+        self.assertEqual(cache.stats['expired'], 2)
+    
+    def test_eviction_and_reload(self):
+        """Test that both tiers stay within their size and the disk tier survives a restart"""
+        cache = TieredCache('test', self.cache_file, memory_items=2, disk_items=3)
+        for key in 'abcd':
+            cache.set(key, key.upper(), 3600)
+        
+        self.assertEqual(list(cache.memory), ['c', 'd'])
+        self.assertEqual(list(cache.disk), ['b', 'c', 'd'])
+        self.assertEqual(cache.latest(), 'D')
+        
+        reloaded = TieredCache('test', self.cache_file)
+        self.assertIsNone(reloaded.get('a'))
+        self.assertEqual(reloaded.get('b'), 'B')
+        self.assertEqual(reloaded.stats['disk_hits'], 1)
+        self.assertEqual(reloaded.get('b'), 'B')
+        self.assertEqual(reloaded.stats['memory_hits'], 1)
+    
+    def test_set_many_writes_once(self):
+        """Test that a batch of keys is saved with one disk write and lookups by contains aren't counted"""
+        cache = TieredCache('test', self.cache_file)
+        with patch.object(cache, 'save_disk', wraps=cache.save_disk) as save_disk:
+            cache.set_many({'a': 1, 'b': 2, 'c': 3}, 3600)
+        self.assertEqual(save_disk.call_count, 1)
+        self.assertEqual(cache.stats['writes'], 3)
+        
+        reloaded = TieredCache('test', self.cache_file)
+        self.assertTrue(reloaded.contains('b'))
+        self.assertFalse(reloaded.contains('z'))
+        self.assertFalse(any(reloaded.stats.values()))
+        with patch('src.mfl_monitor.utils.tiered_cache.time.time', return_value=10 ** 10):
+            self.assertFalse(reloaded.contains('b'))
+    
+    def test_old_format_starts_empty(self):
+        """Test that a cache file from before the disk tier existed is ignored"""
+        with open(self.cache_file, 'w') as f:
+            json.dump({'game_times': {}, 'cached_at': '2025-09-04T20:00:00', 'week_range': None}, f)
+        
+        cache = TieredCache('test', self.cache_file)
+        self.assertIsNone(cache.latest())
+
+if __name__ == '__main__':
+    unittest.main()